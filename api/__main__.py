@@ -0,0 +1,38 @@
+import argparse
+import asyncio
+import logging
+from api.server import DEFAULT_HOST, DEFAULT_PORT, READ_WORKERS, InventoryServer
+from database.database import DB_PATH, Database
+from utils.logger import setup_logging
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m api", description="Inventory Manager HTTP/JSON API server")
+    parser.add_argument("--db", default=DB_PATH, help=f"database file (default: {DB_PATH})")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--read-workers", type=int, default=READ_WORKERS,
+                        help="threads (and reader connections) serving GET requests")
+    parser.add_argument("--profile", help="storage profile, see database/connection.py")
+    args = parser.parse_args()
+    setup_logging()
+
+    db = Database(args.db, profile=args.profile)
+    server = InventoryServer(db, args.host, args.port, args.read_workers)
+
+    async def run():
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        logging.info("API server interrupted")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
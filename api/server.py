@@ -0,0 +1,371 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+from database.database import EQUIPMENT_FIELDS, MERGE_FIELDS, PAGE_SIZE, SEARCH_LIMIT, SORTABLE_COLUMNS
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+READ_WORKERS = 8
+MAX_PAGE_SIZE = 1000
+MAX_BODY_BYTES = 1024 * 1024
+# Скільки чекати наступного запиту в keep-alive з'єднанні, перш ніж закрити його
+KEEP_ALIVE_TIMEOUT = 30
+EQUIPMENT_INPUT_FIELDS = ('inventory_number', 'type', 'name', 'model', 'serial_number', 'room', 'owner')
+
+
+class HttpError(Exception):
+    def __init__(self, status, message, details=None, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.details = details or {}
+        self.headers = headers or {}
+
+
+class DataVersion:
+    # Власне з'єднання, яке нічого не пише: його PRAGMA data_version змінюється після будь-якої фіксації
+    # у базі — з цього сервера, з настільного застосунку чи з командного рядка
+    def __init__(self, db):
+        self.db = db
+        self._lock = threading.Lock()
+        self._conn = None if db.pool.single_connection else sqlite3.connect(db.db_path, check_same_thread=False)
+
+    def current(self):
+        if self._conn is None:
+            return self.db.data_version()
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+
+
+def _record(row):
+    return {field: row[field] for field in EQUIPMENT_FIELDS}
+
+
+def _int_param(query, name, default=None, minimum=None, maximum=None):
+    value = query.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        value = int(value)
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"Parameter {name} must be an integer")
+    if minimum is not None and value < minimum:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"Parameter {name} must be at least {minimum}")
+    return min(value, maximum) if maximum is not None else value
+
+
+def _row_etag(version):
+    return f'"{version}"'
+
+
+def _if_match_version(headers):
+    value = headers.get('if-match')
+    if not value:
+        return None
+    try:
+        return int(value.removeprefix('W/').strip().strip('"'))
+    except ValueError:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "If-Match must carry the ETag of an equipment record")
+
+
+def _bool_param(query, name):
+    return query.get(name, '').lower() in ('1', 'true', 'yes')
+
+
+class InventoryServer:
+    def __init__(self, db, host=DEFAULT_HOST, port=DEFAULT_PORT, read_workers=READ_WORKERS):
+        self.db = db
+        self.host = host
+        self.port = port
+        # Кожен потік читання тримає власне з'єднання-читача, тож пул потоків і є пулом з'єднань;
+        # усі записи йдуть через один потік і одне з'єднання-writer
+        self.read_executor = ThreadPoolExecutor(read_workers, thread_name_prefix="api-read")
+        self.write_executor = ThreadPoolExecutor(1, thread_name_prefix="api-write")
+        self.version = DataVersion(db)
+        # Випадковий префікс ETag: після перезапуску сервера лічильник версій починається заново
+        self._instance = os.urandom(8).hex()
+        self._server = None
+        self._connections = set()
+        self.routes = [
+            ('GET', re.compile(r'^/equipment$'), self.list_equipment, True),
+            ('GET', re.compile(r'^/equipment/search$'), self.search_equipment, True),
+            ('GET', re.compile(r'^/equipment/(\d+)$'), self.get_equipment, False),
+            ('POST', re.compile(r'^/equipment$'), self.add_equipment, False),
+            ('PUT', re.compile(r'^/equipment/(\d+)$'), self.update_equipment, False),
+            ('POST', re.compile(r'^/equipment/(\d+)/write-off$'), self.write_off_equipment, False),
+        ]
+
+    async def start(self):
+        self._server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logging.info(f"API server listening on http://{self.host}:{self.port}")
+        return self._server
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+        # Server.close не закриває вже відкриті keep-alive з'єднання
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+        self.read_executor.shutdown(wait=True)
+        self.write_executor.shutdown(wait=True)
+        self.version.close()
+        logging.info("API server stopped")
+
+    def _run(self, executor, fn, *args):
+        return asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    def read(self, fn, *args):
+        return self._run(self.read_executor, fn, *args)
+
+    def write(self, fn, *args):
+        return self._run(self.write_executor, fn, *args)
+
+    async def handle_connection(self, reader, writer):
+        peer = writer.get_extra_info('peername')
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not request_line:
+                    break
+                keep_alive = await self.handle_request(request_line, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            logging.debug("Connection from %s closed: %s", peer, e)
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def handle_request(self, request_line, reader, writer):
+        try:
+            method, target, version = request_line.decode('latin-1').rstrip('\r\n').split(' ')
+        except ValueError:
+            self.send(writer, HTTPStatus.BAD_REQUEST, {'error': "Malformed request line"}, keep_alive=False)
+            return False
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # Без коректної довжини тіла не відомо, де починається наступний запит, тож з'єднання закривається
+            self.send(writer, HTTPStatus.BAD_REQUEST, {'error': "Invalid Content-Length"}, keep_alive=False)
+            return False
+        if length > MAX_BODY_BYTES:
+            self.send(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': "Request body is too large"},
+                      keep_alive=False)
+            return False
+        body = await reader.readexactly(length) if length else b''
+
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            status, payload, extra = await self.dispatch(method, url.path, target, query, headers, body)
+        except HttpError as e:
+            status, payload, extra = e.status, {'error': e.message, **e.details}, e.headers
+        except ValueError as e:
+            # Помилки перевірки з Database (наприклад, місткість кабінету) повертаються клієнту як є
+            status, payload, extra = HTTPStatus.BAD_REQUEST, {'error': str(e)}, {}
+        except Exception as e:
+            logging.error(f"Error handling {method} {target}: {e}")
+            status, payload, extra = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': "Internal server error"}, {}
+        logging.debug("%s %s -> %s", method, target, status.value)
+        self.send(writer, status, payload, extra, keep_alive)
+        return keep_alive
+
+    async def dispatch(self, method, path, target, query, headers, body):
+        allowed = set()
+        for route_method, pattern, handler, conditional in self.routes:
+            match = pattern.match(path)
+            if not match:
+                continue
+            if route_method != method:
+                allowed.add(route_method)
+                continue
+            args = [int(group) for group in match.groups()]
+            if method in ('POST', 'PUT'):
+                args.append(self._json_body(body))
+            if not conditional:
+                status, payload = await handler(query, headers, *args)
+                # Окремий запис має ETag зі своєю версією: його передають в If-Match під час оновлення
+                extra = {'ETag': _row_etag(payload['version'])} if 'version' in payload else {}
+                return status, payload, extra
+            # Версія береться до запиту: якщо дані зміняться посередині, клієнт лише зайвий раз отримає відповідь
+            version = await self.read(self.version.current)
+            etag = self._etag(version, target)
+            if etag in [tag.strip() for tag in headers.get('if-none-match', '').split(',')]:
+                return HTTPStatus.NOT_MODIFIED, None, {'ETag': etag}
+            status, payload = await handler(query, headers, *args)
+            return status, payload, {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if allowed:
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"Method {method} is not allowed for {path}")
+        raise HttpError(HTTPStatus.NOT_FOUND, f"Unknown resource: {path}")
+
+    def _etag(self, version, target):
+        digest = hashlib.sha1(f"{self._instance}:{version}:{target}".encode('utf-8')).hexdigest()[:20]
+        return f'"{digest}"'
+
+    @staticmethod
+    def _json_body(body):
+        try:
+            data = json.loads(body or b'{}')
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Request body must be JSON")
+        if not isinstance(data, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+        return data
+
+    @staticmethod
+    def send(writer, status, payload, extra_headers=None, keep_alive=True):
+        body = b'' if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        if payload is not None:
+            lines.append("Content-Type: application/json; charset=utf-8")
+        lines.append(f"Content-Length: {len(body)}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        for name, value in (extra_headers or {}).items():
+            lines.append(f"{name}: {value}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body)
+
+    async def list_equipment(self, query, headers):
+        sort_by = query.get('sort', 'id')
+        if sort_by not in SORTABLE_COLUMNS:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"Unsupported sort column: {sort_by}")
+        descending = _bool_param(query, 'desc')
+        limit = _int_param(query, 'limit', PAGE_SIZE, 1, MAX_PAGE_SIZE)
+        after_id = _int_param(query, 'after_id')
+        after = (query.get('after_value'), after_id) if after_id is not None else None
+        rows = await self.read(lambda: self.db.page_equipment(
+            query.get('room'), query.get('owner'), _bool_param(query, 'written_off'), sort_by, descending, after,
+            limit))
+        items = [_record(row) for row in rows]
+        # Пагінація за ключем: наступна сторінка продовжується після (значення сортування, id) останнього рядка
+        next_page = None
+        if len(items) == limit:
+            last = items[-1]
+            next_page = {'after_id': last['id']}
+            if sort_by != 'id':
+                next_page['after_value'] = last[sort_by]
+        return HTTPStatus.OK, {'items': items, 'next': next_page}
+
+    async def search_equipment(self, query, headers):
+        text = query.get('q', '').strip()
+        if not text:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Parameter q is required")
+        limit = _int_param(query, 'limit', SEARCH_LIMIT, 1, MAX_PAGE_SIZE)
+        rows = await self.read(self.db.search_equipment, text, limit)
+        return HTTPStatus.OK, {'items': [_record(row) for row in rows]}
+
+    async def get_equipment(self, query, headers, equip_id):
+        row = await self.read(self.db.get_equipment_by_id, equip_id)
+        if row is None:
+            raise HttpError(HTTPStatus.NOT_FOUND, f"Equipment {equip_id} not found")
+        return HTTPStatus.OK, _record(row)
+
+    @staticmethod
+    def _equipment_data(data, base=None):
+        # Відсутні поля беруться з поточного запису; для нового запису обов'язковий лише інвентарний номер
+        result = {}
+        for field in EQUIPMENT_INPUT_FIELDS:
+            value = data.get(field, base[field] if base is not None else '')
+            if value is None:
+                value = ''
+            if not isinstance(value, str):
+                raise HttpError(HTTPStatus.BAD_REQUEST, f"Field {field} must be a string")
+            result[field] = value.strip()
+        if not result['inventory_number']:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Field inventory_number is required")
+        result['written_off'] = int(base['written_off']) if base is not None else 0
+        return result
+
+    async def add_equipment(self, query, headers, data):
+        equipment = self._equipment_data(data)
+
+        def add():
+            if not self.db.add_equipment(equipment):
+                raise HttpError(HTTPStatus.CONFLICT,
+                                f"Inventory number {equipment['inventory_number']} already exists")
+            found = self.db.get_ids_by_inventory_numbers([equipment['inventory_number']])
+            return self.db.get_equipment_by_id(found[equipment['inventory_number']])
+        row = await self.write(add)
+        return HTTPStatus.CREATED, _record(row)
+
+    async def update_equipment(self, query, headers, equip_id, data):
+        expected_version = _if_match_version(headers)
+        base = data.pop('base', None)
+        if base is not None and not isinstance(base, dict):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "Field base must be a JSON object")
+
+        def update():
+            # Читання поточного запису і запис виконуються в потоці writer, тож між ними не вклиняться інші зміни API
+            current = self.db.get_equipment_by_id(equip_id)
+            if current is None:
+                raise HttpError(HTTPStatus.NOT_FOUND, f"Equipment {equip_id} not found")
+            # Із base (запис, який бачив клієнт) поля, відсутні в тілі, вважаються незміненими клієнтом
+            merge_base = self._merge_base(base, current) if base is not None else None
+            equipment = self._equipment_data(data, merge_base or current)
+            try:
+                result = self.db.update_equipment(equip_id, equipment, expected_version, merge_base)
+            except sqlite3.IntegrityError:
+                raise HttpError(HTTPStatus.CONFLICT,
+                                f"Inventory number {equipment['inventory_number']} already exists")
+            if result['status'] == 'conflict':
+                raise HttpError(HTTPStatus.PRECONDITION_FAILED, "Equipment was changed by another user",
+                                {'conflicts': result['conflicts'], 'current': _record(result['current'])},
+                                {'ETag': _row_etag(result['current']['version'])})
+            if result['status'] == 'not_found':
+                raise HttpError(HTTPStatus.NOT_FOUND, f"Equipment {equip_id} not found")
+            return self.db.get_equipment_by_id(equip_id), result['status']
+        row, status = await self.write(update)
+        return HTTPStatus.OK, dict(_record(row), merged=status == 'merged')
+
+    @staticmethod
+    def _merge_base(base, current):
+        # Поля, яких клієнт не надіслав у base, беруться з поточного запису
+        merged = {field: base.get(field, current[field]) for field in MERGE_FIELDS}
+        merged['written_off'] = int(merged['written_off'] or 0)
+        return merged
+
+    async def write_off_equipment(self, query, headers, equip_id, data):
+        def write_off():
+            if self.db.get_equipment_by_id(equip_id) is None:
+                raise HttpError(HTTPStatus.NOT_FOUND, f"Equipment {equip_id} not found")
+            self.db.write_off_many([equip_id])
+            return self.db.get_equipment_by_id(equip_id)
+        row = await self.write(write_off)
+        return HTTPStatus.OK, _record(row)
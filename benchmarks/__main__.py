@@ -0,0 +1,94 @@
+import argparse
+import json
+import logging
+import platform
+import sqlite3
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.generator import RAW_TYPES, InventoryGenerator
+from benchmarks.scenarios import SCENARIOS, BenchmarkContext
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        else:
+            flat[name] = value
+    return flat
+
+
+def compare(previous, current):
+    old = flatten(previous['results'])
+    for name, value in flatten(current['results']).items():
+        if not (name.endswith("_ms") or name.endswith("seconds")) or not old.get(name):
+            continue
+        ratio = value / old[name]
+        print(f"{name}: {old[name]:.2f} -> {value:.2f} (x{ratio:.2f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Database benchmark suite")
+    parser.add_argument("--rows", type=int, default=50000, help="rows in the generated inventory")
+    parser.add_argument("--import-rows", type=int, default=20000, help="rows in generated import files")
+    parser.add_argument("--rooms", type=int, default=300)
+    parser.add_argument("--owners", type=int, default=1500)
+    parser.add_argument("--types", type=int, default=len(RAW_TYPES),
+                        help="distinct raw type values; values beyond the built-in set are unknown types")
+    parser.add_argument("--written-off", type=float, default=0.1, help="share of written-off equipment")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare with")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
+
+    generator = InventoryGenerator(seed=args.seed, rooms=args.rooms, owners=args.owners,
+                                   written_off_ratio=args.written_off, types=args.types)
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec="seconds"),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform()
+        },
+        'params': {key: value for key, value in vars(args).items() if key not in ("output", "compare", "verbose")},
+        'results': {}
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        ctx = BenchmarkContext(tmp, generator, args.rows, args.repeat, args.import_rows)
+        for name in args.scenarios:
+            start = time.perf_counter()
+            report['results'][name] = SCENARIOS[name](ctx)
+            print(f"{name}: done in {time.perf_counter() - start:.1f}s")
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"Results written to {args.output}")
+    else:
+        print(output)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import quote, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.server import InventoryServer
+from benchmarks.generator import InventoryGenerator
+from benchmarks.scenarios import summarize
+from database.database import Database
+
+SEARCH_TERMS = ["Dell", "HP", "Logitech", "Монітор", "INV-00012", "Canon", "SN1"]
+
+
+def start_server(db, read_workers):
+    # Сервер працює у власному циклі подій у фоновому потоці, клієнти — у звичайних потоках
+    loop = asyncio.new_event_loop()
+    server = InventoryServer(db, port=0, read_workers=read_workers)
+    loop.run_until_complete(server.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    def stop():
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+    return f"http://{server.host}:{server.port}", stop
+
+
+def client(base_url, deadline, seed, rooms, ids, write_share, results):
+    rnd = random.Random(seed)
+    url = urlsplit(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+    etags = {}
+    latencies = {'list': [], 'search': [], 'get': [], 'update': []}
+    statuses = {}
+
+    def request(method, target, body=None, headers=None):
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        conn.request(method, target, body=payload, headers=headers or {})
+        response = conn.getresponse()
+        data = response.read()
+        statuses[response.status] = statuses.get(response.status, 0) + 1
+        return response, data
+
+    while time.perf_counter() < deadline:
+        roll = rnd.random()
+        start = time.perf_counter()
+        if roll < write_share:
+            op = 'update'
+            request('PUT', f"/equipment/{rnd.choice(ids)}", {'model': f"M{rnd.randrange(10000)}"})
+        elif roll < write_share + 0.4:
+            # Список кабінету з повторною перевіркою за ETag, як це робив би клієнт із кешем
+            op = 'list'
+            target = f"/equipment?room={quote(rnd.choice(rooms))}&limit=100"
+            headers = {'If-None-Match': etags[target]} if target in etags else {}
+            response, _ = request('GET', target, headers=headers)
+            if response.getheader('ETag'):
+                etags[target] = response.getheader('ETag')
+        elif roll < write_share + 0.65:
+            op = 'search'
+            request('GET', f"/equipment/search?q={quote(rnd.choice(SEARCH_TERMS))}&limit=50")
+        else:
+            op = 'get'
+            request('GET', f"/equipment/{rnd.choice(ids)}")
+        latencies[op].append(time.perf_counter() - start)
+    conn.close()
+    results.append((latencies, statuses))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test for the HTTP/JSON API on localhost")
+    parser.add_argument("--url", help="test a running server instead of starting one on a generated database")
+    parser.add_argument("--rows", type=int, default=50000, help="rows in the generated inventory")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent keep-alive connections")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-share", type=float, default=0.05, help="share of PUT requests")
+    parser.add_argument("--read-workers", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    generator = InventoryGenerator(seed=args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = stop = None
+        if args.url:
+            base_url = args.url.rstrip('/')
+            conn = http.client.HTTPConnection(urlsplit(base_url).hostname, urlsplit(base_url).port)
+            conn.request('GET', "/equipment?limit=1000")
+            ids = [item['id'] for item in json.loads(conn.getresponse().read())['items']]
+            conn.close()
+        else:
+            db = Database(os.path.join(tmp, "api.db"))
+            generator.populate(db, args.rows, tmp)
+            ids = db.get_equipment_ids(False)
+            base_url, stop = start_server(db, args.read_workers)
+            print(f"Server on {base_url} with {len(ids)} active rows, {args.read_workers} read workers")
+
+        results = []
+        deadline = time.perf_counter() + args.seconds
+        threads = [threading.Thread(target=client, args=(base_url, deadline, args.seed + i, generator.rooms, ids,
+                                                         args.write_share, results))
+                   for i in range(args.clients)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        if stop:
+            stop()
+            db.close()
+
+    latencies = {}
+    statuses = {}
+    for client_latencies, client_statuses in results:
+        for op, values in client_latencies.items():
+            latencies.setdefault(op, []).extend(values)
+        for status, count in client_statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+    total = sum(statuses.values())
+    print(f"{total} requests from {args.clients} clients in {elapsed:.1f}s: {total / elapsed:.0f} req/s")
+    print("    statuses: " + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items())))
+    for op, values in latencies.items():
+        stats = summarize(values)
+        if stats['calls']:
+            print(f"    {op}: {stats['calls']} calls, p50 {stats['p50_ms']:.1f} ms, "
+                  f"p95 {stats['p95_ms']:.1f} ms, max {stats['max_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
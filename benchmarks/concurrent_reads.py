@@ -0,0 +1,70 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generator import InventoryGenerator
+from benchmarks.scenarios import summarize
+from database.database import Database
+
+
+def run_profile(tmp, profile, generator, base_csv, import_csv, chunk_size):
+    db = Database(os.path.join(tmp, f"{profile}.db"), profile=profile)
+    db.stream_import(base_csv)
+    done = threading.Event()
+    result = {}
+
+    def importer():
+        start = time.perf_counter()
+        result['rows'] = db.stream_import(import_csv, chunk_size=chunk_size)
+        result['seconds'] = time.perf_counter() - start
+        done.set()
+
+    thread = threading.Thread(target=importer)
+    thread.start()
+    latencies = {'page_equipment': [], 'search_equipment': []}
+    rnd = random.Random(1)
+    while not done.is_set():
+        start = time.perf_counter()
+        db.page_equipment(room=rnd.choice(generator.rooms), sort_by='name')
+        latencies['page_equipment'].append(time.perf_counter() - start)
+        start = time.perf_counter()
+        db.search_equipment(f"INV-{rnd.randrange(100000):07d}", limit=50)
+        latencies['search_equipment'].append(time.perf_counter() - start)
+        time.sleep(0.005)
+    thread.join()
+    db.close()
+    return result, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="UI read latency while an import is writing")
+    parser.add_argument("--base-rows", type=int, default=100000)
+    parser.add_argument("--import-rows", type=int, default=100000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--profiles", nargs="+", default=["shared", "default"])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    generator = InventoryGenerator(seed=args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_csv = os.path.join(tmp, "base.csv")
+        import_csv = os.path.join(tmp, "import.csv")
+        generator.write_csv(base_csv, args.base_rows)
+        generator.write_csv(import_csv, args.import_rows, offset=args.base_rows // 2)
+        for profile in args.profiles:
+            result, latencies = run_profile(tmp, profile, generator, base_csv, import_csv, args.chunk_size)
+            print(f"Profile '{profile}': imported {result['rows']} rows in {result['seconds']:.2f}s")
+            for name, values in latencies.items():
+                stats = summarize(values)
+                print(f"    {name}: {stats['calls']} calls, p50 {stats['p50_ms']:.1f} ms, "
+                      f"p95 {stats['p95_ms']:.1f} ms, max {stats['max_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
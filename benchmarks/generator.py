@@ -0,0 +1,77 @@
+import csv
+import os
+import random
+
+import openpyxl
+
+IMPORT_COLUMNS = ["Інвентарний номер", "Тип обладнання", "Назва", "Модель", "Серійний номер", "Кабінет", "Власник"]
+
+SURNAMES = ["Шевченко", "Коваленко", "Бондаренко", "Ткаченко", "Кравченко", "Олійник", "Шевчук", "Поліщук",
+            "Бойко", "Мельник", "Лисенко", "Руденко", "Савченко", "Петренко", "Мороз", "Павленко", "Марченко",
+            "Гончаренко", "Левченко", "Харченко", "Кузьменко", "Литвиненко", "Карпенко", "Романенко", "Демченко"]
+FIRST_NAMES = ["Олександр", "Андрій", "Сергій", "Володимир", "Дмитро", "Іван", "Михайло", "Юрій", "Тарас",
+               "Олена", "Наталія", "Оксана", "Ірина", "Тетяна", "Світлана", "Марія", "Ганна", "Людмила"]
+PATRONYMICS = ["Іванович", "Петрович", "Олександрович", "Миколайович", "Васильович",
+               "Іванівна", "Петрівна", "Олександрівна", "Миколаївна", "Василівна"]
+BUILDINGS = ["Кабінет", "Лабораторія", "Аудиторія", "Бухгалтерія", "Приймальня"]
+
+# Сирі назви типів, як їх вводять у файлах імпорту: синоніми, основні назви та невідомі значення
+RAW_TYPES = ["mon", "monitor", "Монітор", "pc", "Комп'ютер", "key", "keyboard", "mou", "mouse", "pr", "scan",
+             "rout", "sw", "web", "ups", "Принтер", "Сканер", "?", "плоттер"]
+VENDORS = {
+    "mon": ("Монітор", ["Dell P2419H", "LG 24MK430H", "Samsung S24R350", "Philips 243V7Q"]),
+    "pc": ("Системний блок", ["HP ProDesk 400", "Dell OptiPlex 3080", "Lenovo ThinkCentre M70"]),
+    "key": ("Клавіатура", ["Logitech K120", "A4Tech KR-85", "Genius KB-110"]),
+    "mou": ("Миша", ["Logitech B100", "A4Tech OP-720", "Genius DX-110"]),
+    "pr": ("Принтер", ["HP LaserJet M110", "Canon LBP6030", "Brother HL-L2300"]),
+    "other": ("Обладнання", ["Epson Perfection V39", "TP-Link TL-SG108", "APC Back-UPS 650"])
+}
+
+
+class InventoryGenerator:
+    def __init__(self, seed=42, rooms=300, owners=1500, written_off_ratio=0.1, types=len(RAW_TYPES)):
+        self.seed = seed
+        self.written_off_ratio = written_off_ratio
+        rnd = random.Random(seed)
+        self.rooms = [f"{rnd.choice(BUILDINGS)} {n}" for n in range(100, 100 + rooms)] + ["Склад"]
+        self.owners = sorted({f"{rnd.choice(SURNAMES)} {rnd.choice(FIRST_NAMES)} {rnd.choice(PATRONYMICS)} {n}"
+                              for n in range(owners)})
+        # Понад стандартний набір додаються невідомі типи: кожен стає окремим рядком довідника після імпорту
+        self.raw_types = RAW_TYPES[:max(types, 1)] + [f"Тип {n}" for n in range(types - len(RAW_TYPES))]
+
+    def rows(self, count, offset=0):
+        rnd = random.Random(f"{self.seed}:{offset}")
+        for i in range(offset, offset + count):
+            raw_type = rnd.choice(self.raw_types)
+            label, models = VENDORS.get(raw_type[:3].lower(), VENDORS["other"])
+            model = rnd.choice(models)
+            yield (f"INV-{i:07d}", raw_type, f"{label} {model}", model,
+                   f"SN{rnd.getrandbits(40):010X}", rnd.choice(self.rooms), rnd.choice(self.owners))
+
+    def write_csv(self, path, count, offset=0):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(IMPORT_COLUMNS)
+            writer.writerows(self.rows(count, offset))
+        return path
+
+    def write_xlsx(self, path, count, offset=0, sheets=1):
+        wb = openpyxl.Workbook(write_only=True)
+        per_sheet = -(-count // sheets)
+        for index in range(sheets):
+            ws = wb.create_sheet(f"Аркуш {index + 1}")
+            ws.append(IMPORT_COLUMNS)
+            start = offset + index * per_sheet
+            for row in self.rows(min(per_sheet, offset + count - start), start):
+                ws.append(row)
+        wb.save(path)
+        return path
+
+    def populate(self, db, count, workdir):
+        path = self.write_csv(os.path.join(workdir, f"populate_{count}.csv"), count)
+        imported = db.stream_import(path)
+        os.remove(path)
+        ids = db.get_equipment_ids(False)
+        rnd = random.Random(self.seed)
+        db.write_off_many(rnd.sample(ids, int(len(ids) * self.written_off_ratio)))
+        return imported
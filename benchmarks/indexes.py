@@ -0,0 +1,111 @@
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generator import RAW_TYPES, InventoryGenerator
+from database.migrations import MIGRATIONS, apply_migrations
+
+GENERATOR = InventoryGenerator()
+ROOMS = GENERATOR.rooms
+OWNERS = GENERATOR.owners
+TYPES = RAW_TYPES
+# Запити нижче написані для текстових стовпців room/owner/type, тож порівнюємо лише індексні міграції;
+# з версії 6 ці стовпці замінено ідентифікаторами довідників
+TARGET_VERSION = 4
+
+QUERIES = [
+    ("filter_equipment(room)", "SELECT * FROM equipment WHERE 1=1 AND written_off=0 AND room=?",
+     lambda rnd: (rnd.choice(ROOMS),)),
+    ("filter_equipment(owner)", "SELECT * FROM equipment WHERE 1=1 AND written_off=0 AND owner=?",
+     lambda rnd: (rnd.choice(OWNERS),)),
+    ("get_all_equipment(written_off)", "SELECT * FROM equipment WHERE written_off=1",
+     lambda rnd: ()),
+    ("check_room_capacity", "SELECT COUNT(*) as count FROM equipment WHERE room=? AND written_off=0",
+     lambda rnd: (rnd.choice(ROOMS),)),
+    ("update_room", "UPDATE equipment SET room=? WHERE room=?",
+     lambda rnd: ("Тимчасовий", rnd.choice(ROOMS))),
+    ("update_owner", "UPDATE equipment SET owner=? WHERE owner=?",
+     lambda rnd: ("Тимчасовий", rnd.choice(OWNERS))),
+    ("update_type", "UPDATE equipment SET type=? WHERE type=?",
+     lambda rnd: ("Тимчасовий", rnd.choice(TYPES))),
+]
+
+
+def create_schema(conn):
+    conn.execute('''
+    CREATE TABLE equipment (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        inventory_number TEXT UNIQUE,
+        type TEXT,
+        name TEXT,
+        model TEXT,
+        serial_number TEXT,
+        room TEXT,
+        owner TEXT,
+        written_off INTEGER DEFAULT 0
+    )
+    ''')
+
+
+def fill(conn, rows, seed):
+    rnd = random.Random(seed)
+    data = (row + (int(rnd.random() < GENERATOR.written_off_ratio),) for row in GENERATOR.rows(rows))
+    conn.executemany('''
+    INSERT INTO equipment (inventory_number, type, name, model, serial_number, room, owner, written_off)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', data)
+    conn.commit()
+
+
+def measure(conn, repeat, seed):
+    rnd = random.Random(seed)
+    results = {}
+    for label, sql, params in QUERIES:
+        plan = " / ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params(rnd)))
+        timings = []
+        for _ in range(repeat):
+            args = params(rnd)
+            start = time.perf_counter()
+            conn.execute(sql, args).fetchall()
+            timings.append(time.perf_counter() - start)
+            conn.rollback()
+        timings.sort()
+        results[label] = (plan, timings[len(timings) // 2] * 1000)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query plans and timings before/after schema migrations")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+        create_schema(conn)
+        print(f"Generating {args.rows} rows...")
+        fill(conn, args.rows, args.seed)
+        before = measure(conn, args.repeat, args.seed)
+        version = apply_migrations(conn, target=TARGET_VERSION)
+        after = measure(conn, args.repeat, args.seed)
+        conn.close()
+
+    print(f"Schema version: 0 -> {version} (of {len(MIGRATIONS)} migrations)\n")
+    for label, _, _ in QUERIES:
+        plan_before, ms_before = before[label]
+        plan_after, ms_after = after[label]
+        speedup = ms_before / ms_after if ms_after else float("inf")
+        print(f"{label}: {ms_before:.2f} ms -> {ms_after:.2f} ms (x{speedup:.1f})")
+        print(f"    before: {plan_before}")
+        print(f"    after:  {plan_after}")
+
+
+if __name__ == "__main__":
+    main()
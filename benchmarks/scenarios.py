@@ -0,0 +1,200 @@
+import logging
+import os
+import random
+import shutil
+import time
+
+from database.database import Database
+
+# Найдовше сценарії з рядковим імпортом: обмежуємо їх, щоб прогін лишався в межах хвилин
+LEGACY_IMPORT_LIMIT = 2000
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    if not timings:
+        return {'calls': 0}
+    return {
+        'calls': len(timings),
+        'min_ms': timings[0] * 1000,
+        'p50_ms': timings[len(timings) // 2] * 1000,
+        'p95_ms': timings[min(int(len(timings) * 0.95), len(timings) - 1)] * 1000,
+        'max_ms': timings[-1] * 1000
+    }
+
+
+def timed(fn, args_list):
+    timings = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+class BenchmarkContext:
+    def __init__(self, workdir, generator, rows, repeat, import_rows):
+        self.workdir = workdir
+        self.generator = generator
+        self.rows = rows
+        self.repeat = repeat
+        self.import_rows = import_rows
+        self.rnd = random.Random(generator.seed)
+        self._template = None
+
+    def path(self, name):
+        return os.path.join(self.workdir, name)
+
+    def template(self):
+        # Заповнена база створюється один раз; сценарії, що змінюють дані, працюють з її копією
+        if self._template is None:
+            path = self.path("template.db")
+            start = time.perf_counter()
+            db = Database(path)
+            self.generator.populate(db, self.rows, self.workdir)
+            db.close()
+            logging.info(f"Template database with {self.rows} rows built in {time.perf_counter() - start:.2f}s")
+            self._template = path
+        return self._template
+
+    def copy_database(self, name):
+        path = self.path(name)
+        shutil.copyfile(self.template(), path)
+        return path
+
+
+def bench_startup(ctx):
+    empty = timed(lambda i: Database(ctx.path(f"empty_{i}.db")).close(), [(i,) for i in range(ctx.repeat)])
+    path = ctx.copy_database("startup.db")
+    steps = {}
+
+    def open_populated():
+        db = Database(path)
+        for step, ms in db.startup_timings.items():
+            steps.setdefault(step, []).append(ms / 1000)
+        db.close()
+
+    populated = timed(open_populated, [()] * ctx.repeat)
+    return {'empty': empty, 'populated': populated,
+            'steps': {step: summarize(values) for step, values in steps.items()}}
+
+
+def bench_add_equipment(ctx):
+    count = min(ctx.import_rows, LEGACY_IMPORT_LIMIT)
+    columns = ('inventory_number', 'type', 'name', 'model', 'serial_number', 'room', 'owner')
+    rows = [dict(zip(columns, row)) for row in ctx.generator.rows(count * 2, offset=10 ** 6)]
+    results = {}
+    for label, batch in (('per_call', rows[:count]), ('transaction', rows[count:])):
+        db = Database(ctx.copy_database(f"add_{label}.db"))
+        start = time.perf_counter()
+        if label == 'transaction':
+            with db.transaction():
+                for data in batch:
+                    db.add_equipment(data)
+        else:
+            for data in batch:
+                db.add_equipment(data)
+        elapsed = time.perf_counter() - start
+        db.close()
+        results[label] = {'rows': count, 'seconds': elapsed, 'rows_per_second': count / elapsed if elapsed else 0.0}
+    return results
+
+
+def bench_import(ctx):
+    results = {}
+    legacy_rows = min(ctx.import_rows, LEGACY_IMPORT_LIMIT)
+    xlsx = ctx.generator.write_xlsx(ctx.path("legacy.xlsx"), legacy_rows, offset=2 * 10 ** 6)
+    bulk_xlsx = ctx.generator.write_xlsx(ctx.path("bulk.xlsx"), ctx.import_rows, offset=2 * 10 ** 6, sheets=2)
+    csv_path = ctx.generator.write_csv(ctx.path("stream.csv"), ctx.import_rows, offset=2 * 10 ** 6)
+    runs = (
+        ('import_from_excel', lambda db: db.import_from_excel(xlsx), legacy_rows),
+        ('import_from_excel_bulk', lambda db: db.import_from_excel(bulk_xlsx, bulk=True), ctx.import_rows),
+        ('stream_import_xlsx', lambda db: db.stream_import(bulk_xlsx), ctx.import_rows),
+        ('stream_import_csv', lambda db: db.stream_import(csv_path), ctx.import_rows)
+    )
+    for label, run, rows in runs:
+        db = Database(ctx.copy_database(f"{label}.db"))
+        start = time.perf_counter()
+        imported = run(db)
+        elapsed = time.perf_counter() - start
+        db.close()
+        results[label] = {'rows': rows, 'imported': imported, 'seconds': elapsed,
+                          'rows_per_second': rows / elapsed if elapsed else 0.0}
+    return results
+
+
+def bench_search(ctx):
+    db = Database(ctx.template())
+    rnd = ctx.rnd
+    owners = ctx.generator.owners
+    queries = {
+        'inventory_number': [f"INV-{rnd.randrange(ctx.rows):07d}" for _ in range(ctx.repeat)],
+        'model': [rnd.choice(["Dell", "OptiPlex", "LaserJet", "Logitech", "P2419"]) for _ in range(ctx.repeat)],
+        'owner': [rnd.choice(owners).split()[0] for _ in range(ctx.repeat)],
+        'short': [rnd.choice(["De", "HP", "LG", "Ка"]) for _ in range(ctx.repeat)]
+    }
+    results = {label: timed(db.search_equipment, [(q,) for q in values]) for label, values in queries.items()}
+    db.close()
+    return results
+
+
+def bench_filter(ctx):
+    db = Database(ctx.template())
+    rnd = ctx.rnd
+    rooms = [(rnd.choice(ctx.generator.rooms), None) for _ in range(ctx.repeat)]
+    owners = [(None, rnd.choice(ctx.generator.owners)) for _ in range(ctx.repeat)]
+    results = {
+        'room': timed(db.filter_equipment, rooms),
+        'owner': timed(db.filter_equipment, owners),
+        'room_and_owner': timed(db.filter_equipment, [(r, o) for (r, _), (_, o) in zip(rooms, owners)]),
+        'page_room_by_name': timed(lambda room: db.page_equipment(room=room, sort_by='name'),
+                                   [(room,) for room, _ in rooms]),
+        'written_off': timed(db.get_all_equipment, [(True,)] * ctx.repeat)
+    }
+    db.close()
+    return results
+
+
+def bench_rename(ctx):
+    db = Database(ctx.copy_database("rename.db"))
+    rnd = ctx.rnd
+    rooms = rnd.sample(ctx.generator.rooms[:-1], min(ctx.repeat, len(ctx.generator.rooms) - 1))
+    owners = rnd.sample(ctx.generator.owners, min(ctx.repeat, len(ctx.generator.owners)))
+    results = {
+        'update_room': timed(db.update_room, [(room, f"{room} (нова назва)") for room in rooms]),
+        'update_owner': timed(db.update_owner, [(owner, f"{owner} (нове ПІБ)") for owner in owners])
+    }
+    db.close()
+    return results
+
+
+def bench_unify(ctx):
+    db = Database(ctx.copy_database("unify.db"))
+    ids = db.get_equipment_ids(False)
+    stale = ctx.rnd.sample(ids, len(ids) // 10)
+    raw_types = ["MON", "Monitor", "KEY", "Mouse", "PC", "Pr", "Scan"]
+    # Імітуємо рядки, записані до появи синонімів: напряму, в обхід нормалізації
+    with db.transaction() as conn:
+        conn.executemany("INSERT OR IGNORE INTO equipment_types (type_name) VALUES (?)", [(t,) for t in raw_types])
+        conn.executemany("UPDATE equipment SET type_id=(SELECT id FROM equipment_types WHERE type_name=?) WHERE id=?",
+                         [(ctx.rnd.choice(raw_types), equip_id) for equip_id in stale])
+    start = time.perf_counter()
+    updated = db.unify_types_in_db()
+    full = time.perf_counter() - start
+    since = db.current_timestamp()
+    noop = timed(db.unify_types_in_db, [()] * ctx.repeat)
+    incremental = timed(lambda: db.unify_types_in_db(since=since), [()] * ctx.repeat)
+    db.close()
+    return {'stale_rows': len(stale), 'updated': updated, 'full_ms': full * 1000,
+            'clean': noop, 'since': incremental}
+
+
+SCENARIOS = {
+    'startup': bench_startup,
+    'add_equipment': bench_add_equipment,
+    'import': bench_import,
+    'search': bench_search,
+    'filter': bench_filter,
+    'rename': bench_rename,
+    'unify': bench_unify
+}
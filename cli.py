@@ -0,0 +1,269 @@
+import argparse
+import csv
+import itertools
+import json
+import logging
+import sys
+from database.database import EQUIPMENT_FIELDS
+from utils.logger import setup_logging
+
+# Лише database.*: командний рядок не імпортує customtkinter і працює без графічного сеансу
+STATUSES = {'active': False, 'written-off': True, 'all': None}
+# Фільтри списку обладнання вміють або лише записи в експлуатації, або всі разом зі списаними
+FILTER_STATUSES = {'active': False, 'all': True}
+RENAME_KINDS = {'rename-room': 'rooms', 'rename-owner': 'owners', 'rename-type': 'types'}
+
+
+class CommandError(Exception):
+    pass
+
+
+def open_database(args):
+    from database.database import Database
+    return Database(args.db)
+
+
+def read_lines(paths):
+    # Порожній список або "-" означає стандартний вхід; порожні рядки й рядки з # пропускаються
+    for path in paths or ['-']:
+        f = sys.stdin if path == '-' else open(path, encoding='utf-8-sig')
+        try:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    yield line
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+def write_json(data):
+    json.dump(data, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write('\n')
+
+
+def write_records(rows, fmt):
+    # Рядки пишуться одразу, без накопичення всієї вибірки
+    if fmt == 'csv':
+        writer = csv.writer(sys.stdout)
+        writer.writerow(EQUIPMENT_FIELDS)
+        for row in rows:
+            writer.writerow([row[field] for field in EQUIPMENT_FIELDS])
+    elif fmt == 'jsonl':
+        for row in rows:
+            sys.stdout.write(json.dumps({field: row[field] for field in EQUIPMENT_FIELDS}, ensure_ascii=False) + '\n')
+    else:
+        sys.stdout.write('[')
+        for i, row in enumerate(rows):
+            sys.stdout.write(',\n  ' if i else '\n  ')
+            sys.stdout.write(json.dumps({field: row[field] for field in EQUIPMENT_FIELDS}, ensure_ascii=False))
+        sys.stdout.write('\n]\n')
+
+
+def cmd_import(db, args):
+    results = []
+    for path in args.files:
+        imported = db.stream_import(path, chunk_size=args.chunk_size)
+        stats = db.last_import_stats
+        results.append({
+            'file': path,
+            'imported': imported,
+            'seconds': round(stats['seconds'], 3),
+            'rows_per_second': round(stats['rows_per_second'])
+        })
+    write_json({'files': results, 'imported': sum(result['imported'] for result in results)})
+
+
+def cmd_export(db, args):
+    from database.exporter import export_csv_stream, export_equipment
+    show_written_off = FILTER_STATUSES[args.status]
+    if args.output == '-':
+        written = export_csv_stream(db, sys.stdout, args.room, args.owner, show_written_off, args.text)
+        logging.info(f"Exported {written} records to stdout")
+        return
+    written = export_equipment(db, args.output, args.room, args.owner, show_written_off, args.text,
+                               sheet_per_room=args.sheet_per_room)
+    write_json({'file': args.output, 'exported': written})
+
+
+def cmd_search(db, args):
+    show_written_off = FILTER_STATUSES[args.status]
+    if args.room or args.owner or show_written_off or args.limit == 0:
+        # З фільтрами або без обмеження — усі збіги частинами з одного курсора, за порядком id
+        chunks = db.iter_equipment(args.room, args.owner, show_written_off, args.text)
+        rows = (row for chunk in chunks for row in chunk)
+        if args.limit:
+            rows = itertools.islice(rows, args.limit)
+    else:
+        rows = db.search_equipment(args.text, limit=args.limit)
+    write_records(rows, args.format)
+
+
+def cmd_write_off(db, args):
+    numbers = list(dict.fromkeys(args.numbers or read_lines(args.file)))
+    found = db.get_ids_by_inventory_numbers(numbers)
+    missing = [number for number in numbers if number not in found]
+    written_off = 0
+    if not args.dry_run:
+        written_off = db.write_off_many(list(found.values()))
+    write_json({
+        'requested': len(numbers),
+        'found': len(found),
+        'written_off': written_off,
+        'already_written_off': 0 if args.dry_run else len(found) - written_off,
+        'not_found': missing,
+        'dry_run': args.dry_run
+    })
+
+
+def rename_pairs(args):
+    if args.old is not None:
+        if args.new is None:
+            raise CommandError("Потрібні стара і нова назви")
+        return [(args.old, args.new)]
+    # Пари зі стандартного входу або файлу: CSV або рядки, розділені табуляцією
+    pairs = []
+    for line in read_lines(args.file):
+        fields = line.split('\t') if '\t' in line else next(csv.reader([line]))
+        if len(fields) != 2 or not fields[0].strip() or not fields[1].strip():
+            raise CommandError(f"Очікується пара «стара назва, нова назва»: {line}")
+        pairs.append((fields[0].strip(), fields[1].strip()))
+    return pairs
+
+
+def cmd_rename(db, args):
+    kind = RENAME_KINDS[args.command]
+    updates = {'rooms': db.update_room, 'owners': db.update_owner, 'types': db.update_type}
+    existing = set({'rooms': db.get_all_rooms, 'owners': db.get_all_owners, 'types': db.get_all_types}[kind]())
+    renamed = []
+    not_found = []
+    for old, new in rename_pairs(args):
+        if old not in existing:
+            not_found.append(old)
+            continue
+        merged = new in existing and new != old
+        updates[kind](old, new)
+        existing.discard(old)
+        existing.add(new)
+        renamed.append({'old': old, 'new': new, 'merged': merged})
+    write_json({'kind': kind, 'renamed': renamed, 'not_found': not_found})
+
+
+def cmd_stats(db, args):
+    from database.reports import InventoryReports
+    reports = InventoryReports(db)
+    show_written_off = STATUSES[args.status]
+    if args.crosstab:
+        table = reports.crosstab(*args.crosstab, show_written_off=show_written_off)
+        if args.format == 'csv':
+            writer = csv.writer(sys.stdout)
+            writer.writerow([''] + table['columns'] + ['total'])
+            for label, counts, total in table['rows']:
+                writer.writerow([label] + counts + [total])
+            writer.writerow(['total'] + table['column_totals'] + [table['total']])
+        else:
+            write_json(table)
+    elif args.by:
+        counts = reports.counts_by(args.by, show_written_off)
+        if args.format == 'csv':
+            writer = csv.writer(sys.stdout)
+            writer.writerow([args.by, 'count'])
+            writer.writerows(counts)
+        else:
+            write_json([{args.by: label, 'count': count} for label, count in counts])
+    else:
+        summary = reports.summary()
+        if args.format == 'csv':
+            writer = csv.writer(sys.stdout)
+            writer.writerow(list(summary))
+            writer.writerow(list(summary.values()))
+        else:
+            write_json(summary)
+
+
+COMMANDS = {
+    'import': cmd_import,
+    'export': cmd_export,
+    'search': cmd_search,
+    'write-off': cmd_write_off,
+    'rename-room': cmd_rename,
+    'rename-owner': cmd_rename,
+    'rename-type': cmd_rename,
+    'stats': cmd_stats
+}
+
+
+def build_parser():
+    from database.database import DB_PATH, SEARCH_LIMIT
+    from database.exporter import EXPORT_COLUMNS
+    from database.importer import IMPORT_CHUNK_SIZE
+    from database.reports import DIMENSIONS
+
+    parser = argparse.ArgumentParser(prog="python cli.py", description="Inventory Manager command-line interface")
+    parser.add_argument("--db", default=DB_PATH, help=f"database file (default: {DB_PATH})")
+    parser.add_argument("--verbose", action="store_true", help="log to stderr as well as the log file")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("import", help="import equipment from CSV/XLSX/XLS files")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+
+    def add_filters(p):
+        p.add_argument("--room")
+        p.add_argument("--owner")
+        p.add_argument("--status", choices=FILTER_STATUSES, default="active")
+
+    p = sub.add_parser("export", help="export equipment to CSV/XLSX, or CSV to stdout with '-'",
+                       description=f"Columns: {', '.join(heading for _, heading in EXPORT_COLUMNS)}")
+    p.add_argument("output")
+    add_filters(p)
+    p.add_argument("--text", help="full-text filter, as in the search page")
+    p.add_argument("--sheet-per-room", action="store_true", help="one sheet per room (XLSX only)")
+
+    p = sub.add_parser("search", help="full-text search; prints matching records")
+    p.add_argument("text")
+    add_filters(p)
+    p.add_argument("--limit", type=int, default=SEARCH_LIMIT, help="0 for all matches")
+    p.add_argument("--format", choices=("json", "jsonl", "csv"), default="json")
+
+    p = sub.add_parser("write-off", help="write off equipment by inventory number")
+    p.add_argument("numbers", nargs="*", help="inventory numbers; read from --file or stdin when omitted")
+    p.add_argument("--file", action="append", help="file with one inventory number per line, '-' for stdin")
+    p.add_argument("--dry-run", action="store_true", help="only report what would be written off")
+
+    for command in RENAME_KINDS:
+        p = sub.add_parser(command, help=f"{command.replace('-', ' ')}; an existing new name merges the two",
+                           description="Without OLD/NEW, reads 'old,new' pairs (CSV or tab-separated) from "
+                                       "--file or stdin.")
+        p.add_argument("old", nargs="?")
+        p.add_argument("new", nargs="?")
+        p.add_argument("--file", action="append", help="file with one pair per line, '-' for stdin")
+
+    p = sub.add_parser("stats", help="inventory summary and counts")
+    group = p.add_mutually_exclusive_group()
+    group.add_argument("--by", choices=sorted(DIMENSIONS))
+    group.add_argument("--crosstab", nargs=2, metavar=("ROWS", "COLUMNS"), choices=sorted(DIMENSIONS))
+    p.add_argument("--status", choices=STATUSES, default="active")
+    p.add_argument("--format", choices=("json", "csv"), default="json")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    setup_logging(console=args.verbose)
+    logging.debug(f"CLI command: {args.command}")
+    db = open_database(args)
+    try:
+        COMMANDS[args.command](db, args)
+    except (CommandError, ValueError, OSError) as e:
+        logging.error(f"CLI command {args.command} failed: {e}")
+        json.dump({'error': str(e)}, sys.stderr, ensure_ascii=False)
+        sys.stderr.write('\n')
+        return 1
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import logging
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from database.instrumentation import InstrumentedConnection
+
+# Іменовані профілі зберігання: набори PRAGMA, що застосовуються до кожного з'єднання.
+# WAL не працює на мережевих дисках, тому для бази у спільній папці є профіль "shared".
+STORAGE_PROFILES = {
+    'default': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000
+    },
+    'safe': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16000,
+        'mmap_size': 0,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000
+    },
+    'bulk': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -128000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000
+    },
+    'shared': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'cache_size': -8000,
+        'mmap_size': 0,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 30000
+    }
+}
+DEFAULT_PROFILE = os.environ.get('INVENTORY_DB_PROFILE', 'default')
+
+
+class _ReaderHandle:
+    def __init__(self, conn):
+        self.conn = conn
+
+
+class ConnectionManager:
+    def __init__(self, db_path, profile=None, stats=None):
+        profile = profile or DEFAULT_PROFILE
+        if profile not in STORAGE_PROFILES:
+            raise ValueError(f"Unknown storage profile: {profile}")
+        self.db_path = db_path
+        self.profile = profile
+        self.pragmas = STORAGE_PROFILES[profile]
+        self.stats = stats
+        # База в пам'яті існує лише в межах одного з'єднання, тож читачі працюють через writer
+        self.single_connection = db_path == ':memory:'
+        self.write_lock = threading.RLock()
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        self.writer = self._connect()
+        logging.debug(f"Connection manager for {db_path} uses profile '{profile}'")
+
+    def _connect(self):
+        factory = InstrumentedConnection if self.stats is not None else sqlite3.Connection
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=self.pragmas['busy_timeout'] / 1000,
+                               factory=factory)
+        if self.stats is not None:
+            conn.stats = self.stats
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def write_depth(self):
+        return getattr(self._local, 'write_depth', 0)
+
+    def in_write(self):
+        return self.write_depth() > 0
+
+    def reader(self):
+        # Усередині запису читаємо через writer, щоб бачити ще не зафіксовані зміни
+        if self.single_connection or self.in_write():
+            return self.writer
+        handle = getattr(self._local, 'reader', None)
+        if handle is None:
+            conn = self._connect()
+            handle = _ReaderHandle(conn)
+            self._local.reader = handle
+            with self._readers_lock:
+                self._readers.append(conn)
+            # Дані threading.local звільняються із завершенням потоку, а з ними й обгортка:
+            # тоді з'єднання закривається, і короткі потоки імпорту чи експорту не лишають відкритих читачів
+            weakref.finalize(handle, self._release_reader, conn, threading.current_thread().name)
+            logging.debug(f"Opened reader connection for thread {threading.current_thread().name}")
+        return handle.conn
+
+    def _release_reader(self, conn, thread_name):
+        with self._readers_lock:
+            if conn not in self._readers:
+                return
+            self._readers.remove(conn)
+        conn.close()
+        logging.debug(f"Closed reader connection of finished thread {thread_name}")
+
+    @contextmanager
+    def write(self):
+        with self.write_lock:
+            self._local.write_depth = getattr(self._local, 'write_depth', 0) + 1
+            try:
+                yield self.writer
+            finally:
+                self._local.write_depth -= 1
+
+    def reopen_writer(self):
+        # З'єднання тримає оцінки розмірів таблиць, прочитані під час відкриття; після міграцій вони застарілі.
+        # База в пам'яті зникла б разом із з'єднанням, до того ж вона щойно створена і застарілої статистики не має
+        if self.single_connection:
+            return
+        with self.write_lock:
+            self.writer.close()
+            self.writer = self._connect()
+
+    def close(self):
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers = []
+        self.writer.close()
@@ -1,282 +1,954 @@
 import sqlite3
+import json
 import logging
-import pandas as pd
+import os
+import time
+from contextlib import contextmanager
+from database.connection import ConnectionManager
+from database.instrumentation import QueryStats, instrumentation_requested
+from database.migrations import apply_migrations, get_schema_version
+from database.importer import IMPORT_CHUNK_SIZE, iter_import_chunks
 
 DB_PATH = "inventory.db"
+SEARCH_LIMIT = 200
+PAGE_SIZE = 100
+SORTABLE_COLUMNS = ('id', 'inventory_number', 'type', 'name', 'room', 'owner')
+# Поля запису обладнання, які віддаються назовні: командний рядок і HTTP API
+EQUIPMENT_FIELDS = ('id', 'inventory_number', 'type', 'name', 'model', 'serial_number', 'room', 'owner', 'written_off',
+                    'updated_at', 'version')
+# Поля картки обладнання, що порівнюються під час злиття одночасних редагувань
+MERGE_FIELDS = ('inventory_number', 'type', 'name', 'model', 'serial_number', 'room', 'owner', 'written_off')
+# Підзапити, що перетворюють назву з довідника на ідентифікатор для стовпців equipment
+TYPE_ID = "(SELECT id FROM equipment_types WHERE type_name=?)"
+ROOM_ID = "(SELECT id FROM rooms WHERE room_name=?)"
+OWNER_ID = "(SELECT id FROM owners WHERE full_name=?)"
+STOCK_ROOM = "Склад"
+# Збільшується при зміні стандартних синонімів, щоб наступний запуск повторив заповнення довідників
+SEED_VERSION = 1
+DEFAULT_SYNONYMS = [
+    ("?", "Невідомо"),
+    ("chp", "Checkpoint"),
+    ("fil", "Фільтр"),
+    ("filter", "Фільтр"),
+    ("key", "Клавіатура"),
+    ("keyboard", "Клавіатура"),
+    ("mon", "Монітор"),
+    ("monitor", "Монітор"),
+    ("mou", "Миша"),
+    ("mouse", "Миша"),
+    ("pc", "Комп'ютер"),
+    ("pr", "Принтер"),
+    ("rout", "Роутер"),
+    ("scan", "Сканер"),
+    ("sw", "Свіч"),
+    ("web", "Вебкамера"),
+    ("ups", "Джерело безперебійного живлення"),
+    ("uninterruptible power supply", "Джерело безперебійного живлення")
+]
+STARTUP_TIMINGS_ENV = 'INVENTORY_STARTUP_TIMINGS'
+# Модулі пакета, чиї функції показуються на сторінці діагностики як місце виклику запиту
+CALL_SITE_MODULES = ('database.py', 'reports.py', 'exporter.py', 'importer.py')
+REFERENCE_TABLES = {
+    'types': ("equipment_types", "type_name"),
+    'rooms': ("rooms", "room_name"),
+    'owners': ("owners", "full_name")
+}
+# Стовпці equipment_v з назвами з довідників: довідник і ключ у таблиці equipment
+REFERENCE_COLUMNS = {
+    'type': ('types', 'type_id'),
+    'room': ('rooms', 'room_id'),
+    'owner': ('owners', 'owner_id')
+}
 
 class Database:
-    def __init__(self, db_path=DB_PATH):
+    def __init__(self, db_path=DB_PATH, profile=None, instrument=None):
         logging.debug("Initializing Database")
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
-        self.create_tables()
-        self.populate_types()
-        self.populate_synonyms()
-        self.populate_rooms_and_owners_from_equipment()
+        started = time.perf_counter()
+        self.startup_timings = {}
+        self.db_path = db_path
+        if instrument is None:
+            instrument = instrumentation_requested()
+        call_site_files = {os.path.join(os.path.dirname(__file__), name) for name in CALL_SITE_MODULES}
+        self.stats = QueryStats(call_site_files=call_site_files) if instrument else None
+        self._reference_cache = {}
+        self._reference_version = None
+        self._listeners = []
+        self._pending_changes = set()
+        self._change_count = 0
+        with self._startup_step('connect'):
+            self.pool = ConnectionManager(db_path, profile, self.stats)
+        with self._startup_step('create_tables'):
+            self.create_tables()
+        with self._startup_step('migrations'):
+            # Міграції самі керують транзакціями, тож виконуються лише під блокуванням запису
+            with self.pool.write_lock:
+                previous_version = get_schema_version(self.conn)
+                self.schema_version = apply_migrations(self.conn)
+                if self.schema_version != previous_version:
+                    self.pool.reopen_writer()
+            self._fts_tables = self._detect_fts_tables()
+        with self._startup_step('seed'):
+            self.seed_reference_data()
+        self.startup_timings['total'] = (time.perf_counter() - started) * 1000
+        if os.environ.get(STARTUP_TIMINGS_ENV):
+            logging.info("Database startup: " + ", ".join(f"{step} {ms:.1f} ms"
+                                                         for step, ms in self.startup_timings.items()))
         logging.debug("Database initialized successfully")
 
-    def create_tables(self):
-        c = self.conn.cursor()
-        c.execute('''
-        CREATE TABLE IF NOT EXISTS equipment (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            inventory_number TEXT UNIQUE,
-            type TEXT,
-            name TEXT,
-            model TEXT,
-            serial_number TEXT,
-            room TEXT,
-            owner TEXT,
-            written_off INTEGER DEFAULT 0
-        )
-        ''')
-        c.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT UNIQUE
-        )
-        ''')
-        c.execute('''
-        CREATE TABLE IF NOT EXISTS equipment_types (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            type_name TEXT UNIQUE
-        )
-        ''')
-        c.execute('''
-        CREATE TABLE IF NOT EXISTS rooms (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            room_name TEXT UNIQUE NOT NULL,
-            max_seats INTEGER DEFAULT 0
-        )
-        ''')
-        c.execute('''
-        CREATE TABLE IF NOT EXISTS owners (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            full_name TEXT UNIQUE NOT NULL,
-            position TEXT,
-            pc_ip TEXT,
-            pc_name TEXT,
-            phone TEXT,
-            email TEXT
-        )
-        ''')
-        c.execute('''
-        CREATE TABLE IF NOT EXISTS type_synonyms (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            synonym TEXT NOT NULL,
-            main_type TEXT NOT NULL REFERENCES equipment_types(type_name)
-        )
-        ''')
-        c.execute('''
-        CREATE TABLE IF NOT EXISTS settings (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            appearance_mode TEXT DEFAULT 'system',
-            color_theme TEXT DEFAULT 'blue'
-        )
-        ''')
-        c.execute("SELECT COUNT(*) FROM settings")
-        if c.fetchone()[0] == 0:
-            c.execute("INSERT INTO settings (appearance_mode, color_theme) VALUES (?, ?)", ('system', 'blue'))
-        self.conn.commit()
-        logging.debug("Tables created successfully")
-
-    def populate_synonyms(self):
-        c = self.conn.cursor()
-        synonyms = [
-            ("?", "Невідомо"),
-            ("chp", "Checkpoint"),
-            ("fil", "Фільтр"),
-            ("filter", "Фільтр"),
-            ("key", "Клавіатура"),
-            ("keyboard", "Клавіатура"),
-            ("mon", "Монітор"),
-            ("monitor", "Монітор"),
-            ("mou", "Миша"),
-            ("mouse", "Миша"),
-            ("pc", "Комп'ютер"),
-            ("pr", "Принтер"),
-            ("rout", "Роутер"),
-            ("scan", "Сканер"),
-            ("sw", "Свіч"),
-            ("web", "Вебкамера"),
-            ("ups", "Джерело безперебійного живлення"),
-            ("uninterruptible power supply", "Джерело безперебійного живлення")
-        ]
-        for synonym, main_type in synonyms:
-            self.ensure_type(main_type)
-            c.execute("SELECT synonym FROM type_synonyms WHERE synonym=? AND main_type=?", (synonym, main_type))
-            if not c.fetchone():
-                c.execute("INSERT INTO type_synonyms (synonym, main_type) VALUES (?, ?)", (synonym, main_type))
-                logging.debug(f"Added synonym: {synonym} -> {main_type}")
-        self.conn.commit()
+    @contextmanager
+    def _startup_step(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.startup_timings[name] = (time.perf_counter() - start) * 1000
 
-    def populate_types(self):
-        c = self.conn.cursor()
-        c.execute("SELECT DISTINCT main_type FROM type_synonyms")
-        types = [row['main_type'] for row in c.fetchall()]
-        for t in types:
-            self.ensure_type(t)
-        self.conn.commit()
+    @property
+    def conn(self):
+        return self.pool.writer
 
-    def add_equipment(self, data):
-        c = self.conn.cursor()
+    def _reader(self):
+        return self.pool.reader()
+
+    def read_cursor(self):
+        # Курсор читача поточного потоку для запитів поза Database, наприклад звітів
+        return self._reader().cursor()
+
+    @contextmanager
+    def transaction(self):
+        # Вкладені виклики працюють у точках збереження, фіксація відбувається лише на зовнішньому рівні
+        with self.pool.write() as conn:
+            depth = self.pool.write_depth()
+            if depth > 1:
+                savepoint = f"sp_{depth}"
+                conn.execute(f"SAVEPOINT {savepoint}")
+                try:
+                    yield conn
+                except BaseException:
+                    self._rollback_to(conn, savepoint)
+                    raise
+                conn.execute(f"RELEASE {savepoint}")
+                return
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                self._pending_changes.clear()
+                self._reference_cache.clear()
+                logging.debug("Transaction rolled back")
+                raise
+            changed, self._pending_changes = self._pending_changes, set()
+            if changed:
+                self._notify(*changed)
+
+    def _rollback_to(self, conn, savepoint):
+        self._reference_cache.clear()
         try:
-            equip_type = self.get_main_type(data['type'].lower()) or "Невідомо"
-            if data['room'] and not self.check_room_capacity(data['room']):
-                raise ValueError(f"Кабінет {data['room']} перевищує максимальну кількість місць")
-            self.ensure_type(equip_type)
-            self.ensure_room(data['room'])
-            self.ensure_owner(data['owner'])
+            conn.execute(f"ROLLBACK TO {savepoint}")
+            conn.execute(f"RELEASE {savepoint}")
+        except sqlite3.Error as e:
+            logging.error(f"Error rolling back to {savepoint}: {e}")
+
+    def _mark_changed(self, *kinds):
+        # Слухачі отримують сповіщення лише після фіксації зовнішньої транзакції
+        if self.pool.in_write():
+            self._pending_changes.update(kinds)
+        else:
+            self._notify(*kinds)
+
+    def query_stats(self, since=0, limit=20, until=None):
+        if self.stats is None:
+            return None
+        return self.stats.snapshot(since, limit, until)
+
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, *kinds):
+        self._change_count += 1
+        changed = set(kinds)
+        for callback in list(self._listeners):
+            try:
+                callback(changed)
+            except Exception as e:
+                logging.error(f"Error in change listener: {e}")
+
+    def data_version(self):
+        # PRAGMA data_version читача змінюється після фіксацій інших з'єднань (writer чи іншого процесу),
+        # а лічильник сповіщень покриває випадок, коли читачем є сам writer
+        # Значення PRAGMA має сенс лише для того самого з'єднання, тому воно входить до версії
+        conn = self._reader()
+        return self._change_count, id(conn), conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        with self.pool.write_lock:
+            try:
+                # Оновлює статистику планувальника для таблиць, які цього потребують
+                self.conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logging.error(f"Error optimizing database on close: {e}")
+            self.pool.close()
+        logging.debug("Database closed")
+
+    def create_tables(self):
+        with self.transaction():
+            c = self.conn.cursor()
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS equipment (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                inventory_number TEXT UNIQUE,
+                type TEXT,
+                name TEXT,
+                model TEXT,
+                serial_number TEXT,
+                room TEXT,
+                owner TEXT,
+                written_off INTEGER DEFAULT 0
+            )
+            ''')
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE
+            )
+            ''')
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS equipment_types (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                type_name TEXT UNIQUE
+            )
+            ''')
             c.execute('''
-            INSERT INTO equipment (inventory_number, type, name, model, serial_number, room, owner, written_off)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (data['inventory_number'], equip_type, data['name'], data['model'], data['serial_number'],
-                  data['room'], data['owner'], data.get('written_off', 0)))
-            self.conn.commit()
-            self.unify_types_in_db()
-            logging.debug(f"Equipment added: {data['inventory_number']} with type: {equip_type}")
-            return True
-        except sqlite3.IntegrityError as e:
-            logging.error(f"IntegrityError in add_equipment: {e}")
+            CREATE TABLE IF NOT EXISTS rooms (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                room_name TEXT UNIQUE NOT NULL,
+                max_seats INTEGER DEFAULT 0
+            )
+            ''')
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS owners (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                full_name TEXT UNIQUE NOT NULL,
+                position TEXT,
+                pc_ip TEXT,
+                pc_name TEXT,
+                phone TEXT,
+                email TEXT
+            )
+            ''')
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS type_synonyms (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                synonym TEXT NOT NULL,
+                main_type TEXT NOT NULL REFERENCES equipment_types(type_name)
+            )
+            ''')
+            c.execute('''
+            CREATE TABLE IF NOT EXISTS settings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                appearance_mode TEXT DEFAULT 'system',
+                color_theme TEXT DEFAULT 'blue'
+            )
+            ''')
+            c.execute("SELECT COUNT(*) FROM settings")
+            if c.fetchone()[0] == 0:
+                c.execute("INSERT INTO settings (appearance_mode, color_theme) VALUES (?, ?)", ('system', 'blue'))
+            logging.debug("Tables created successfully")
+
+    def _get_meta(self, key):
+        c = self._reader().cursor()
+        c.execute("SELECT value FROM app_meta WHERE key=?", (key,))
+        row = c.fetchone()
+        return row['value'] if row else None
+
+    def _set_meta(self, key, value):
+        with self.transaction():
+            self.conn.execute('''
+            INSERT INTO app_meta (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value=excluded.value
+            ''', (key, value))
+
+    def seed_reference_data(self, force=False):
+        # Довідники заповнюються один раз на версію схеми та набору синонімів; далі їх підтримують методи запису
+        marker = f"{SEED_VERSION}:{self.schema_version}"
+        if not force and self._get_meta('seed_version') == marker:
+            logging.debug(f"Reference data already seeded ({marker})")
             return False
-        except ValueError as e:
-            logging.error(f"ValueError in add_equipment: {e}")
-            raise e
+        with self.transaction():
+            c = self.conn.cursor()
+            c.executemany("INSERT OR IGNORE INTO equipment_types (type_name) VALUES (?)",
+                          [(main_type,) for main_type in dict.fromkeys(t for _, t in DEFAULT_SYNONYMS)])
+            c.executemany('''
+            INSERT INTO type_synonyms (synonym, main_type)
+            SELECT ?1, ?2 WHERE NOT EXISTS (SELECT 1 FROM type_synonyms WHERE synonym=?1 AND main_type=?2)
+            ''', DEFAULT_SYNONYMS)
+            c.execute("INSERT OR IGNORE INTO equipment_types (type_name) SELECT DISTINCT main_type FROM type_synonyms")
+            self._set_meta('seed_version', marker)
+            self._reference_cache.clear()
+            self._mark_changed('types', 'synonyms', 'rooms', 'owners')
+        logging.debug(f"Reference data seeded ({marker})")
+        return True
 
-    def update_equipment(self, equip_id, data):
-        c = self.conn.cursor()
-        try:
-            equip_type = self.get_main_type(data['type'].lower()) or data['type']
-            if data['room'] and not self.check_room_capacity(data['room']):
-                raise ValueError(f"Кабінет {data['room']} перевищує максимальну кількість місць")
-            self.ensure_type(equip_type)
-            self.ensure_room(data['room'])
-            self.ensure_owner(data['owner'])
-            c.execute('''
-            UPDATE equipment SET inventory_number=?, type=?, name=?, model=?, serial_number=?, room=?, owner=?, written_off=?
-            WHERE id=?
-            ''', (data['inventory_number'], equip_type, data['name'], data['model'], data['serial_number'],
-                  data['room'], data['owner'], data.get('written_off', 0), equip_id))
-            self.conn.commit()
-            logging.debug(f"Equipment updated: ID {equip_id}")
-        except ValueError as e:
-            logging.error(f"ValueError in update_equipment: {e}")
-            raise e
+    def add_equipment(self, data):
+        with self.transaction():
+            c = self.conn.cursor()
+            try:
+                equip_type = self.get_main_type(data['type'].lower()) or "Невідомо"
+                if data['room'] and not self.check_room_capacity(data['room']):
+                    raise ValueError(f"Кабінет {data['room']} перевищує максимальну кількість місць")
+                self.ensure_type(equip_type)
+                self.ensure_room(data['room'])
+                self.ensure_owner(data['owner'])
+                c.execute(f'''
+                INSERT INTO equipment (inventory_number, type_id, name, model, serial_number, room_id, owner_id, written_off,
+                                       updated_at)
+                VALUES (?, {TYPE_ID}, ?, ?, ?, {ROOM_ID}, {OWNER_ID}, ?, CURRENT_TIMESTAMP)
+                ''', (data['inventory_number'], equip_type, data['name'], data['model'], data['serial_number'],
+                      data['room'], data['owner'], data.get('written_off', 0)))
+                self._mark_changed('equipment')
+                logging.debug("Equipment added: %s with type: %s", data['inventory_number'], equip_type)
+                return True
+            except sqlite3.IntegrityError as e:
+                logging.error(f"IntegrityError in add_equipment: {e}")
+                return False
+            except ValueError as e:
+                logging.error(f"ValueError in add_equipment: {e}")
+                raise e
+
+    def update_equipment(self, equip_id, data, expected_version=None, base=None):
+        # expected_version — версія рядка, з якою почалося редагування: запис оновлюється, лише якщо її ніхто не змінив.
+        # Якщо є ще й base (рядок на момент відкриття), чужі зміни інших полів зливаються з власними
+        with self.transaction():
+            c = self.conn.cursor()
+            c.execute('SELECT * FROM equipment_v WHERE id=?', (equip_id,))
+            current = c.fetchone()
+            if current is None:
+                logging.error(f"Equipment not found for update: ID {equip_id}")
+                return {'status': 'not_found', 'version': None, 'conflicts': [], 'current': None}
+            status = 'updated'
+            if base is not None:
+                base, data = self._follow_reference_renames(base, data, current)
+            if expected_version is not None and current['version'] != expected_version:
+                if base is not None:
+                    data, conflicts = self.merge_equipment_changes(base, data, current)
+                else:
+                    # Без base невідомо, хто що змінив: конфліктом вважається кожне поле, що відрізняється від поточного
+                    conflicts = [field for field in MERGE_FIELDS
+                                 if self._merge_value(data, field) != self._merge_value(current, field)]
+                if conflicts:
+                    logging.debug("Update conflict for equipment ID %s: %s", equip_id, conflicts)
+                    return {'status': 'conflict', 'version': current['version'], 'conflicts': conflicts,
+                            'current': current}
+                status = 'merged'
+            try:
+                equip_type = self.get_main_type(data['type'].lower()) or data['type']
+                written_off = data.get('written_off', 0)
+                # Місткість перевіряється лише тоді, коли запис з'являється в кабінеті: у своєму він уже врахований
+                arriving = data['room'] != current['room'] or current['written_off']
+                if data['room'] and not written_off and arriving and not self.check_room_capacity(data['room']):
+                    raise ValueError(f"Кабінет {data['room']} перевищує максимальну кількість місць")
+                self.ensure_type(equip_type)
+                self.ensure_room(data['room'])
+                self.ensure_owner(data['owner'])
+                c.execute(f'''
+                UPDATE equipment SET inventory_number=?, type_id={TYPE_ID}, name=?, model=?, serial_number=?,
+                    room_id={ROOM_ID}, owner_id={OWNER_ID}, written_off=?, updated_at=CURRENT_TIMESTAMP,
+                    version=version+1
+                WHERE id=? AND version=?
+                ''', (data['inventory_number'], equip_type, data['name'], data['model'], data['serial_number'],
+                      data['room'], data['owner'], written_off, equip_id, current['version']))
+                if c.rowcount == 0:
+                    # Рядок змінився чи зник між читанням і записом: нічого не записано
+                    c.execute('SELECT * FROM equipment_v WHERE id=?', (equip_id,))
+                    current = c.fetchone()
+                    if current is None:
+                        return {'status': 'not_found', 'version': None, 'conflicts': [], 'current': None}
+                    conflicts = [field for field in MERGE_FIELDS
+                                 if self._merge_value(data, field) != self._merge_value(current, field)]
+                    logging.debug("Update conflict for equipment ID %s: row changed before write", equip_id)
+                    return {'status': 'conflict', 'version': current['version'], 'conflicts': conflicts,
+                            'current': current}
+                self._mark_changed('equipment')
+                logging.debug("Equipment %s: ID %s, version %s", status, equip_id, current['version'] + 1)
+                return {'status': status, 'version': current['version'] + 1, 'conflicts': [], 'current': None}
+            except ValueError as e:
+                logging.error(f"ValueError in update_equipment: {e}")
+                raise e
+
+    @staticmethod
+    def _merge_value(row, field):
+        value = row[field] if field in row.keys() else None
+        if field == 'written_off':
+            return int(value or 0)
+        return (value or '').strip()
+
+    @staticmethod
+    def _follow_reference_renames(base, mine, current):
+        # Перейменування кабінету, власника чи типу не змінює версію записів, тож base і мої дані можуть мати стару
+        # назву. Незмінене мною поле береться з поточного рядка, щоб стара назва не відтворилась у довіднику,
+        # а якщо base має той самий ідентифікатор, що й поточний рядок, стара назва в base — не чужа зміна
+        base, mine = dict(base), dict(mine)
+        for field, (_, key) in REFERENCE_COLUMNS.items():
+            if Database._merge_value(mine, field) == Database._merge_value(base, field):
+                mine[field] = current[field]
+            if key in base and base[key] == current[key]:
+                base[field] = current[field]
+        return base, mine
+
+    @staticmethod
+    def merge_equipment_changes(base, mine, current):
+        # Трибічне злиття по полях: поле, яке я не змінював, береться з поточного рядка, а змінене мною —
+        # з моїх даних, якщо його не змінив хтось інший; інакше це конфлікт
+        merged = {}
+        conflicts = []
+        for field in MERGE_FIELDS:
+            base_value, my_value, their_value = (Database._merge_value(row, field) for row in (base, mine, current))
+            if my_value == base_value or my_value == their_value:
+                merged[field] = their_value
+            elif their_value == base_value:
+                merged[field] = my_value
+            else:
+                merged[field] = their_value
+                conflicts.append(field)
+        return merged, conflicts
 
     def get_equipment_by_id(self, equip_id):
-        c = self.conn.cursor()
-        c.execute('SELECT * FROM equipment WHERE id=?', (equip_id,))
+        c = self._reader().cursor()
+        c.execute('SELECT * FROM equipment_v WHERE id=?', (equip_id,))
         return c.fetchone()
 
-    def search_equipment(self, text):
-        c = self.conn.cursor()
-        text = f'%{text}%'
-        c.execute('''
-        SELECT * FROM equipment WHERE (inventory_number LIKE ? OR name LIKE ? OR model LIKE ? OR serial_number LIKE ?)
-        AND written_off=0
-        ''', (text, text, text, text))
-        return c.fetchall()
+    def _detect_fts_tables(self):
+        # Триграмна таблиця знаходить підрядки, таблиця з prefix= — початки слів
+        c = self._reader().cursor()
+        c.execute("SELECT name, sql FROM sqlite_master WHERE type='table' "
+                  "AND name IN ('equipment_fts', 'equipment_fts_prefix')")
+        tables = {'trigram': None, 'prefix': None}
+        for row in c.fetchall():
+            tables['trigram' if 'trigram' in row['sql'] else 'prefix'] = row['name']
+        return tables
 
-    def filter_equipment(self, room=None, owner=None, show_written_off=False):
-        c = self.conn.cursor()
-        query = 'SELECT * FROM equipment WHERE 1=1 '
+    def _fts_matches(self, text):
+        # Пари (таблиця, вираз MATCH) від кращого збігу до гіршого: спершу початки слів, потім підрядки.
+        # Триграмний індекс не знаходить запити коротші за три символи
+        phrase = '"' + text.replace('"', '""') + '"'
+        matches = []
+        if self._fts_tables['prefix']:
+            matches.append((self._fts_tables['prefix'], phrase + '*'))
+        if self._fts_tables['trigram'] and len(text) >= 3:
+            matches.append((self._fts_tables['trigram'], phrase))
+        return matches
+
+    def search_equipment(self, text, limit=None):
+        c = self._reader().cursor()
+        text = text.strip()
+        matches = self._fts_matches(text) if text else []
+        if not matches:
+            query = '''
+            SELECT * FROM equipment_v WHERE (inventory_number LIKE ? OR name LIKE ? OR model LIKE ? OR serial_number LIKE ?
+                                           OR room LIKE ? OR owner LIKE ?)
+            AND written_off=0
+            '''
+            params = [f'%{text}%'] * 6
+            if limit is not None:
+                query += 'LIMIT ?'
+                params.append(limit)
+            c.execute(query, params)
+            return c.fetchall()
+        # bm25 ранжує всі збіги серед записів в експлуатації; списані відсіюються з'єднанням до обмеження.
+        # Збіги з початком слова йдуть першими, підрядки всередині слів доповнюють результат до limit
+        rows = []
+        seen = set()
+        for table, phrase in matches:
+            c.execute(f'''
+            SELECT e.* FROM (
+                SELECT f.rowid, f.rank FROM {table} f JOIN equipment a ON a.id = f.rowid
+                WHERE {table} MATCH ? AND a.written_off=0
+                ORDER BY f.rank LIMIT ?
+            ) f JOIN equipment_v e ON e.id = f.rowid
+            ORDER BY f.rank
+            ''', (phrase, -1 if limit is None else limit))
+            rows.extend(row for row in c.fetchall() if row['id'] not in seen)
+            if limit is not None and len(rows) >= limit:
+                return rows[:limit]
+            seen.update(row['id'] for row in rows)
+        return rows
+
+    def _equipment_query(self, columns, room=None, owner=None, show_written_off=False, text=None):
+        # Ті самі умови, що й у filter_equipment та search_equipment, але без обмеження кількості збігів
+        query = f'SELECT {columns} FROM equipment_v WHERE 1=1 '
         params = []
         if not show_written_off:
             query += 'AND written_off=0 '
         if room and room != '---':
-            query += 'AND room LIKE ? '
-            params.append(f'%{room}%')
+            query += f'AND room_id={ROOM_ID} '
+            params.append(room)
         if owner and owner != '---':
-            query += 'AND owner LIKE ? '
-            params.append(f'%{owner}%')
+            query += f'AND owner_id={OWNER_ID} '
+            params.append(owner)
+        text = (text or '').strip()
+        matches = self._fts_matches(text) if text else []
+        if matches:
+            query += 'AND id IN (' + ' UNION '.join(f'SELECT rowid FROM {table} WHERE {table} MATCH ?'
+                                                    for table, _ in matches) + ') '
+            params.extend(phrase for _, phrase in matches)
+        elif text:
+            query += ('AND (inventory_number LIKE ? OR name LIKE ? OR model LIKE ? OR serial_number LIKE ? '
+                      'OR room LIKE ? OR owner LIKE ?) ')
+            params.extend([f'%{text}%'] * 6)
+        return query, params
+
+    def count_equipment(self, room=None, owner=None, show_written_off=False, text=None):
+        query, params = self._equipment_query('COUNT(*) AS count', room, owner, show_written_off, text)
+        c = self._reader().cursor()
+        c.execute(query, params)
+        return c.fetchone()['count']
+
+    def iter_equipment(self, room=None, owner=None, show_written_off=False, text=None, order_by_room=False,
+                       chunk_size=PAGE_SIZE):
+        # Віддає рядки частинами з одного курсора, не збираючи всю вибірку в пам'яті
+        query, params = self._equipment_query('*', room, owner, show_written_off, text)
+        query += 'ORDER BY room, id' if order_by_room else 'ORDER BY id'
+        c = self._reader().cursor()
+        c.execute(query, params)
+        while True:
+            rows = c.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+
+    def filter_equipment(self, room=None, owner=None, show_written_off=False):
+        c = self._reader().cursor()
+        query, params = self._equipment_query('*', room, owner, show_written_off)
         c.execute(query, params)
         return c.fetchall()
 
     def get_all_equipment(self, show_written_off=False):
-        c = self.conn.cursor()
+        c = self._reader().cursor()
         if show_written_off:
-            c.execute('SELECT * FROM equipment WHERE written_off=1')
+            c.execute('SELECT * FROM equipment_v WHERE written_off=1')
         else:
-            c.execute('SELECT * FROM equipment WHERE written_off=0')
+            c.execute('SELECT * FROM equipment_v WHERE written_off=0')
+        return c.fetchall()
+
+    def page_equipment(self, room=None, owner=None, show_written_off=False, sort_by='id', descending=False,
+                       after=None, limit=PAGE_SIZE):
+        if sort_by not in SORTABLE_COLUMNS:
+            raise ValueError(f"Unsupported sort column: {sort_by}")
+        where = 'written_off=? '
+        params = [1 if show_written_off else 0]
+        if room and room != '---':
+            where += f'AND room_id={ROOM_ID} '
+            params.append(room)
+        if owner and owner != '---':
+            where += f'AND owner_id={OWNER_ID} '
+            params.append(owner)
+        if sort_by in REFERENCE_COLUMNS:
+            filtered = len(params) > 1
+            return self._page_by_reference(sort_by, where, params, filtered, descending, after, limit)
+        query = 'SELECT * FROM equipment_v WHERE ' + where
+        # Пагінація за ключем: продовжуємо після (значення сортування, id) останнього рядка попередньої сторінки
+        if after is not None:
+            last_value, last_id = after
+            op = '<' if descending else '>'
+            if sort_by == 'id':
+                query += f'AND id {op} ? '
+                params.append(last_id)
+            elif last_value is None:
+                # NULL сортується першим, тому після нього йдуть і решта NULL, і всі непорожні значення
+                if descending:
+                    query += f'AND {sort_by} IS NULL AND id < ? '
+                else:
+                    query += f'AND ({sort_by} IS NOT NULL OR id > ?) '
+                params.append(last_id)
+            else:
+                query += f'AND (({sort_by}, id) {op} (?, ?)'
+                query += f' OR {sort_by} IS NULL) ' if descending else ') '
+                params.extend([last_value, last_id])
+        direction = 'DESC' if descending else 'ASC'
+        query += f'ORDER BY {sort_by} {direction}, id {direction} LIMIT ?'
+        params.append(limit)
+        c = self._reader().cursor()
+        c.execute(query, params)
+        return c.fetchall()
+
+    def _page_by_reference(self, sort_by, where, params, filtered, descending, after, limit):
+        # ORDER BY назви з представлення потребує тимчасового B-дерева по всій таблиці, тому назви перебираються
+        # за унікальним індексом довідника, а записи кожної назви — за індексом (written_off, *_id) у порядку id
+        kind, key = REFERENCE_COLUMNS[sort_by]
+        last_value, last_id = after if after is not None else (None, None)
+        direction = 'DESC' if descending else 'ASC'
+        op = '<' if descending else '>'
+        conn = self._reader()
+        # З фільтром за кабінетом чи власником більшість назв не має записів, тож перебираються лише наявні
+        present = (f"SELECT {key} FROM equipment WHERE {where}", params) if filtered else None
+        query = 'SELECT * FROM equipment_v WHERE ' + where
+        rows = []
+        groups = self._reference_groups(conn, kind, present, descending, after is not None, last_value or '')
+        for group_id, name in groups:
+            group_query = query + (f'AND {key} IS NULL ' if group_id is None else f'AND {key}=? ')
+            group_params = params + ([] if group_id is None else [group_id])
+            if after is not None and name == (last_value or ''):
+                group_query += f'AND id {op} ? '
+                group_params.append(last_id)
+            c = conn.execute(group_query + f'ORDER BY id {direction} LIMIT ?', group_params + [limit - len(rows)])
+            rows.extend(c.fetchall())
+            if len(rows) >= limit:
+                break
+        return rows
+
+    def _reference_groups(self, conn, kind, present, descending, resume, last_value):
+        # Записи без значення мають у представленні порожню назву і йдуть перед усіма назвами
+        table, column = REFERENCE_TABLES[kind]
+        if not descending and (not resume or not last_value):
+            yield None, ''
+        if descending and resume and not last_value:
+            yield None, ''
+            return
+        query = f"SELECT id, {column} FROM {table} WHERE 1 "
+        params = []
+        if present:
+            query += f"AND id IN ({present[0]}) "
+            params.extend(present[1])
+        if resume and last_value:
+            query += f"AND {column} {'<=' if descending else '>='} ? "
+            params.append(last_value)
+        yield from conn.execute(query + f"ORDER BY {column} {'DESC' if descending else 'ASC'}", params)
+        if descending:
+            yield None, ''
+
+    def get_equipment_ids(self, show_written_off=False):
+        c = self._reader().cursor()
+        c.execute('SELECT id FROM equipment WHERE written_off=? ORDER BY id', (1 if show_written_off else 0,))
+        return [row['id'] for row in c.fetchall()]
+
+    def get_equipment_by_ids(self, ids):
+        if not ids:
+            return []
+        c = self._reader().cursor()
+        c.execute(f"SELECT * FROM equipment_v WHERE id IN ({', '.join('?' * len(ids))})", list(ids))
         return c.fetchall()
 
+    def get_ids_by_inventory_numbers(self, inventory_numbers):
+        if not inventory_numbers:
+            return {}
+        c = self._reader().cursor()
+        c.execute('''
+        SELECT inventory_number, id FROM equipment
+        WHERE inventory_number IN (SELECT value FROM json_each(?))
+        ''', (json.dumps([str(number) for number in inventory_numbers]),))
+        return {row['inventory_number']: row['id'] for row in c.fetchall()}
+
     def write_off_equipment(self, equip_id):
-        c = self.conn.cursor()
-        c.execute('UPDATE equipment SET written_off=1 WHERE id=?', (equip_id,))
-        self.conn.commit()
-        logging.debug(f"Equipment written off: ID {equip_id}")
+        with self.transaction():
+            c = self.conn.cursor()
+            c.execute('UPDATE equipment SET written_off=1, updated_at=CURRENT_TIMESTAMP, version=version+1 WHERE id=?',
+                      (equip_id,))
+            self._mark_changed('equipment')
+            logging.debug("Equipment written off: ID %s", equip_id)
+
+    @staticmethod
+    def _id_list(ids):
+        # Список ID передається одним параметром і розгортається через json_each
+        return json.dumps([int(i) for i in ids])
+
+    def write_off_many(self, ids):
+        if not ids:
+            return 0
+        with self.transaction():
+            c = self.conn.cursor()
+            c.execute('''
+            UPDATE equipment SET written_off=1, updated_at=CURRENT_TIMESTAMP, version=version+1
+            WHERE id IN (SELECT value FROM json_each(?)) AND written_off=0
+            ''', (self._id_list(ids),))
+            if c.rowcount:
+                self._mark_changed('equipment')
+            logging.debug("Equipment written off: %s of %s rows", c.rowcount, len(ids))
+            return c.rowcount
+
+    def move_many(self, ids, room):
+        if not ids:
+            return 0
+        with self.transaction():
+            c = self.conn.cursor()
+            id_list = self._id_list(ids)
+            max_seats, active_count = self.get_room_occupancy(room)
+            if max_seats > 0:
+                c.execute(f'''
+                SELECT COUNT(*) AS incoming FROM equipment
+                WHERE id IN (SELECT value FROM json_each(?)) AND written_off=0 AND room_id IS NOT {ROOM_ID}
+                ''', (id_list, room))
+                if active_count + c.fetchone()['incoming'] > max_seats:
+                    raise ValueError(f"Кабінет {room} перевищує максимальну кількість місць")
+            self.ensure_room(room)
+            c.execute(f'''
+            UPDATE equipment SET room_id={ROOM_ID}, updated_at=CURRENT_TIMESTAMP, version=version+1
+            WHERE id IN (SELECT value FROM json_each(?)) AND room_id IS NOT {ROOM_ID}
+            ''', (room, id_list, room))
+            if c.rowcount:
+                self._mark_changed('equipment')
+            logging.debug("Equipment moved to room %s: %s of %s rows", room, c.rowcount, len(ids))
+            return c.rowcount
+
+    def move_to_stock_many(self, ids):
+        return self.move_many(ids, STOCK_ROOM)
+
+    def set_owner_many(self, ids, owner):
+        if not ids:
+            return 0
+        with self.transaction():
+            c = self.conn.cursor()
+            self.ensure_owner(owner)
+            c.execute(f'''
+            UPDATE equipment SET owner_id={OWNER_ID}, updated_at=CURRENT_TIMESTAMP, version=version+1
+            WHERE id IN (SELECT value FROM json_each(?)) AND owner_id IS NOT {OWNER_ID}
+            ''', (owner, self._id_list(ids), owner))
+            if c.rowcount:
+                self._mark_changed('equipment')
+            logging.debug("Equipment reassigned to %s: %s of %s rows", owner, c.rowcount, len(ids))
+            return c.rowcount
 
-    def import_from_excel(self, filepath):
+    def import_from_excel(self, filepath, bulk=False):
+        if bulk:
+            return self.bulk_import_from_excel(filepath)
+        import pandas as pd
+        with self.transaction():
+            xls = pd.ExcelFile(filepath)
+            c = self.conn.cursor()
+            type_map = self._import_type_map()
+            imported = 0
+            for sheet in xls.sheet_names:
+                df = pd.read_excel(xls, sheet_name=sheet)
+                df.columns = [col.strip() for col in df.columns]
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    logging.debug("Excel columns: %s", list(df.columns))
+                for _, row in df.iterrows():
+                    try:
+                        inv_num = str(row.get('Інвентарний номер') or '').strip()
+                        raw_type = str(row.get('Тип обладнання') or '?').strip().lower()
+                        logging.debug("Raw type from Excel for inv_num %s: %s", inv_num, raw_type)
+                        equip_type = type_map.get(raw_type) or "Невідомо"
+                        name = str(row.get('Назва обладнання') or row.get('Назва') or '').strip()
+                        model = str(row.get('Модель') or '').strip()
+                        serial = str(row.get('Серійний номер') or row.get('Серійний №') or '').strip()
+                        room = str(row.get('Кабінет') or '').strip()
+                        owner = str(row.get('Власник') or '').strip()
+                        if not inv_num:
+                            continue
+                        if room and not self.check_room_capacity(room):
+                            raise ValueError(f"Кабінет {room} перевищує максимальну кількість місць")
+                        self.ensure_type(equip_type)
+                        self.ensure_room(room)
+                        self.ensure_owner(owner)
+                        c.execute('SELECT id FROM equipment WHERE inventory_number=?', (inv_num,))
+                        exist = c.fetchone()
+                        if exist:
+                            c.execute(f'''
+                            UPDATE equipment SET type_id={TYPE_ID}, name=?, model=?, serial_number=?, room_id={ROOM_ID},
+                                owner_id={OWNER_ID}, updated_at=CURRENT_TIMESTAMP, version=version+1
+                            WHERE inventory_number=?
+                            ''', (equip_type, name, model, serial, room, owner, inv_num))
+                        else:
+                            c.execute(f'''
+                            INSERT INTO equipment (inventory_number, type_id, name, model, serial_number, room_id, owner_id,
+                                                   written_off, updated_at)
+                            VALUES (?, {TYPE_ID}, ?, ?, ?, {ROOM_ID}, {OWNER_ID}, 0, CURRENT_TIMESTAMP)
+                            ''', (inv_num, equip_type, name, model, serial, room, owner))
+                        imported += 1
+                        logging.debug("Imported equipment: %s with type: %s", inv_num, equip_type)
+                    except ValueError as e:
+                        logging.error(f"ValueError in import_from_excel: {e}")
+                    except Exception as e:
+                        logging.error(f"Error in import_from_excel: {e}")
+                self._mark_changed('equipment', 'rooms', 'owners', 'types')
+            logging.debug(f"Imported {imported} records from Excel")
+            return imported
+
+    def bulk_import_from_excel(self, filepath):
+        import pandas as pd
+        start = time.perf_counter()
         xls = pd.ExcelFile(filepath)
-        c = self.conn.cursor()
+        synonyms = self._import_type_map()
         imported = 0
         for sheet in xls.sheet_names:
-            df = pd.read_excel(xls, sheet_name=sheet)
-            df.columns = [col.strip() for col in df.columns]
-            logging.debug(f"Excel columns: {list(df.columns)}")
-            for _, row in df.iterrows():
-                try:
-                    inv_num = str(row.get('Інвентарний номер') or '').strip()
-                    raw_type = str(row.get('Тип обладнання') or '?').strip().lower()
-                    logging.debug(f"Raw type from Excel for inv_num {inv_num}: {raw_type}")
-                    equip_type = self.get_main_type(raw_type) or "Невідомо"
-                    name = str(row.get('Назва обладнання') or row.get('Назва') or '').strip()
-                    model = str(row.get('Модель') or '').strip()
-                    serial = str(row.get('Серійний номер') or row.get('Серійний №') or '').strip()
-                    room = str(row.get('Кабінет') or '').strip()
-                    owner = str(row.get('Власник') or '').strip()
-                    if not inv_num:
-                        continue
-                    if room and not self.check_room_capacity(room):
-                        raise ValueError(f"Кабінет {room} перевищує максимальну кількість місць")
-                    self.ensure_type(equip_type)
-                    self.ensure_room(room)
-                    self.ensure_owner(owner)
-                    c.execute('SELECT id FROM equipment WHERE inventory_number=?', (inv_num,))
-                    exist = c.fetchone()
-                    if exist:
-                        c.execute('''
-                        UPDATE equipment SET type=?, name=?, model?, serial_number=?, room=?, owner=?
-                        WHERE inventory_number=?
-                        ''', (equip_type, name, model, serial, room, owner, inv_num))
-                    else:
-                        c.execute('''
-                        INSERT INTO equipment (inventory_number, type, name, model, serial_number, room, owner, written_off)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, 0)
-                        ''', (inv_num, equip_type, name, model, serial, room, owner))
-                    imported += 1
-                    logging.debug(f"Imported equipment: {inv_num} with type: {equip_type}")
-                except ValueError as e:
-                    logging.error(f"ValueError in import_from_excel: {e}")
-                except Exception as e:
-                    logging.error(f"Error in import_from_excel: {e}")
-            self.conn.commit()
-        self.unify_types_in_db()
-        logging.debug(f"Imported {imported} records from Excel")
+            df = pd.read_excel(xls, sheet_name=sheet, dtype=str)
+            imported += self._bulk_upsert_frame(df, synonyms)
+        elapsed = time.perf_counter() - start
+        self.last_import_stats = {
+            'rows': imported,
+            'seconds': elapsed,
+            'rows_per_second': imported / elapsed if elapsed > 0 else 0.0
+        }
+        logging.info(f"Bulk imported {imported} records in {elapsed:.2f}s "
+                     f"({self.last_import_stats['rows_per_second']:.0f} rows/s)")
+        return imported
+
+    def stream_import(self, filepath, chunk_size=IMPORT_CHUNK_SIZE, progress=None):
+        start = time.perf_counter()
+        synonyms = self._import_type_map()
+        imported = 0
+        processed = 0
+        for sheet, chunk, total in iter_import_chunks(filepath, chunk_size):
+            imported += self._bulk_upsert_frame(chunk, synonyms)
+            processed += len(chunk)
+            logging.debug("Imported chunk from sheet %s: %s rows processed", sheet, processed)
+            if progress:
+                progress(processed, total)
+        elapsed = time.perf_counter() - start
+        self.last_import_stats = {
+            'rows': imported,
+            'seconds': elapsed,
+            'rows_per_second': imported / elapsed if elapsed > 0 else 0.0
+        }
+        logging.info(f"Stream imported {imported} records in {elapsed:.2f}s "
+                     f"({self.last_import_stats['rows_per_second']:.0f} rows/s)")
         return imported
 
-    def unify_types_in_db(self):
+    @staticmethod
+    def _frame_column(df, *names):
+        import pandas as pd
+        result = pd.Series('', index=df.index, dtype=object)
+        for name in reversed(names):
+            if name in df.columns:
+                values = df[name].fillna('').astype(str).str.strip()
+                result = values.where(values != '', result)
+        return result
+
+    def _normalise_import_frame(self, df, synonyms):
+        import pandas as pd
+        df = df.rename(columns=lambda col: str(col).strip())
+        raw_type = self._frame_column(df, 'Тип обладнання').str.lower()
+        frame = pd.DataFrame({
+            'inventory_number': self._frame_column(df, 'Інвентарний номер'),
+            'type': raw_type.where(raw_type != '', '?').map(synonyms).fillna("Невідомо"),
+            'name': self._frame_column(df, 'Назва обладнання', 'Назва'),
+            'model': self._frame_column(df, 'Модель'),
+            'serial_number': self._frame_column(df, 'Серійний номер', 'Серійний №'),
+            'room': self._frame_column(df, 'Кабінет'),
+            'owner': self._frame_column(df, 'Власник')
+        })
+        return frame[frame['inventory_number'] != '']
+
+    def _filter_by_room_capacity(self, frame):
+        remaining = self.get_remaining_capacity(frame['room'].unique())
+        limited = frame['room'].isin(remaining.keys())
+        if not limited.any():
+            return frame
+        batch = frame[limited]
         c = self.conn.cursor()
-        c.execute("SELECT synonym, main_type FROM type_synonyms")
-        for row in c.fetchall():
-            c.execute('UPDATE equipment SET type=? WHERE LOWER(type)=?', (row['main_type'], row['synonym'].lower()))
-        self.conn.commit()
-        logging.debug("Types unified in database")
+        c.execute('''
+        SELECT e.inventory_number, r.room_name FROM equipment e JOIN rooms r ON r.id = e.room_id
+        WHERE e.written_off=0 AND e.inventory_number IN (SELECT value FROM json_each(?))
+        ''', (json.dumps(batch['inventory_number'].tolist()),))
+        placed = {row['inventory_number']: row['room_name'] for row in c.fetchall()}
+        # Записи, які вже стоять у цьому кабінеті, місць не займають
+        takes_seat = batch['inventory_number'].map(placed) != batch['room']
+        seats_taken = takes_seat.astype(int).groupby(batch['room']).cumsum()
+        rejected = takes_seat & (seats_taken > batch['room'].map(remaining))
+        if not rejected.any():
+            return frame
+        for room, count in batch[rejected].groupby('room', sort=False).size().items():
+            logging.error(f"ValueError in bulk import: Кабінет {room} перевищує максимальну кількість місць "
+                          f"({count} records skipped)")
+        return frame.drop(index=rejected[rejected].index)
+
+    def _register_references(self, c, kind, names):
+        table, column = REFERENCE_TABLES[kind]
+        known = self._reference_set(kind)
+        missing = sorted(set(names) - known - {''})
+        if missing:
+            c.executemany(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", [(name,) for name in missing])
+            known.update(missing)
+
+    def _bulk_upsert_frame(self, df, synonyms):
+        frame = self._normalise_import_frame(df, synonyms)
+        with self.transaction():
+            frame = self._filter_by_room_capacity(frame)
+            if frame.empty:
+                return 0
+            c = self.conn.cursor()
+            try:
+                self._register_references(c, 'types', frame['type'].unique())
+                self._register_references(c, 'rooms', frame['room'].unique())
+                self._register_references(c, 'owners', frame['owner'].unique())
+                c.executemany(f'''
+                INSERT INTO equipment (inventory_number, type_id, name, model, serial_number, room_id, owner_id, written_off,
+                                       updated_at)
+                VALUES (?, {TYPE_ID}, ?, ?, ?, {ROOM_ID}, {OWNER_ID}, 0, CURRENT_TIMESTAMP)
+                ON CONFLICT(inventory_number) DO UPDATE SET
+                    type_id=excluded.type_id, name=excluded.name, model=excluded.model,
+                    serial_number=excluded.serial_number, room_id=excluded.room_id, owner_id=excluded.owner_id,
+                    updated_at=excluded.updated_at, version=version+1
+                ''', frame.itertuples(index=False, name=None))
+                self._mark_changed('equipment', 'rooms', 'owners', 'types')
+            except Exception as e:
+                logging.error(f"Error in bulk import: {e}")
+                raise
+            return len(frame)
+
+    def current_timestamp(self):
+        c = self._reader().cursor()
+        c.execute("SELECT CURRENT_TIMESTAMP")
+        return c.fetchone()[0]
+
+    def unify_types_in_db(self, since=None, synonyms=None):
+        # Тип нормалізується під час запису, тож тут лише дочищаються рядки, записані до появи синоніма.
+        # Довідник типів малий: спершу визначаємо, який тип у який переходить, потім оновлюємо за type_id
+        with self.transaction():
+            if synonyms is not None and not synonyms:
+                return 0
+            query = '''
+            SELECT cur.id AS old_id,
+                   (SELECT mt.id FROM type_synonyms s JOIN equipment_types mt ON mt.type_name = s.main_type
+                    WHERE LOWER(s.synonym) = LOWER(cur.type_name) ORDER BY s.id LIMIT 1) AS new_id
+            FROM equipment_types cur
+            WHERE LOWER(cur.type_name) IN (SELECT LOWER(synonym) FROM type_synonyms)
+              AND cur.type_name NOT IN (SELECT s.main_type FROM type_synonyms s
+                                        WHERE LOWER(s.synonym) = LOWER(cur.type_name))
+            '''
+            params = []
+            if synonyms is not None:
+                query += f"AND LOWER(cur.type_name) IN ({', '.join(['LOWER(?)'] * len(synonyms))}) "
+                params.extend(synonyms)
+            c = self.conn.cursor()
+            c.execute(query, params)
+            mapping = [(row['new_id'], row['old_id']) for row in c.fetchall() if row['new_id'] is not None]
+            update = "UPDATE equipment SET type_id=?, updated_at=CURRENT_TIMESTAMP, version=version+1 WHERE type_id=? "
+            if since is not None:
+                update += "AND updated_at >= ? "
+                mapping = [pair + (since,) for pair in mapping]
+            updated = 0
+            if mapping:
+                c.executemany(update, mapping)
+                updated = c.rowcount
+            if updated:
+                self._mark_changed('equipment')
+            logging.debug("Types unified in database: %s rows", updated)
+            return updated
 
     def add_type(self, type_name):
-        c = self.conn.cursor()
-        try:
-            c.execute("INSERT INTO equipment_types (type_name) VALUES (?)", (type_name,))
-            self.conn.commit()
-            logging.debug(f"Type added: {type_name}")
-            return True
-        except sqlite3.IntegrityError:
-            logging.error(f"Type already exists: {type_name}")
-            return False
+        with self.transaction():
+            c = self.conn.cursor()
+            try:
+                c.execute("INSERT INTO equipment_types (type_name) VALUES (?)", (type_name,))
+                self._mark_changed('types')
+                self._cache_add('types', type_name)
+                logging.debug("Type added: %s", type_name)
+                return True
+            except sqlite3.IntegrityError:
+                self._cache_add('types', type_name)
+                logging.error(f"Type already exists: {type_name}")
+                return False
 
     def get_all_types(self):
         try:
-            c = self.conn.cursor()
+            c = self._reader().cursor()
             c.execute("SELECT type_name FROM equipment_types ORDER BY type_name")
             types = [row['type_name'] for row in c.fetchall()]
             return types
@@ -285,35 +957,44 @@ class Database:
             return []
 
     def update_type(self, old_name, new_name):
-        c = self.conn.cursor()
-        c.execute("UPDATE equipment SET type=? WHERE type=?", (new_name, old_name))
-        c.execute("UPDATE equipment_types SET type_name=? WHERE type_name=?", (new_name, old_name))
-        c.execute("UPDATE type_synonyms SET main_type=? WHERE main_type=?", (new_name, old_name))
-        self.conn.commit()
-        logging.debug(f"Type updated: {old_name} -> {new_name}")
+        with self.transaction():
+            c = self.conn.cursor()
+            if not self._merge_reference(c, 'types', old_name, new_name):
+                c.execute("UPDATE equipment_types SET type_name=? WHERE type_name=?", (new_name, old_name))
+            c.execute("UPDATE type_synonyms SET main_type=? WHERE main_type=?", (new_name, old_name))
+            self._mark_changed('types', 'equipment')
+            self._invalidate_cache('types')
+            logging.debug(f"Type updated: {old_name} -> {new_name}")
 
     def delete_type(self, type_name):
-        c = self.conn.cursor()
-        c.execute("UPDATE equipment SET type='?' WHERE type=?", (type_name,))
-        c.execute("DELETE FROM equipment_types WHERE type_name=?", (type_name,))
-        c.execute("DELETE FROM type_synonyms WHERE main_type=?", (type_name,))
-        self.conn.commit()
-        logging.debug(f"Type deleted: {type_name}")
+        with self.transaction():
+            c = self.conn.cursor()
+            self.ensure_type('?')
+            c.execute(f"UPDATE equipment SET type_id={TYPE_ID}, updated_at=CURRENT_TIMESTAMP, version=version+1 "
+                      f"WHERE type_id={TYPE_ID}", ('?', type_name))
+            c.execute("DELETE FROM equipment_types WHERE type_name=?", (type_name,))
+            c.execute("DELETE FROM type_synonyms WHERE main_type=?", (type_name,))
+            self._mark_changed('types', 'equipment')
+            self._invalidate_cache('types')
+            logging.debug(f"Type deleted: {type_name}")
 
     def add_room(self, room_name, max_seats=0):
-        c = self.conn.cursor()
-        try:
-            c.execute("INSERT INTO rooms (room_name, max_seats) VALUES (?, ?)", (room_name, max_seats))
-            self.conn.commit()
-            logging.debug(f"Room added: {room_name}")
-            return True
-        except sqlite3.IntegrityError:
-            logging.error(f"Room already exists: {room_name}")
-            return False
+        with self.transaction():
+            c = self.conn.cursor()
+            try:
+                c.execute("INSERT INTO rooms (room_name, max_seats) VALUES (?, ?)", (room_name, max_seats))
+                self._mark_changed('rooms')
+                self._cache_add('rooms', room_name)
+                logging.debug("Room added: %s", room_name)
+                return True
+            except sqlite3.IntegrityError:
+                self._cache_add('rooms', room_name)
+                logging.error(f"Room already exists: {room_name}")
+                return False
 
     def get_all_rooms(self):
         try:
-            c = self.conn.cursor()
+            c = self._reader().cursor()
             c.execute("SELECT room_name FROM rooms ORDER BY room_name")
             rooms = [row['room_name'] for row in c.fetchall()]
             return rooms
@@ -322,43 +1003,61 @@ class Database:
             return []
 
     def update_room(self, old_name, new_name, max_seats=None):
-        c = self.conn.cursor()
-        c.execute("UPDATE equipment SET room=? WHERE room=?", (new_name, old_name))
-        query = "UPDATE rooms SET room_name=?"
-        params = [new_name]
-        if max_seats is not None:
-            query += ", max_seats=?"
-            params.append(max_seats)
-        query += " WHERE room_name=?"
-        params.append(old_name)
-        c.execute(query, params)
-        self.conn.commit()
-        logging.debug(f"Room updated: {old_name} -> {new_name}")
+        with self.transaction():
+            c = self.conn.cursor()
+            # Злиття з наявним кабінетом переносить до нього всі записи: як і move_many, воно не може перевищити
+            # кількість місць, з якою кабінет залишиться після оновлення
+            c.execute("SELECT room_name, max_seats, active_count FROM rooms WHERE room_name IN (?, ?)",
+                      (old_name, new_name))
+            rooms = {row['room_name']: row for row in c.fetchall()}
+            if old_name != new_name and old_name in rooms and new_name in rooms:
+                limit = rooms[new_name]['max_seats'] if max_seats is None else max_seats
+                if limit > 0 and rooms[new_name]['active_count'] + rooms[old_name]['active_count'] > limit:
+                    raise ValueError(f"Кабінет {new_name} перевищує максимальну кількість місць")
+            merged = self._merge_reference(c, 'rooms', old_name, new_name)
+            query = "UPDATE rooms SET room_name=?"
+            params = [new_name]
+            if max_seats is not None:
+                query += ", max_seats=?"
+                params.append(max_seats)
+            query += " WHERE room_name=?"
+            params.append(new_name if merged else old_name)
+            c.execute(query, params)
+            self._mark_changed('rooms', 'equipment')
+            self._invalidate_cache('rooms')
+            logging.debug(f"Room updated: {old_name} -> {new_name}")
 
     def delete_room(self, room_name):
-        c = self.conn.cursor()
-        c.execute("UPDATE equipment SET room='' WHERE room=?", (room_name,))
-        c.execute("DELETE FROM rooms WHERE room_name=?", (room_name,))
-        self.conn.commit()
-        logging.debug(f"Room deleted: {room_name}")
+        with self.transaction():
+            c = self.conn.cursor()
+            # Спершу відв'язуємо записи: тригер повнотекстового індексу ще має бачити назву кабінету
+            c.execute(f"UPDATE equipment SET room_id=NULL, updated_at=CURRENT_TIMESTAMP, version=version+1 "
+                      f"WHERE room_id={ROOM_ID}", (room_name,))
+            c.execute("DELETE FROM rooms WHERE room_name=?", (room_name,))
+            self._mark_changed('rooms', 'equipment')
+            self._invalidate_cache('rooms')
+            logging.debug(f"Room deleted: {room_name}")
 
     def add_owner(self, full_name, position='', pc_ip='', pc_name='', phone='', email=''):
-        c = self.conn.cursor()
-        try:
-            c.execute('''
-            INSERT INTO owners (full_name, position, pc_ip, pc_name, phone, email)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ''', (full_name, position, pc_ip, pc_name, phone, email))
-            self.conn.commit()
-            logging.debug(f"Owner added: {full_name}")
-            return True
-        except sqlite3.IntegrityError:
-            logging.error(f"Owner already exists: {full_name}")
-            return False
+        with self.transaction():
+            c = self.conn.cursor()
+            try:
+                c.execute('''
+                INSERT INTO owners (full_name, position, pc_ip, pc_name, phone, email)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ''', (full_name, position, pc_ip, pc_name, phone, email))
+                self._mark_changed('owners')
+                self._cache_add('owners', full_name)
+                logging.debug("Owner added: %s", full_name)
+                return True
+            except sqlite3.IntegrityError:
+                self._cache_add('owners', full_name)
+                logging.error(f"Owner already exists: {full_name}")
+                return False
 
     def get_all_owners(self):
         try:
-            c = self.conn.cursor()
+            c = self._reader().cursor()
             c.execute("SELECT full_name FROM owners ORDER BY full_name")
             owners = [row['full_name'] for row in c.fetchall()]
             return owners
@@ -367,132 +1066,190 @@ class Database:
             return []
 
     def update_owner(self, old_full_name, new_full_name, position=None, pc_ip=None, pc_name=None, phone=None, email=None):
-        c = self.conn.cursor()
-        c.execute("UPDATE equipment SET owner=? WHERE owner=?", (new_full_name, old_full_name))
-        query = "UPDATE owners SET full_name=?"
-        params = [new_full_name]
-        if position is not None:
-            query += ", position=?"
-            params.append(position)
-        if pc_ip is not None:
-            query += ", pc_ip=?"
-            params.append(pc_ip)
-        if pc_name is not None:
-            query += ", pc_name=?"
-            params.append(pc_name)
-        if phone is not None:
-            query += ", phone=?"
-            params.append(phone)
-        if email is not None:
-            query += ", email=?"
-            params.append(email)
-        query += " WHERE full_name=?"
-        params.append(old_full_name)
-        c.execute(query, params)
-        self.conn.commit()
-        logging.debug(f"Owner updated: {old_full_name} -> {new_full_name}")
+        with self.transaction():
+            c = self.conn.cursor()
+            merged = self._merge_reference(c, 'owners', old_full_name, new_full_name)
+            query = "UPDATE owners SET full_name=?"
+            params = [new_full_name]
+            if position is not None:
+                query += ", position=?"
+                params.append(position)
+            if pc_ip is not None:
+                query += ", pc_ip=?"
+                params.append(pc_ip)
+            if pc_name is not None:
+                query += ", pc_name=?"
+                params.append(pc_name)
+            if phone is not None:
+                query += ", phone=?"
+                params.append(phone)
+            if email is not None:
+                query += ", email=?"
+                params.append(email)
+            query += " WHERE full_name=?"
+            params.append(new_full_name if merged else old_full_name)
+            c.execute(query, params)
+            self._mark_changed('owners', 'equipment')
+            self._invalidate_cache('owners')
+            logging.debug(f"Owner updated: {old_full_name} -> {new_full_name}")
 
     def delete_owner(self, full_name):
-        c = self.conn.cursor()
-        c.execute("UPDATE equipment SET owner='' WHERE owner=?", (full_name,))
-        c.execute("DELETE FROM owners WHERE full_name=?", (full_name,))
-        self.conn.commit()
-        logging.debug(f"Owner deleted: {full_name}")
+        with self.transaction():
+            c = self.conn.cursor()
+            c.execute(f"UPDATE equipment SET owner_id=NULL, updated_at=CURRENT_TIMESTAMP, version=version+1 "
+                      f"WHERE owner_id={OWNER_ID}", (full_name,))
+            c.execute("DELETE FROM owners WHERE full_name=?", (full_name,))
+            self._mark_changed('owners', 'equipment')
+            self._invalidate_cache('owners')
+            logging.debug(f"Owner deleted: {full_name}")
 
     def get_owner_details(self, full_name):
-        c = self.conn.cursor()
+        c = self._reader().cursor()
         c.execute("SELECT * FROM owners WHERE full_name=?", (full_name,))
         return c.fetchone()
 
+    def _merge_reference(self, c, kind, old_name, new_name):
+        # Перейменування змінює лише рядок довідника; якщо нова назва вже існує, записи переносяться до неї
+        table, column = REFERENCE_TABLES[kind]
+        key = {'types': 'type_id', 'rooms': 'room_id', 'owners': 'owner_id'}[kind]
+        if old_name == new_name:
+            return False
+        c.execute(f"SELECT id FROM {table} WHERE {column}=?", (new_name,))
+        target = c.fetchone()
+        if target is None:
+            return False
+        c.execute(f"UPDATE equipment SET {key}=?, updated_at=CURRENT_TIMESTAMP, version=version+1 "
+                  f"WHERE {key}=(SELECT id FROM {table} WHERE {column}=?)", (target['id'], old_name))
+        c.execute(f"DELETE FROM {table} WHERE {column}=?", (old_name,))
+        return True
+
+    def _reference_set(self, kind):
+        # PRAGMA data_version writer-а змінюється лише після фіксацій інших з'єднань: тоді довідники могли
+        # змінитися (кабінет видалено чи перейменовано), і кеш перечитується, інакше підзапит дасть NULL
+        with self.pool.write_lock:
+            version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._reference_version:
+            self._reference_cache.clear()
+            self._reference_version = version
+        names = self._reference_cache.get(kind)
+        if names is None:
+            loaders = {'types': self.get_all_types, 'rooms': self.get_all_rooms, 'owners': self.get_all_owners}
+            names = set(loaders[kind]())
+            self._reference_cache[kind] = names
+        return names
+
+    def _cache_add(self, kind, name):
+        names = self._reference_cache.get(kind)
+        if names is not None:
+            names.add(name)
+
+    def _invalidate_cache(self, kind):
+        self._reference_cache.pop(kind, None)
+
     def ensure_type(self, type_name):
-        if type_name and type_name not in self.get_all_types():
+        if type_name and type_name not in self._reference_set('types'):
             self.add_type(type_name)
 
     def ensure_room(self, room_name):
-        if room_name and room_name not in self.get_all_rooms():
+        if room_name and room_name not in self._reference_set('rooms'):
             self.add_room(room_name)
 
     def ensure_owner(self, full_name):
-        if full_name and full_name not in self.get_all_owners():
+        if full_name and full_name not in self._reference_set('owners'):
             self.add_owner(full_name)
 
-    def populate_rooms_and_owners_from_equipment(self):
-        c = self.conn.cursor()
-        c.execute("SELECT DISTINCT room FROM equipment WHERE room != '' AND room IS NOT NULL")
-        rooms = [row['room'] for row in c.fetchall()]
-        for room in rooms:
-            self.ensure_room(room)
-        c.execute("SELECT DISTINCT owner FROM equipment WHERE owner != '' AND owner IS NOT NULL")
-        owners = [row['owner'] for row in c.fetchall()]
-        for owner in owners:
-            self.ensure_owner(owner)
-        c.execute("SELECT DISTINCT type FROM equipment WHERE type != '' AND type IS NOT NULL")
-        types = [row['type'] for row in c.fetchall()]
-        for t in types:
-            self.ensure_type(t)
-        self.conn.commit()
-        logging.debug("Populated rooms and owners from equipment")
-
     def get_room_max_seats(self, room_name):
-        c = self.conn.cursor()
+        c = self._reader().cursor()
         c.execute("SELECT max_seats FROM rooms WHERE room_name=?", (room_name,))
         row = c.fetchone()
         return row['max_seats'] if row else 0
 
+    def get_room_occupancy(self, room_name):
+        c = self._reader().cursor()
+        c.execute("SELECT max_seats, active_count FROM rooms WHERE room_name=?", (room_name,))
+        row = c.fetchone()
+        return (row['max_seats'], row['active_count']) if row else (0, 0)
+
     def check_room_capacity(self, room_name):
-        c = self.conn.cursor()
-        c.execute("SELECT COUNT(*) as count FROM equipment WHERE room=? AND written_off=0", (room_name,))
-        current_count = c.fetchone()['count']
-        max_seats = self.get_room_max_seats(room_name)
-        return current_count < max_seats if max_seats > 0 else True
+        max_seats, active_count = self.get_room_occupancy(room_name)
+        return active_count < max_seats if max_seats > 0 else True
+
+    def get_remaining_capacity(self, rooms):
+        # Лише кабінети з обмеженням місць; відсутні у словнику кабінети місткість не обмежують
+        c = self._reader().cursor()
+        c.execute('''
+        SELECT room_name, max_seats - active_count AS remaining FROM rooms
+        WHERE max_seats > 0 AND room_name IN (SELECT value FROM json_each(?))
+        ''', (json.dumps([room for room in rooms if room]),))
+        return {row['room_name']: row['remaining'] for row in c.fetchall()}
+
+    def get_room_utilisation(self):
+        c = self._reader().cursor()
+        c.execute("SELECT room_name, max_seats, active_count FROM rooms ORDER BY room_name")
+        return c.fetchall()
 
     def add_synonym(self, synonym, main_type):
-        c = self.conn.cursor()
-        try:
-            self.ensure_type(main_type)
-            c.execute("INSERT INTO type_synonyms (synonym, main_type) VALUES (?, ?)", (synonym, main_type))
-            self.conn.commit()
-            logging.debug(f"Synonym added: {synonym} -> {main_type}")
-            return True
-        except sqlite3.IntegrityError:
-            logging.error(f"Synonym already exists: {synonym} -> {main_type}")
-            return False
+        with self.transaction():
+            c = self.conn.cursor()
+            try:
+                self.ensure_type(main_type)
+                c.execute("INSERT INTO type_synonyms (synonym, main_type) VALUES (?, ?)", (synonym, main_type))
+                self._mark_changed('synonyms')
+                self.unify_types_in_db(synonyms=[synonym])
+                logging.debug(f"Synonym added: {synonym} -> {main_type}")
+                return True
+            except sqlite3.IntegrityError:
+                logging.error(f"Synonym already exists: {synonym} -> {main_type}")
+                return False
 
     def get_main_type(self, synonym):
-        c = self.conn.cursor()
+        c = self._reader().cursor()
         c.execute("SELECT main_type FROM type_synonyms WHERE synonym=?", (synonym.lower(),))
         row = c.fetchone()
         main_type = row['main_type'] if row else None
-        logging.debug(f"get_main_type: {synonym} -> {main_type}")
+        logging.debug("get_main_type: %s -> %s", synonym, main_type)
         return main_type
 
+    def get_synonym_map(self):
+        c = self._reader().cursor()
+        c.execute("SELECT synonym, main_type FROM type_synonyms")
+        return {row['synonym']: row['main_type'] for row in c.fetchall()}
+
+    def _import_type_map(self):
+        # Назви основних типів розпізнаються як є, щоб експортований файл імпортувався без втрати типів
+        type_map = {name.lower(): name for name in self.get_all_types()}
+        type_map.update(self.get_synonym_map())
+        return type_map
+
     def delete_synonym(self, synonym):
-        c = self.conn.cursor()
-        c.execute("DELETE FROM type_synonyms WHERE synonym=?", (synonym,))
-        self.conn.commit()
-        logging.debug(f"Synonym deleted: {synonym}")
+        with self.transaction():
+            c = self.conn.cursor()
+            c.execute("DELETE FROM type_synonyms WHERE synonym=?", (synonym,))
+            self._mark_changed('synonyms')
+            logging.debug(f"Synonym deleted: {synonym}")
 
     def get_synonyms_for_type(self, main_type):
-        c = self.conn.cursor()
+        c = self._reader().cursor()
         c.execute("SELECT synonym FROM type_synonyms WHERE main_type=?", (main_type,))
         return [row['synonym'] for row in c.fetchall()]
 
     def get_settings(self):
-        c = self.conn.cursor()
+        c = self._reader().cursor()
         c.execute("SELECT appearance_mode, color_theme FROM settings WHERE id=1")
         row = c.fetchone()
         return {'appearance_mode': row['appearance_mode'], 'color_theme': row['color_theme']} if row else {'appearance_mode': 'system', 'color_theme': 'blue'}
 
     def update_settings(self, appearance_mode, color_theme):
-        valid_appearance_modes = ["light", "dark", "system"]
-        valid_color_themes = ["blue", "dark-blue", "green", "red", "purple", "orange", "cyan", "yellow"]
-        if appearance_mode not in valid_appearance_modes:
-            logging.error(f"Invalid appearance_mode: {appearance_mode}")
-            raise ValueError(f"Невалідний режим відображення: {appearance_mode}")
-        if color_theme not in valid_color_themes:
-            logging.error(f"Invalid color_theme: {color_theme}")
-            raise ValueError(f"Невалідна кольорова тема: {color_theme}")
-        c = self.conn.cursor()
-        c.execute("UPDATE settings SET appearance_mode=?, color_theme=? WHERE id=1", (appearance_mode, color_theme))
-        self.conn.commit()
-        logging.debug(f"Settings updated: appearance_mode={appearance_mode}, color_theme={color_theme}")
\ No newline at end of file
+        with self.transaction():
+            valid_appearance_modes = ["light", "dark", "system"]
+            valid_color_themes = ["blue", "dark-blue", "green", "red", "purple", "orange", "cyan", "yellow"]
+            if appearance_mode not in valid_appearance_modes:
+                logging.error(f"Invalid appearance_mode: {appearance_mode}")
+                raise ValueError(f"Невалідний режим відображення: {appearance_mode}")
+            if color_theme not in valid_color_themes:
+                logging.error(f"Invalid color_theme: {color_theme}")
+                raise ValueError(f"Невалідна кольорова тема: {color_theme}")
+            c = self.conn.cursor()
+            c.execute("UPDATE settings SET appearance_mode=?, color_theme=? WHERE id=1", (appearance_mode, color_theme))
+            self._mark_changed('settings')
+            logging.debug(f"Settings updated: appearance_mode={appearance_mode}, color_theme={color_theme}")
\ No newline at end of file
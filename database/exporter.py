@@ -0,0 +1,106 @@
+import csv
+import logging
+import os
+import re
+
+# openpyxl імпортується лише під час експорту в XLSX, як і в імпорті
+
+EXPORT_CHUNK_SIZE = 2000
+# Назви стовпців збігаються з тими, що розпізнає імпорт, тож файл можна імпортувати назад
+EXPORT_COLUMNS = [
+    ('inventory_number', 'Інвентарний номер'),
+    ('type', 'Тип обладнання'),
+    ('name', 'Назва обладнання'),
+    ('model', 'Модель'),
+    ('serial_number', 'Серійний номер'),
+    ('room', 'Кабінет'),
+    ('owner', 'Власник'),
+    ('written_off', 'Статус')
+]
+# Експорт разом зі списаними інакше не відрізняв би їх від записів в експлуатації; імпорт цей стовпець ігнорує
+STATUS_LABELS = {0: "В експлуатації", 1: "Списано"}
+NO_ROOM_SHEET = "Без кабінету"
+SHEET_TITLE_LIMIT = 31
+
+
+def _row_values(row):
+    return [STATUS_LABELS[row[key]] if key == 'written_off' else row[key] if row[key] is not None else ''
+            for key, _ in EXPORT_COLUMNS]
+
+
+def _sheet_title(room, used):
+    # Excel забороняє у назві аркуша символи []:*?/\ і обмежує її 31 символом
+    base = re.sub(r'[\[\]:*?/\\]', '_', room or NO_ROOM_SHEET)[:SHEET_TITLE_LIMIT] or NO_ROOM_SHEET
+    title = base
+    suffix = 1
+    while title.lower() in used:
+        suffix += 1
+        tail = f" ({suffix})"
+        title = base[:SHEET_TITLE_LIMIT - len(tail)] + tail
+    used.add(title.lower())
+    return title
+
+
+def _write_csv(f, chunks, progress):
+    written = 0
+    writer = csv.writer(f)
+    writer.writerow([heading for _, heading in EXPORT_COLUMNS])
+    for rows in chunks:
+        writer.writerows(_row_values(row) for row in rows)
+        written += len(rows)
+        progress(written)
+    return written
+
+
+def _write_xlsx(filepath, chunks, progress, sheet_per_room):
+    from openpyxl import Workbook
+    # Режим write_only пише рядки одразу у файл і не тримає аркуш у пам'яті
+    wb = Workbook(write_only=True)
+    headings = [heading for _, heading in EXPORT_COLUMNS]
+    used_titles = set()
+    ws = None
+    current_room = None
+    written = 0
+    for rows in chunks:
+        for row in rows:
+            if ws is None or (sheet_per_room and row['room'] != current_room):
+                current_room = row['room']
+                ws = wb.create_sheet(_sheet_title(current_room if sheet_per_room else "Обладнання", used_titles))
+                ws.append(headings)
+            ws.append(_row_values(row))
+        written += len(rows)
+        progress(written)
+    if ws is None:
+        wb.create_sheet("Обладнання").append(headings)
+    wb.save(filepath)
+    return written
+
+
+def export_equipment(db, filepath, room=None, owner=None, show_written_off=False, text=None, sheet_per_room=False,
+                     chunk_size=EXPORT_CHUNK_SIZE, progress=None):
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext not in ('.csv', '.xlsx'):
+        raise ValueError(f"Непідтримуваний формат експорту: {ext or filepath}")
+    if sheet_per_room and ext == '.csv':
+        raise ValueError("Окремі аркуші для кабінетів можливі лише для XLSX")
+    total = db.count_equipment(room, owner, show_written_off, text)
+    report = (lambda written: progress(written, total)) if progress else (lambda written: None)
+    chunks = db.iter_equipment(room, owner, show_written_off, text, order_by_room=sheet_per_room,
+                               chunk_size=chunk_size)
+    logging.debug(f"Exporting {total} records to {filepath}")
+    if ext == '.csv':
+        with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
+            written = _write_csv(f, chunks, report)
+    else:
+        written = _write_xlsx(filepath, chunks, report, sheet_per_room)
+    logging.debug(f"Export completed: {written} records to {filepath}")
+    return written
+
+
+def export_csv_stream(db, stream, room=None, owner=None, show_written_off=False, text=None,
+                      chunk_size=EXPORT_CHUNK_SIZE):
+    # Для вже відкритого потоку, наприклад stdout у командному рядку; BOM не додається
+    chunks = db.iter_equipment(room, owner, show_written_off, text, chunk_size=chunk_size)
+    written = _write_csv(stream, chunks, lambda written: None)
+    logging.debug(f"Export completed: {written} records to stream")
+    return written
@@ -0,0 +1,76 @@
+import logging
+import os
+
+# pandas і openpyxl імпортуються лише під час імпорту: це найважчі залежності, і при старті вони не потрібні
+
+IMPORT_CHUNK_SIZE = 5000
+
+
+def _count_csv_rows(filepath):
+    lines = 0
+    last = b'\n'
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            lines += block.count(b'\n')
+            last = block[-1:]
+    if last != b'\n':
+        lines += 1
+    return max(lines - 1, 0)
+
+
+def _iter_csv_chunks(filepath, chunk_size):
+    import pandas as pd
+    total = _count_csv_rows(filepath)
+    sheet = os.path.splitext(os.path.basename(filepath))[0]
+    for chunk in pd.read_csv(filepath, dtype=str, chunksize=chunk_size, encoding='utf-8-sig'):
+        yield sheet, chunk, total
+
+
+def _iter_xlsx_chunks(filepath, chunk_size):
+    import pandas as pd
+    from openpyxl import load_workbook
+    wb = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        total = sum(max((ws.max_row or 1) - 1, 0) for ws in wb.worksheets)
+        for ws in wb.worksheets:
+            rows = ws.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                continue
+            columns = [str(col).strip() if col is not None else '' for col in header]
+            width = len(columns)
+            batch = []
+            for row in rows:
+                row = tuple(row[:width]) + (None,) * (width - len(row))
+                if all(value is None for value in row):
+                    continue
+                batch.append(row)
+                if len(batch) >= chunk_size:
+                    yield ws.title, pd.DataFrame.from_records(batch, columns=columns), total
+                    batch = []
+            if batch:
+                yield ws.title, pd.DataFrame.from_records(batch, columns=columns), total
+    finally:
+        wb.close()
+
+
+def _iter_xls_chunks(filepath, chunk_size):
+    # Старий формат .xls не читається потоково, тому аркуші лише нарізаються на частини
+    import pandas as pd
+    xls = pd.ExcelFile(filepath)
+    for sheet in xls.sheet_names:
+        df = pd.read_excel(xls, sheet_name=sheet, dtype=str)
+        for start in range(0, len(df), chunk_size):
+            yield sheet, df.iloc[start:start + chunk_size], None
+
+
+def iter_import_chunks(filepath, chunk_size=IMPORT_CHUNK_SIZE):
+    ext = os.path.splitext(filepath)[1].lower()
+    if ext == '.csv':
+        reader = _iter_csv_chunks
+    elif ext == '.xls':
+        reader = _iter_xls_chunks
+    else:
+        reader = _iter_xlsx_chunks
+    logging.debug(f"Streaming import from {filepath} in chunks of {chunk_size}")
+    return reader(filepath, chunk_size)
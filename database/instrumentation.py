@@ -0,0 +1,164 @@
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+
+INSTRUMENT_ENV = 'INVENTORY_SQL_STATS'
+SLOW_QUERY_ENV = 'INVENTORY_SLOW_QUERY_MS'
+DEFAULT_SLOW_QUERY_MS = 50.0
+HISTORY_SIZE = 5000
+
+
+def instrumentation_requested():
+    return os.environ.get(INSTRUMENT_ENV, '').lower() in ('1', 'true', 'yes', 'on')
+
+
+class QueryStats:
+    def __init__(self, slow_query_ms=None, history_size=HISTORY_SIZE, call_site_files=None):
+        if slow_query_ms is None:
+            slow_query_ms = float(os.environ.get(SLOW_QUERY_ENV, DEFAULT_SLOW_QUERY_MS))
+        self.slow_query_ms = slow_query_ms
+        # Викликом вважається перший кадр стеку з цих файлів: метод Database чи функція звітів
+        self.call_site_files = set(call_site_files or ())
+        self._lock = threading.Lock()
+        self._history = deque(maxlen=history_size)
+        self._methods = {}
+        self._sequence = 0
+
+    def call_site(self):
+        frame = sys._getframe(2)
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename in self.call_site_files:
+                # Вкладена функція (як build у звітах) приписується методу, в якому її оголошено
+                qualname = getattr(code, 'co_qualname', code.co_name)
+                return qualname.split('.<locals>')[0].rsplit('.', 1)[-1]
+            frame = frame.f_back
+        return '<external>'
+
+    def start(self, sql):
+        method = self.call_site()
+        with self._lock:
+            self._sequence += 1
+            record = {'seq': self._sequence, 'method': method, 'sql': ' '.join(sql.split()),
+                      'ms': 0.0, 'rows': 0, 'slow': False}
+            self._history.append(record)
+            counters = self._methods.setdefault(method, {'statements': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0})
+            counters['statements'] += 1
+        return record
+
+    def add(self, record, seconds, rows=0):
+        ms = seconds * 1000
+        with self._lock:
+            record['ms'] += ms
+            record['rows'] += rows
+            counters = self._methods[record['method']]
+            counters['total_ms'] += ms
+            counters['rows'] += rows
+            counters['max_ms'] = max(counters['max_ms'], record['ms'])
+            became_slow = not record['slow'] and record['ms'] >= self.slow_query_ms
+            if became_slow:
+                record['slow'] = True
+        if became_slow:
+            logging.warning(f"Slow query in {record['method']} ({record['ms']:.1f} ms): {record['sql']}")
+
+    def checkpoint(self):
+        with self._lock:
+            return self._sequence
+
+    def top_queries(self, since=0, limit=20, until=None):
+        grouped = {}
+        with self._lock:
+            records = [dict(record) for record in self._history
+                       if record['seq'] > since and (until is None or record['seq'] <= until)]
+        for record in records:
+            key = (record['method'], record['sql'])
+            entry = grouped.setdefault(key, {'method': record['method'], 'sql': record['sql'],
+                                             'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'rows': 0})
+            entry['count'] += 1
+            entry['total_ms'] += record['ms']
+            entry['max_ms'] = max(entry['max_ms'], record['ms'])
+            entry['rows'] += record['rows']
+        return sorted(grouped.values(), key=lambda entry: entry['total_ms'], reverse=True)[:limit]
+
+    def snapshot(self, since=0, limit=20, until=None):
+        with self._lock:
+            methods = {name: dict(counters) for name, counters in self._methods.items()}
+            slow = [dict(record) for record in self._history
+                    if record['slow'] and record['seq'] > since and (until is None or record['seq'] <= until)]
+            sequence = self._sequence
+        return {
+            'sequence': sequence,
+            'slow_query_ms': self.slow_query_ms,
+            'methods': methods,
+            'top_queries': self.top_queries(since, limit, until),
+            'slow_queries': slow
+        }
+
+    def reset(self):
+        with self._lock:
+            self._history.clear()
+            self._methods.clear()
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    _record = None
+
+    def _timed(self, method, sql, args):
+        stats = self.connection.stats
+        self._record = stats.start(sql)
+        start = time.perf_counter()
+        try:
+            return method(self, sql, *args)
+        finally:
+            rowcount = self.rowcount if self.rowcount > 0 else 0
+            stats.add(self._record, time.perf_counter() - start, rowcount)
+
+    def execute(self, sql, *args):
+        return self._timed(sqlite3.Cursor.execute, sql, args)
+
+    def executemany(self, sql, *args):
+        return self._timed(sqlite3.Cursor.executemany, sql, args)
+
+    def executescript(self, sql):
+        return self._timed(sqlite3.Cursor.executescript, sql, ())
+
+    def _fetch(self, method, *args):
+        start = time.perf_counter()
+        result = method(self, *args)
+        if self._record is not None:
+            rows = len(result) if isinstance(result, list) else int(result is not None)
+            self.connection.stats.add(self._record, time.perf_counter() - start, rows)
+        return result
+
+    def fetchone(self):
+        return self._fetch(sqlite3.Cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._fetch(sqlite3.Cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._fetch(sqlite3.Cursor.fetchall)
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    stats = None
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    # Connection.execute створює курсор у C-коді й оминає перевизначений execute, тому тут явно
+    def execute(self, sql, *args):
+        return self.cursor().execute(sql, *args)
+
+    def executemany(self, sql, *args):
+        return self.cursor().executemany(sql, *args)
+
+    def executescript(self, sql):
+        return self.cursor().executescript(sql)
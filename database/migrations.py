@@ -0,0 +1,291 @@
+import logging
+import sqlite3
+
+
+def _add_equipment_indexes(c):
+    c.execute("CREATE INDEX IF NOT EXISTS idx_equipment_written_off_room ON equipment(written_off, room)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_equipment_written_off_owner ON equipment(written_off, owner)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_equipment_room ON equipment(room)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_equipment_owner ON equipment(owner)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_equipment_type ON equipment(type)")
+
+
+def _add_equipment_change_tracking(c):
+    c.execute("ALTER TABLE equipment ADD COLUMN updated_at TEXT")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_equipment_updated_at ON equipment(updated_at)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_equipment_type_lower ON equipment(LOWER(type))")
+
+
+FTS_COLUMNS = "inventory_number, name, model, serial_number, room, owner"
+PREFIX_TOKENIZER = "tokenize='unicode61 remove_diacritics 2', prefix='2 3'"
+
+
+def _add_equipment_fts(c):
+    tokenizers = ["tokenize='trigram'", "tokenize='unicode61 remove_diacritics 2', prefix='2 3'"]
+    for tokenizer in tokenizers:
+        try:
+            c.execute(f"CREATE VIRTUAL TABLE equipment_fts USING fts5({FTS_COLUMNS}, "
+                      f"content='equipment', content_rowid='id', {tokenizer})")
+            break
+        except sqlite3.OperationalError as e:
+            logging.warning(f"Cannot create equipment_fts with {tokenizer}: {e}")
+    else:
+        logging.warning("FTS5 is not available, search_equipment falls back to LIKE")
+        return
+    new_values = "new.inventory_number, new.name, new.model, new.serial_number, new.room, new.owner"
+    old_values = "old.inventory_number, old.name, old.model, old.serial_number, old.room, old.owner"
+    c.execute(f'''
+    CREATE TRIGGER equipment_fts_insert AFTER INSERT ON equipment BEGIN
+        INSERT INTO equipment_fts (rowid, {FTS_COLUMNS}) VALUES (new.id, {new_values});
+    END
+    ''')
+    c.execute(f'''
+    CREATE TRIGGER equipment_fts_delete AFTER DELETE ON equipment BEGIN
+        INSERT INTO equipment_fts (equipment_fts, rowid, {FTS_COLUMNS}) VALUES ('delete', old.id, {old_values});
+    END
+    ''')
+    c.execute(f'''
+    CREATE TRIGGER equipment_fts_update AFTER UPDATE OF {FTS_COLUMNS} ON equipment BEGIN
+        INSERT INTO equipment_fts (equipment_fts, rowid, {FTS_COLUMNS}) VALUES ('delete', old.id, {old_values});
+        INSERT INTO equipment_fts (rowid, {FTS_COLUMNS}) VALUES (new.id, {new_values});
+    END
+    ''')
+    c.execute("INSERT INTO equipment_fts (equipment_fts) VALUES ('rebuild')")
+
+
+def _add_equipment_sort_indexes(c):
+    c.execute("CREATE INDEX IF NOT EXISTS idx_equipment_written_off_inventory ON equipment(written_off, inventory_number)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_equipment_written_off_type ON equipment(written_off, type)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_equipment_written_off_name ON equipment(written_off, name)")
+    # Без статистики планувальник для "фільтр + сортування" обирає індекс сортування і фільтрує весь кабінет
+    c.execute("ANALYZE equipment")
+
+
+def _create_equipment_view(c, extra_columns=""):
+    # Сумісне представлення: рядки мають ті самі ключі type/room/owner, що й до переходу на ідентифікатори
+    c.execute(f'''
+    CREATE VIEW IF NOT EXISTS equipment_v AS
+    SELECT e.id, e.inventory_number, COALESCE(t.type_name, '') AS type, e.name, e.model, e.serial_number,
+           COALESCE(r.room_name, '') AS room, COALESCE(o.full_name, '') AS owner, e.written_off, e.updated_at,
+           e.type_id, e.room_id, e.owner_id{extra_columns}
+    FROM equipment e
+    LEFT JOIN equipment_types t ON t.id = e.type_id
+    LEFT JOIN rooms r ON r.id = e.room_id
+    LEFT JOIN owners o ON o.id = e.owner_id
+    ''')
+
+
+def _create_reference_fts(c, tokenizer, table="equipment_fts"):
+    c.execute(f"CREATE VIRTUAL TABLE {table} USING fts5({FTS_COLUMNS}, "
+              f"content='equipment_v', content_rowid='id', {tokenizer})")
+    old_values = ("old.inventory_number, old.name, old.model, old.serial_number, "
+                  "COALESCE((SELECT room_name FROM rooms WHERE id = old.room_id), ''), "
+                  "COALESCE((SELECT full_name FROM owners WHERE id = old.owner_id), '')")
+    c.execute(f'''
+    CREATE TRIGGER {table}_insert AFTER INSERT ON equipment BEGIN
+        INSERT INTO {table} (rowid, {FTS_COLUMNS}) SELECT id, {FTS_COLUMNS} FROM equipment_v WHERE id = new.id;
+    END
+    ''')
+    c.execute(f'''
+    CREATE TRIGGER {table}_delete AFTER DELETE ON equipment BEGIN
+        INSERT INTO {table} ({table}, rowid, {FTS_COLUMNS}) VALUES ('delete', old.id, {old_values});
+    END
+    ''')
+    c.execute(f'''
+    CREATE TRIGGER {table}_update
+    AFTER UPDATE OF inventory_number, name, model, serial_number, room_id, owner_id ON equipment BEGIN
+        INSERT INTO {table} ({table}, rowid, {FTS_COLUMNS}) VALUES ('delete', old.id, {old_values});
+        INSERT INTO {table} (rowid, {FTS_COLUMNS}) SELECT id, {FTS_COLUMNS} FROM equipment_v WHERE id = new.id;
+    END
+    ''')
+    # Перейменування кабінету чи власника змінює один рядок довідника, але проіндексований текст усіх його записів
+    suffix = table[len("equipment_"):]
+    for ref_table, key, name_column, view_column in (("rooms", "room_id", "room_name", "room"),
+                                                     ("owners", "owner_id", "full_name", "owner")):
+        old_columns = FTS_COLUMNS.replace(view_column, f"old.{name_column}")
+        c.execute(f'''
+        CREATE TRIGGER {ref_table}_{suffix}_rename AFTER UPDATE OF {name_column} ON {ref_table} BEGIN
+            INSERT INTO {table} ({table}, rowid, {FTS_COLUMNS})
+            SELECT 'delete', id, {old_columns} FROM equipment_v WHERE {key} = old.id;
+            INSERT INTO {table} (rowid, {FTS_COLUMNS})
+            SELECT id, {FTS_COLUMNS} FROM equipment_v WHERE {key} = new.id;
+        END
+        ''')
+    c.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+
+
+def _normalise_equipment_references(c):
+    c.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='equipment_fts'")
+    row = c.fetchone()
+    fts_sql = row[0] if row else None
+    for trigger in ("equipment_fts_insert", "equipment_fts_delete", "equipment_fts_update"):
+        c.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    c.execute("DROP TABLE IF EXISTS equipment_fts")
+
+    for table, column, source in (("equipment_types", "type_name", "type"), ("rooms", "room_name", "room"),
+                                  ("owners", "full_name", "owner")):
+        c.execute(f"INSERT OR IGNORE INTO {table} ({column}) "
+                  f"SELECT DISTINCT {source} FROM equipment WHERE {source} != '' AND {source} IS NOT NULL")
+    c.execute('''
+    CREATE TABLE equipment_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        inventory_number TEXT UNIQUE,
+        type_id INTEGER REFERENCES equipment_types(id),
+        name TEXT,
+        model TEXT,
+        serial_number TEXT,
+        room_id INTEGER REFERENCES rooms(id),
+        owner_id INTEGER REFERENCES owners(id),
+        written_off INTEGER DEFAULT 0,
+        updated_at TEXT
+    )
+    ''')
+    c.execute('''
+    INSERT INTO equipment_new (id, inventory_number, type_id, name, model, serial_number, room_id, owner_id,
+                               written_off, updated_at)
+    SELECT e.id, e.inventory_number, t.id, e.name, e.model, e.serial_number, r.id, o.id, e.written_off, e.updated_at
+    FROM equipment e
+    LEFT JOIN equipment_types t ON t.type_name = e.type
+    LEFT JOIN rooms r ON r.room_name = e.room
+    LEFT JOIN owners o ON o.full_name = e.owner
+    ''')
+    c.execute("SELECT seq FROM sqlite_sequence WHERE name='equipment'")
+    row = c.fetchone()
+    sequence = row[0] if row else 0
+    c.execute("DROP TABLE equipment")
+    c.execute("ALTER TABLE equipment_new RENAME TO equipment")
+    c.execute("UPDATE sqlite_sequence SET seq=MAX(seq, ?) WHERE name='equipment'", (sequence,))
+
+    c.execute("CREATE INDEX idx_equipment_written_off_room ON equipment(written_off, room_id)")
+    c.execute("CREATE INDEX idx_equipment_written_off_owner ON equipment(written_off, owner_id)")
+    c.execute("CREATE INDEX idx_equipment_written_off_type ON equipment(written_off, type_id)")
+    c.execute("CREATE INDEX idx_equipment_written_off_inventory ON equipment(written_off, inventory_number)")
+    c.execute("CREATE INDEX idx_equipment_written_off_name ON equipment(written_off, name)")
+    c.execute("CREATE INDEX idx_equipment_room ON equipment(room_id)")
+    c.execute("CREATE INDEX idx_equipment_owner ON equipment(owner_id)")
+    c.execute("CREATE INDEX idx_equipment_type ON equipment(type_id)")
+    c.execute("CREATE INDEX idx_equipment_updated_at ON equipment(updated_at)")
+    _create_equipment_view(c)
+    if fts_sql:
+        tokenizer = "tokenize='trigram'" if 'trigram' in fts_sql else "tokenize='unicode61 remove_diacritics 2', prefix='2 3'"
+        _create_reference_fts(c, tokenizer)
+    c.execute("ANALYZE")
+
+
+def _add_app_meta(c):
+    c.execute('''
+    CREATE TABLE IF NOT EXISTS app_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+    ''')
+
+
+def _add_room_occupancy_counters(c):
+    c.execute("ALTER TABLE rooms ADD COLUMN active_count INTEGER NOT NULL DEFAULT 0")
+    c.execute('''
+    UPDATE rooms SET active_count = (SELECT COUNT(*) FROM equipment WHERE room_id = rooms.id AND written_off = 0)
+    ''')
+    # Лічильник рахує записи, що не списані; списання і переміщення — це оновлення room_id або written_off
+    c.execute('''
+    CREATE TRIGGER rooms_active_count_insert AFTER INSERT ON equipment
+    WHEN new.room_id IS NOT NULL AND new.written_off = 0 BEGIN
+        UPDATE rooms SET active_count = active_count + 1 WHERE id = new.room_id;
+    END
+    ''')
+    c.execute('''
+    CREATE TRIGGER rooms_active_count_delete AFTER DELETE ON equipment
+    WHEN old.room_id IS NOT NULL AND old.written_off = 0 BEGIN
+        UPDATE rooms SET active_count = active_count - 1 WHERE id = old.room_id;
+    END
+    ''')
+    c.execute('''
+    CREATE TRIGGER rooms_active_count_update AFTER UPDATE OF room_id, written_off ON equipment
+    WHEN old.room_id IS NOT new.room_id OR old.written_off IS NOT new.written_off BEGIN
+        UPDATE rooms SET active_count = active_count - 1 WHERE id = old.room_id AND old.written_off = 0;
+        UPDATE rooms SET active_count = active_count + 1 WHERE id = new.room_id AND new.written_off = 0;
+    END
+    ''')
+
+
+def _drop_fts_statistics(c):
+    # Крок 6 збирає статистику й для тіньових таблиць equipment_fts. Зібрана на майже порожній базі, вона
+    # збиває плани внутрішніх запитів FTS5, і вставка сповільнюється з ростом індексу
+    c.execute("DELETE FROM sqlite_stat1 WHERE tbl LIKE 'equipment\\_fts\\_%' ESCAPE '\\'")
+
+
+def _add_equipment_row_version(c):
+    # Версія рядка для оптимістичного блокування: кожен UPDATE обладнання збільшує її на одиницю
+    c.execute("ALTER TABLE equipment ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+    c.execute("DROP VIEW IF EXISTS equipment_v")
+    _create_equipment_view(c, ", e.version")
+
+
+def _add_prefix_fts(c):
+    # Триграмний equipment_fts знаходить підрядки; початки слів і запити, коротші за три символи,
+    # шукаються в окремій таблиці з індексом prefix=
+    c.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='equipment_fts'")
+    row = c.fetchone()
+    if not row or 'trigram' not in row[0]:
+        # Без FTS5 пошук іде через LIKE, а без триграм сам equipment_fts уже індексує початки слів
+        return
+    _create_reference_fts(c, PREFIX_TOKENIZER, "equipment_fts_prefix")
+
+
+# Кроки міграцій виконуються строго за зростанням версії, кожен у власній транзакції.
+# Нові кроки додаються лише в кінець списку; вже застосовані кроки не змінюються.
+MIGRATIONS = [
+    (1, "equipment secondary indexes", _add_equipment_indexes),
+    (2, "equipment change tracking and case-insensitive type index", _add_equipment_change_tracking),
+    (3, "full-text search index over equipment", _add_equipment_fts),
+    (4, "indexes for sorted equipment pages", _add_equipment_sort_indexes),
+    (5, "application metadata for one-time seeding", _add_app_meta),
+    (6, "integer room/owner/type references and equipment_v view", _normalise_equipment_references),
+    (7, "trigger-maintained room occupancy counters", _add_room_occupancy_counters),
+    (8, "drop planner statistics for full-text index shadow tables", _drop_fts_statistics),
+    (9, "equipment row version for optimistic concurrency", _add_equipment_row_version),
+    (10, "word-prefix full-text index next to the trigram one", _add_prefix_fts),
+]
+
+# Після цих версій база стискається: перебудова таблиці залишає вільні сторінки
+VACUUM_AFTER = {6}
+
+
+def get_schema_version(conn):
+    c = conn.cursor()
+    c.execute('''
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        description TEXT,
+        applied_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    c.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+    return c.fetchone()[0]
+
+
+def apply_migrations(conn, target=None):
+    current = get_schema_version(conn)
+    c = conn.cursor()
+    vacuum = False
+    for version, description, migrate in MIGRATIONS:
+        if version <= current:
+            continue
+        if target is not None and version > target:
+            break
+        try:
+            c.execute("BEGIN")
+            migrate(c)
+            c.execute("INSERT INTO schema_version (version, description) VALUES (?, ?)", (version, description))
+            conn.commit()
+            logging.debug(f"Applied migration {version}: {description}")
+        except Exception as e:
+            conn.rollback()
+            logging.error(f"Migration {version} failed: {e}")
+            raise
+        current = version
+        vacuum = vacuum or version in VACUUM_AFTER
+    if vacuum:
+        c.execute("VACUUM")
+        logging.debug("Database vacuumed after migrations")
+    return current
@@ -0,0 +1,125 @@
+import logging
+import threading
+
+# Вимір звіту: стовпець ідентифікатора в equipment, довідник і стовпець назви в ньому
+DIMENSIONS = {
+    'type': ('type_id', 'equipment_types', 'type_name'),
+    'room': ('room_id', 'rooms', 'room_name'),
+    'owner': ('owner_id', 'owners', 'full_name')
+}
+DIMENSION_LABELS = {'type': "Тип", 'room': "Кабінет", 'owner': "Власник"}
+
+
+class InventoryReports:
+    def __init__(self, db):
+        self.db = db
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    def _cached(self, key, build):
+        # Звіт перераховується лише тоді, коли змінилася версія даних бази
+        version = self.db.data_version()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] == version:
+                return entry[1]
+        result = build()
+        with self._lock:
+            self._cache[key] = (version, result)
+        logging.debug(f"Report built: {key}")
+        return result
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    @staticmethod
+    def _dimension(name):
+        if name not in DIMENSIONS:
+            raise ValueError(f"Unsupported report dimension: {name}")
+        return DIMENSIONS[name]
+
+    @staticmethod
+    def _written_off_clause(show_written_off):
+        # None — усі записи, False — лише в експлуатації, True — лише списані
+        if show_written_off is None:
+            return "", []
+        return "WHERE e.written_off=? ", [1 if show_written_off else 0]
+
+    def status_counts(self):
+        def build():
+            c = self.db.read_cursor()
+            c.execute("SELECT written_off, COUNT(*) AS count FROM equipment GROUP BY written_off")
+            counts = {row['written_off']: row['count'] for row in c.fetchall()}
+            active, written_off = counts.get(0, 0), counts.get(1, 0)
+            return {'active': active, 'written_off': written_off, 'total': active + written_off}
+        return self._cached(('status',), build)
+
+    def counts_by(self, dimension, show_written_off=False):
+        key_column, table, name_column = self._dimension(dimension)
+        where, params = self._written_off_clause(show_written_off)
+
+        def build():
+            # Групування за цілим ідентифікатором, назви підтягуються вже для готових груп
+            c = self.db.read_cursor()
+            c.execute(f'''
+            SELECT COALESCE(d.{name_column}, '') AS label, g.count FROM (
+                SELECT e.{key_column} AS key, COUNT(*) AS count FROM equipment e {where}GROUP BY e.{key_column}
+            ) g LEFT JOIN {table} d ON d.id = g.key
+            ORDER BY g.count DESC, label
+            ''', params)
+            return [(row['label'], row['count']) for row in c.fetchall()]
+        return self._cached(('counts', dimension, show_written_off), build)
+
+    def crosstab(self, row_dimension, column_dimension, show_written_off=False):
+        row_key, row_table, row_name = self._dimension(row_dimension)
+        column_key, column_table, column_name = self._dimension(column_dimension)
+        if row_dimension == column_dimension:
+            raise ValueError("Cross-tab dimensions must differ")
+        where, params = self._written_off_clause(show_written_off)
+
+        def build():
+            c = self.db.read_cursor()
+            c.execute(f'''
+            SELECT COALESCE(r.{row_name}, '') AS row_label, COALESCE(k.{column_name}, '') AS column_label, g.count
+            FROM (
+                SELECT e.{row_key} AS row_id, e.{column_key} AS column_id, COUNT(*) AS count
+                FROM equipment e {where}GROUP BY e.{row_key}, e.{column_key}
+            ) g
+            LEFT JOIN {row_table} r ON r.id = g.row_id
+            LEFT JOIN {column_table} k ON k.id = g.column_id
+            ''', params)
+            cells = {}
+            row_totals = {}
+            column_totals = {}
+            for row in c.fetchall():
+                key = (row['row_label'], row['column_label'])
+                cells[key] = cells.get(key, 0) + row['count']
+                row_totals[row['row_label']] = row_totals.get(row['row_label'], 0) + row['count']
+                column_totals[row['column_label']] = column_totals.get(row['column_label'], 0) + row['count']
+            columns = sorted(column_totals, key=lambda label: (-column_totals[label], label))
+            rows = [(label, [cells.get((label, column), 0) for column in columns], row_totals[label])
+                    for label in sorted(row_totals, key=lambda label: (-row_totals[label], label))]
+            return {
+                'columns': columns,
+                'rows': rows,
+                'column_totals': [column_totals[column] for column in columns],
+                'total': sum(row_totals.values())
+            }
+        return self._cached(('crosstab', row_dimension, column_dimension, show_written_off), build)
+
+    def summary(self):
+        def build():
+            c = self.db.read_cursor()
+            c.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM equipment_types) AS types,
+                (SELECT COUNT(*) FROM rooms) AS rooms,
+                (SELECT COUNT(*) FROM owners) AS owners,
+                (SELECT COUNT(*) FROM rooms WHERE max_seats > 0 AND active_count >= max_seats) AS full_rooms
+            ''')
+            row = c.fetchone()
+            result = dict(self.status_counts())
+            result.update({key: row[key] for key in ('types', 'rooms', 'owners', 'full_rooms')})
+            return result
+        return self._cached(('summary',), build)
@@ -4,6 +4,8 @@ import tkinter as tk
 from tkinter import messagebox
 
 class AddPage(ctk.CTkFrame):
+    watches = {'rooms', 'owners', 'types'}
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
@@ -100,7 +102,6 @@ class AddPage(ctk.CTkFrame):
             try:
                 if self.db.add_equipment(data):
                     self.status.configure(text="Обладнання додано")
-                    self.controller.refresh_pages()
                     self.clear_form()
                     logging.debug("Equipment added successfully")
                 else:
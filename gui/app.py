@@ -3,19 +3,30 @@ import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox, filedialog
 import threading
-from gui.main_menu import MainMenu
-from gui.equipment_list import EquipmentListPage
-from gui.search_page import SearchPage
-from gui.written_off import WrittenOffPage
-from gui.equipment_card import EquipmentCardPage
-from gui.add_page import AddPage
-from gui.rooms_management import RoomsManagementPage
-from gui.owners_management import OwnersManagementPage
-from gui.types_management import TypesManagementPage
-from gui.settings import SettingsPage
+import time
+import importlib
+from contextlib import contextmanager
 from database.database import Database
 import os
 
+# Модулі сторінок імпортуються під час першого відкриття сторінки, а не при старті
+PAGE_MODULES = {
+    "MainMenu": "gui.main_menu",
+    "SearchPage": "gui.search_page",
+    "EquipmentListPage": "gui.equipment_list",
+    "WrittenOffPage": "gui.written_off",
+    "EquipmentCardPage": "gui.equipment_card",
+    "AddPage": "gui.add_page",
+    "RoomsManagementPage": "gui.rooms_management",
+    "OwnersManagementPage": "gui.owners_management",
+    "TypesManagementPage": "gui.types_management",
+    "SettingsPage": "gui.settings",
+    "ReportsPage": "gui.reports",
+    "DiagnosticsPage": "gui.diagnostics"
+}
+# Як часто видима сторінка перевіряє зміни, зафіксовані іншими процесами
+EXTERNAL_CHANGES_POLL_MS = 2000
+
 class App(ctk.CTk):
     def __init__(self):
         try:
@@ -43,6 +54,7 @@ class App(ctk.CTk):
             menubar = tk.Menu(self)
             settings_menu = tk.Menu(menubar, tearoff=0)
             settings_menu.add_command(label="Імпорт з Excel", command=self.import_excel)
+            settings_menu.add_command(label="Експорт в Excel/CSV", command=self.export_equipment)
             settings_menu.add_command(label="Налаштування теми", command=lambda: self.switch_page("SettingsPage"))
             settings_menu.add_command(label="Керування кабінетами",
                                      command=lambda: self.switch_page("RoomsManagementPage"))
@@ -51,7 +63,7 @@ class App(ctk.CTk):
             settings_menu.add_command(label="Керування типами",
                                      command=lambda: self.switch_page("TypesManagementPage"))
             settings_menu.add_separator()
-            settings_menu.add_command(label="Вихід", command=self.quit)
+            settings_menu.add_command(label="Вихід", command=self.on_close)
             menubar.add_cascade(label="Налаштування", menu=settings_menu)
 
             help_menu = tk.Menu(menubar, tearoff=0)
@@ -59,84 +71,241 @@ class App(ctk.CTk):
             menubar.add_cascade(label="Довідка", menu=help_menu)
 
             account_menu = tk.Menu(menubar, tearoff=0)
-            account_menu.add_command(label="Вийти", command=self.quit)
+            account_menu.add_command(label="Вийти", command=self.on_close)
             menubar.add_cascade(label="Акаунт", menu=account_menu)
 
             self.config(menu=menubar)
+            self.protocol("WM_DELETE_WINDOW", self.on_close)
 
-            container = ctk.CTkFrame(self)
-            container.pack(fill="both", expand=True)
-            container.grid_rowconfigure(0, weight=1)
-            container.grid_columnconfigure(0, weight=1)
+            self.container = ctk.CTkFrame(self)
+            self.container.pack(fill="both", expand=True)
+            self.container.grid_rowconfigure(0, weight=1)
+            self.container.grid_columnconfigure(0, weight=1)
 
+            # Сторінки створюються під час першого відкриття, а не всі одразу
             self.frames = {}
-            page_classes = [
-                MainMenu,
-                SearchPage,
-                EquipmentListPage,
-                WrittenOffPage,
-                EquipmentCardPage,
-                AddPage,
-                RoomsManagementPage,
-                OwnersManagementPage,
-                TypesManagementPage,
-                SettingsPage
-            ]
-            for F in page_classes:
-                page_name = F.__name__
-                logging.debug(f"Initializing {page_name}")
-                frame = F(parent=container, controller=self)
-                frame.grid(row=0, column=0, sticky="nsew")
-                self.frames[page_name] = frame
-                logging.debug(f"Frame created: {page_name}")
+            self.page_timings = {}
+            self.dirty_pages = set()
+            self.page_versions = {}
+            self.poll_job = None
+            self.current_page = None
+            self.previous_page = None
+            self.pending_refresh = None
+            self.last_query_window = None
+            self.db.subscribe(self.on_data_changed)
+            # Прихована сторінка діагностики SQL
+            self.bind_all("<Control-Shift-D>", lambda event: self.switch_page("DiagnosticsPage"))
 
             self.switch_page("MainMenu")
+            self.poll_job = self.after(EXTERNAL_CHANGES_POLL_MS, self.poll_external_changes)
             logging.debug("App initialized successfully")
         except Exception as e:
             logging.error(f"Error initializing App: {e}")
             messagebox.showerror("Помилка", f"Помилка ініціалізації програми: {str(e)}")
 
+    def get_page_class(self, page_name):
+        return getattr(importlib.import_module(PAGE_MODULES[page_name]), page_name)
+
+    def get_page(self, page_name):
+        frame = self.frames.get(page_name)
+        if frame is None:
+            logging.debug(f"Initializing {page_name}")
+            start = time.perf_counter()
+            version = self.db.data_version()
+            page_class = self.get_page_class(page_name)
+            imported = time.perf_counter()
+            frame = page_class(parent=self.container, controller=self)
+            frame.grid(row=0, column=0, sticky="nsew")
+            self.frames[page_name] = frame
+            if getattr(frame, "watches", None):
+                self.page_versions[page_name] = version
+            self.page_timings[page_name] = {'import_ms': (imported - start) * 1000,
+                                            'build_ms': (time.perf_counter() - imported) * 1000}
+            logging.debug(f"Frame created: {page_name}")
+        return frame
+
     def switch_page(self, page_name):
         try:
             logging.debug(f"Attempting to switch to page: {page_name}")
-            if page_name not in self.frames:
+            if page_name not in PAGE_MODULES:
                 logging.error(f"Page not found: {page_name}")
                 messagebox.showerror("Помилка", f"Сторінка {page_name} не знайдена")
                 return
-            frame = self.frames[page_name]
-            frame.tkraise()
-            if hasattr(frame, "refresh"):
+            if page_name == "DiagnosticsPage":
+                self.previous_page = self.current_page
+                frame = self.get_page(page_name)
                 frame.refresh()
+                frame.tkraise()
+                self.current_page = page_name
+                return
+            with self.query_window(f"Перехід на {page_name}"):
+                frame = self.get_page(page_name)
+                frame.tkraise()
+                self.current_page = page_name
+                if self.is_page_stale(page_name) and hasattr(frame, "refresh"):
+                    self.mark_refreshed(page_name)
+                    frame.refresh()
             logging.debug(f"Successfully switched to page: {page_name}")
         except Exception as e:
             logging.error(f"Error switching to page {page_name}: {e}")
             messagebox.showerror("Помилка", f"Не вдалося відкрити сторінку {page_name}: {str(e)}")
 
+    def on_data_changed(self, kinds):
+        if threading.current_thread() is not threading.main_thread():
+            self.after(0, self.on_data_changed, kinds)
+            return
+        for page_name, frame in self.frames.items():
+            if getattr(frame, "watches", set()) & kinds:
+                self.dirty_pages.add(page_name)
+        if self.current_page in self.dirty_pages and self.pending_refresh is None:
+            # Серія змін (наприклад, частини імпорту) оновлює видиму сторінку лише раз
+            self.pending_refresh = self.after(200, self.refresh_current_page)
+
+    def is_page_stale(self, page_name):
+        # Зміни інших процесів (cli.py, HTTP API, другий екземпляр програми) не надходять через subscribe,
+        # тому сторінка застаріла й тоді, коли версія даних бази змінилася з її останнього оновлення
+        if page_name in self.dirty_pages:
+            return True
+        return page_name in self.page_versions and self.page_versions[page_name] != self.db.data_version()
+
+    def mark_refreshed(self, page_name):
+        # Версія береться до оновлення: зміни, що встигнуть під час нього, позначать сторінку знову
+        self.dirty_pages.discard(page_name)
+        if page_name in self.page_versions:
+            self.page_versions[page_name] = self.db.data_version()
+
+    def poll_external_changes(self):
+        if self.pending_refresh is None and self.current_page in self.page_versions:
+            self.refresh_current_page()
+        self.poll_job = self.after(EXTERNAL_CHANGES_POLL_MS, self.poll_external_changes)
+
+    def refresh_current_page(self):
+        self.pending_refresh = None
+        if not self.is_page_stale(self.current_page):
+            return
+        self.mark_refreshed(self.current_page)
+        frame = self.frames[self.current_page]
+        try:
+            with self.query_window(f"Оновлення {self.current_page}"):
+                frame.refresh()
+            logging.debug(f"Refreshed page: {self.current_page}")
+        except Exception as e:
+            logging.error(f"Error refreshing page {self.current_page}: {e}")
+
     def refresh_pages(self, pages=None):
         if pages is None:
             pages = self.frames.values()
-        for frame in pages:
-            if hasattr(frame, "refresh"):
-                try:
-                    frame.refresh()
-                    logging.debug(f"Refreshed page: {frame.__class__.__name__}")
-                except Exception as e:
-                    logging.error(f"Error refreshing page {frame.__class__.__name__}: {e}")
+        with self.query_window("refresh_pages()"):
+            for frame in pages:
+                if hasattr(frame, "refresh"):
+                    try:
+                        frame.refresh()
+                        logging.debug(f"Refreshed page: {frame.__class__.__name__}")
+                    except Exception as e:
+                        logging.error(f"Error refreshing page {frame.__class__.__name__}: {e}")
+
+    @contextmanager
+    def query_window(self, label):
+        # Запам'ятовує межі запитів останнього перемикання чи оновлення для сторінки діагностики
+        if self.db.stats is None:
+            yield
+            return
+        since = self.db.stats.checkpoint()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.last_query_window = {'label': label, 'since': since, 'until': self.db.stats.checkpoint(),
+                                      'elapsed_ms': (time.perf_counter() - start) * 1000}
 
     def import_excel(self):
-        filepath = filedialog.askopenfilename(title="Оберіть Excel файл", filetypes=[("Excel files", "*.xlsx *.xls")])
+        filepath = filedialog.askopenfilename(title="Оберіть Excel файл",
+                                              filetypes=[("Excel files", "*.xlsx *.xls"), ("CSV files", "*.csv")])
         if not filepath:
             return
+        progress_window, progress_label, progress_bar = self.progress_window("Імпорт", "Імпорт даних...")
+
+        def show_progress(processed, total):
+            if total:
+                progress_bar.set(min(processed / total, 1.0))
+                progress_label.configure(text=f"Оброблено записів: {processed} з {total}")
+            else:
+                progress_label.configure(text=f"Оброблено записів: {processed}")
+
+        def finish(message, error=False):
+            progress_window.destroy()
+            if error:
+                messagebox.showerror("Помилка", message)
+            else:
+                messagebox.showinfo("Імпорт", message)
+
         def import_thread():
             try:
-                imported = self.db.import_from_excel(filepath)
-                messagebox.showinfo("Імпорт", f"Імпортовано записів: {imported}")
-                self.refresh_pages()
+                imported = self.db.stream_import(
+                    filepath, progress=lambda processed, total: self.after(0, show_progress, processed, total))
+                rate = self.db.last_import_stats['rows_per_second']
+                self.after(0, finish, f"Імпортовано записів: {imported}\nШвидкість: {rate:.0f} записів/с")
                 logging.debug(f"Excel import completed: {imported} records")
             except Exception as e:
                 logging.error(f"Error in import_excel: {e}")
-                messagebox.showerror("Помилка", f"Помилка імпорту: {e}")
-        threading.Thread(target=import_thread).start()
+                self.after(0, finish, f"Помилка імпорту: {e}", True)
+        threading.Thread(target=import_thread, daemon=True).start()
+
+    def progress_window(self, title, text):
+        window = ctk.CTkToplevel(self)
+        window.title(title)
+        window.geometry("400x120")
+        window.transient(self)
+        label = ctk.CTkLabel(window, text=text)
+        label.pack(pady=(20, 10))
+        bar = ctk.CTkProgressBar(window, width=340)
+        bar.pack(pady=5)
+        bar.set(0)
+        return window, label, bar
+
+    def export_equipment(self, room=None, owner=None, show_written_off=False, text=None):
+        filepath = filedialog.asksaveasfilename(title="Зберегти експорт", defaultextension=".xlsx",
+                                                filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv")])
+        if not filepath:
+            return
+        from database.exporter import export_equipment
+        sheet_per_room = False
+        if filepath.lower().endswith(".xlsx") and not (room and room != "---"):
+            sheet_per_room = messagebox.askyesno("Експорт", "Розмістити кожен кабінет на окремому аркуші?")
+        progress_window, progress_label, progress_bar = self.progress_window("Експорт", "Експорт даних...")
+
+        def show_progress(written, total):
+            if total:
+                progress_bar.set(min(written / total, 1.0))
+            progress_label.configure(text=f"Експортовано записів: {written} з {total}")
+
+        def finish(message, error=False):
+            progress_window.destroy()
+            if error:
+                messagebox.showerror("Помилка", message)
+            else:
+                messagebox.showinfo("Експорт", message)
+
+        def export_thread():
+            try:
+                written = export_equipment(
+                    self.db, filepath, room=room, owner=owner, show_written_off=show_written_off, text=text,
+                    sheet_per_room=sheet_per_room,
+                    progress=lambda written, total: self.after(0, show_progress, written, total))
+                self.after(0, finish, f"Експортовано записів: {written}\n{filepath}")
+            except Exception as e:
+                logging.error(f"Error in export_equipment: {e}")
+                self.after(0, finish, f"Помилка експорту: {e}", True)
+        threading.Thread(target=export_thread, daemon=True).start()
+
+    def on_close(self):
+        try:
+            if self.poll_job is not None:
+                self.after_cancel(self.poll_job)
+            self.db.close()
+        except Exception as e:
+            logging.error(f"Error closing database: {e}")
+        self.destroy()
 
     def show_about(self):
         messagebox.showinfo("Про програму", "Програма інвентаризації\nРеалізовано на customtkinter та SQLite")
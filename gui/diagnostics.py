@@ -0,0 +1,79 @@
+import logging
+import customtkinter as ctk
+from tkinter import ttk
+
+COLUMNS = [
+    ("method", "Метод", 170),
+    ("count", "Викликів", 80),
+    ("total_ms", "Всього, мс", 100),
+    ("max_ms", "Макс., мс", 100),
+    ("rows", "Рядків", 80),
+    ("sql", "Запит", 420)
+]
+
+class DiagnosticsPage(ctk.CTkFrame):
+    watches = set()
+
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+        self.db = controller.db
+        logging.debug("Initializing DiagnosticsPage")
+        self.create_widgets()
+        logging.debug("Frame created: DiagnosticsPage")
+
+    def create_widgets(self):
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(2, weight=1)
+
+        ctk.CTkLabel(self, text="Діагностика запитів", font=ctk.CTkFont(size=20, weight="bold")).grid(row=0, column=0, pady=10, padx=10, sticky="w")
+        self.summary = ctk.CTkLabel(self, text="", justify="left", anchor="w")
+        self.summary.grid(row=1, column=0, padx=10, sticky="ew")
+
+        table_frame = ctk.CTkFrame(self)
+        table_frame.grid(row=2, column=0, padx=10, pady=10, sticky="nsew")
+        table_frame.grid_columnconfigure(0, weight=1)
+        table_frame.grid_rowconfigure(0, weight=1)
+        self.tree = ttk.Treeview(table_frame, columns=[key for key, _, _ in COLUMNS], show="headings")
+        for key, heading, width in COLUMNS:
+            self.tree.heading(key, text=heading)
+            self.tree.column(key, width=width, anchor="w", stretch=key == "sql")
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        scrollbar = ctk.CTkScrollbar(table_frame, command=self.tree.yview)
+        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        button_frame = ctk.CTkFrame(self)
+        button_frame.grid(row=3, column=0, pady=10)
+        ctk.CTkButton(button_frame, text="Оновити", command=self.refresh).grid(row=0, column=0, padx=5)
+        ctk.CTkButton(button_frame, text="Скинути статистику", command=self.reset_stats).grid(row=0, column=1, padx=5)
+        ctk.CTkButton(button_frame, text="Назад", command=self.go_back).grid(row=0, column=2, padx=5)
+
+        self.refresh()
+
+    def refresh(self):
+        self.tree.delete(*self.tree.get_children())
+        if self.db.stats is None:
+            self.summary.configure(text="Інструментування SQL вимкнено. Запустіть програму з INVENTORY_SQL_STATS=1.")
+            return
+        window = self.controller.last_query_window
+        if window is None:
+            self.summary.configure(text="Ще немає даних про перемикання чи оновлення сторінок")
+            return
+        snapshot = self.db.query_stats(since=window['since'], until=window['until'])
+        total_ms = sum(entry['total_ms'] for entry in snapshot['top_queries'])
+        self.summary.configure(text=f"{window['label']}: {window['elapsed_ms']:.1f} мс загалом, "
+                                    f"{total_ms:.1f} мс у SQL, повільних запитів: {len(snapshot['slow_queries'])} "
+                                    f"(поріг {snapshot['slow_query_ms']:.0f} мс)")
+        for entry in snapshot['top_queries']:
+            self.tree.insert("", "end", values=[entry['method'], entry['count'], f"{entry['total_ms']:.2f}",
+                                                f"{entry['max_ms']:.2f}", entry['rows'], entry['sql']])
+
+    def reset_stats(self):
+        if self.db.stats is not None:
+            self.db.stats.reset()
+        self.controller.last_query_window = None
+        self.refresh()
+
+    def go_back(self):
+        self.controller.switch_page(self.controller.previous_page or "MainMenu")
@@ -1,13 +1,19 @@
 import logging
 import customtkinter as ctk
+import tkinter as tk
 from tkinter import messagebox
+from database.database import STOCK_ROOM
 
 class EquipmentCardPage(ctk.CTkFrame):
+    watches = {'equipment', 'rooms', 'owners', 'types'}
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
         self.db = controller.db
         self.current_id = None
+        # Рядок на момент відкриття картки: з ним порівнюються зміни інших користувачів під час збереження
+        self.base_row = None
         logging.debug("Initializing EquipmentCardPage")
 
         nav_frame = ctk.CTkFrame(self)
@@ -70,6 +76,8 @@ class EquipmentCardPage(ctk.CTkFrame):
                 ent = widget_class(container)
                 ent.pack(fill="x")
             self.entries[field_key] = ent
+        self.field_labels = {field_key: label_text for label_text, field_key, _ in fields}
+        self.field_labels['written_off'] = "Списання"
 
         bottom = ctk.CTkFrame(self)
         bottom.pack(fill="x", pady=15)
@@ -92,16 +100,28 @@ class EquipmentCardPage(ctk.CTkFrame):
         if not row:
             self.status.configure(text="Обладнання не знайдено")
             logging.error(f"Equipment not found: ID {equip_id}")
+            self.base_row = None
             return
+        self.base_row = row
+        self.fill_entries(row)
+        logging.debug(f"Equipment loaded: ID {equip_id}, version {row['version']}")
+
+    def fill_entries(self, values, keep=()):
         for key in self.entries:
+            if key in keep:
+                continue
             widget = self.entries[key]
-            value = row[key] or ''
+            value = values[key] or ''
             if isinstance(widget, ctk.CTkComboBox):
                 widget.set(value)
             else:
                 widget.delete(0, tk.END)
                 widget.insert(0, value)
-        logging.debug(f"Equipment loaded: ID {equip_id}")
+
+    def has_unsaved_changes(self):
+        if self.base_row is None:
+            return False
+        return any(self.entries[key].get().strip() != (self.base_row[key] or '') for key in self.entries)
 
     def collect_data(self):
         data = {key: self.entries[key].get().strip() for key in self.entries}
@@ -109,7 +129,7 @@ class EquipmentCardPage(ctk.CTkFrame):
         return data
 
     def save_equipment(self):
-        if self.current_id is None:
+        if self.current_id is None or self.base_row is None:
             self.status.configure(text="Обладнання не вибрано")
             logging.error("No equipment selected for saving")
             return
@@ -119,26 +139,49 @@ class EquipmentCardPage(ctk.CTkFrame):
             logging.error("Empty inventory number in save_equipment")
             return
         try:
-            self.db.update_equipment(self.current_id, data)
-            self.controller.refresh_pages()
-            self.status.configure(text="Зміни збережено")
-            logging.debug(f"Equipment saved: ID {self.current_id}")
+            result = self.save_versioned(data)
+            if result['status'] == 'merged':
+                self.status.configure(text="Зміни збережено разом зі змінами інших користувачів")
+            elif result['status'] == 'updated':
+                self.status.configure(text="Зміни збережено")
+            logging.debug(f"Equipment saved: ID {self.current_id}, {result['status']}")
         except ValueError as e:
             self.status.configure(text=str(e))
             logging.error(f"ValueError in save_equipment: {e}")
 
+    def save_versioned(self, data):
+        # Запис оновлюється лише з тієї версії, яку бачив користувач; чужі зміни інших полів зливаються
+        result = self.db.update_equipment(self.current_id, data, expected_version=self.base_row['version'],
+                                          base=self.base_row)
+        if result['status'] == 'conflict':
+            current = result['current']
+            # Форма показує поточні значення, крім конфліктних полів: там лишаються введені користувачем.
+            # Поточний рядок стає базою, тож повторне збереження свідомо перезапише ці поля
+            merged, _ = self.db.merge_equipment_changes(self.base_row, data, current)
+            self.base_row = current
+            self.fill_entries(merged, keep=result['conflicts'])
+            names = ", ".join(self.field_labels[field] for field in result['conflicts'])
+            self.status.configure(text=f"Запис тим часом змінив інший користувач ({names}). "
+                                       f"Перевірте значення і збережіть ще раз")
+            logging.debug(f"Save conflict for equipment ID {self.current_id}: {result['conflicts']}")
+        elif result['status'] == 'not_found':
+            self.status.configure(text="Обладнання не знайдено")
+        else:
+            self.load_equipment(self.current_id)
+        return result
+
     def move_to_stock(self):
-        if self.current_id is None:
+        if self.current_id is None or self.base_row is None:
             self.status.configure(text="Обладнання не вибрано")
             logging.error("No equipment selected for move_to_stock")
             return
         data = self.collect_data()
-        data['room'] = "Склад"
+        data['room'] = STOCK_ROOM
         try:
-            self.db.update_equipment(self.current_id, data)
-            self.controller.refresh_pages()
-            self.status.configure(text="Обладнання переміщено на склад")
-            logging.debug(f"Equipment moved to stock: ID {self.current_id}")
+            result = self.save_versioned(data)
+            if result['status'] in ('updated', 'merged'):
+                self.status.configure(text="Обладнання переміщено на склад")
+            logging.debug(f"Equipment moved to stock: ID {self.current_id}, {result['status']}")
         except ValueError as e:
             self.status.configure(text=str(e))
             logging.error(f"ValueError in move_to_stock: {e}")
@@ -149,7 +192,6 @@ class EquipmentCardPage(ctk.CTkFrame):
             logging.error("No equipment selected for write_off")
             return
         self.db.write_off_equipment(self.current_id)
-        self.controller.refresh_pages()
         self.status.configure(text="Обладнання списано")
         self.controller.switch_page("MainMenu")
         logging.debug(f"Equipment written off: ID {self.current_id}")
@@ -159,5 +201,9 @@ class EquipmentCardPage(ctk.CTkFrame):
         self.entries['room'].configure(values=[''] + self.db.get_all_rooms())
         self.entries['owner'].configure(values=[''] + self.db.get_all_owners())
         if self.current_id:
-            self.load_equipment(self.current_id)
+            # Незбережені правки не затираються: їх буде злито з новим станом запису під час збереження
+            if self.has_unsaved_changes():
+                logging.debug(f"EquipmentCardPage keeps unsaved edits of equipment ID {self.current_id}")
+            else:
+                self.load_equipment(self.current_id)
         logging.debug("EquipmentCardPage refreshed")
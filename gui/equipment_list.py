@@ -1,13 +1,29 @@
 import logging
 import customtkinter as ctk
-from tkinter import messagebox
+from tkinter import messagebox, ttk
+from database.database import PAGE_SIZE, STOCK_ROOM
+
+COLUMNS = [
+    ("id", "ID", 60),
+    ("inventory_number", "Інвентарний номер", 140),
+    ("type", "Тип", 120),
+    ("name", "Назва", 200),
+    ("room", "Кабінет", 120),
+    ("owner", "Власник", 160)
+]
 
 class EquipmentListPage(ctk.CTkFrame):
+    watches = {'equipment', 'rooms', 'owners'}
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
         self.db = controller.db
         self.current_room = None
+        self.sort_by = "id"
+        self.descending = False
+        self.last_key = None
+        self.has_more = False
         logging.debug("Initializing EquipmentListPage")
         self.create_widgets()
         logging.debug("Frame created: EquipmentListPage")
@@ -33,8 +49,21 @@ class EquipmentListPage(ctk.CTkFrame):
                                               command=self.update_list)
         self.owner_filter.grid(row=0, column=3, padx=5)
 
-        self.equipment_listbox = ctk.CTkTextbox(self, width=600, height=400)
-        self.equipment_listbox.grid(row=1, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        table_frame = ctk.CTkFrame(self)
+        table_frame.grid(row=1, column=0, columnspan=2, padx=10, pady=10, sticky="nsew")
+        table_frame.grid_columnconfigure(0, weight=1)
+        table_frame.grid_rowconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(table_frame, columns=[key for key, _, _ in COLUMNS], show="headings", selectmode="extended")
+        for key, heading, width in COLUMNS:
+            self.tree.heading(key, text=heading, command=lambda k=key: self.sort_by_column(k))
+            self.tree.column(key, width=width, anchor="w")
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.tree.bind("<Double-1>", lambda event: self.view_selected())
+
+        self.scrollbar = ctk.CTkScrollbar(table_frame, command=self.tree.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.tree.configure(yscrollcommand=self.on_tree_scroll)
 
         self.button_frame = ctk.CTkFrame(self)
         self.button_frame.grid(row=2, column=0, columnspan=2, pady=10)
@@ -48,8 +77,20 @@ class EquipmentListPage(ctk.CTkFrame):
         self.write_off_button = ctk.CTkButton(self.button_frame, text="Списати", command=self.write_off_selected)
         self.write_off_button.grid(row=0, column=2, padx=5)
 
+        self.move_button = ctk.CTkButton(self.button_frame, text="Перемістити", command=self.move_selected)
+        self.move_button.grid(row=0, column=3, padx=5)
+
+        self.stock_button = ctk.CTkButton(self.button_frame, text="На склад", command=self.move_selected_to_stock)
+        self.stock_button.grid(row=0, column=4, padx=5)
+
+        self.owner_button = ctk.CTkButton(self.button_frame, text="Змінити власника", command=self.reassign_selected)
+        self.owner_button.grid(row=0, column=5, padx=5)
+
+        self.export_button = ctk.CTkButton(self.button_frame, text="Експорт", command=self.export_filtered)
+        self.export_button.grid(row=0, column=6, padx=5)
+
         self.back_button = ctk.CTkButton(self.button_frame, text="Назад", command=lambda: self.controller.switch_page("MainMenu"))
-        self.back_button.grid(row=0, column=3, padx=5)
+        self.back_button.grid(row=0, column=7, padx=5)
 
         self.update_list()
 
@@ -64,23 +105,84 @@ class EquipmentListPage(ctk.CTkFrame):
         self.owner_filter_var.set("---")
         self.update_list()
 
+    def sort_by_column(self, key):
+        if self.sort_by == key:
+            self.descending = not self.descending
+        else:
+            self.sort_by = key
+            self.descending = False
+        for column, heading, _ in COLUMNS:
+            arrow = (" ▼" if self.descending else " ▲") if column == self.sort_by else ""
+            self.tree.heading(column, text=heading + arrow)
+        self.update_list()
+
     def update_list(self, *args):
         try:
-            self.equipment_listbox.delete("0.0", "end")
-            equipment = self.db.filter_equipment(room=self.current_room or self.room_filter_var.get(),
-                                                 owner=self.owner_filter_var.get())
-            for item in equipment:
-                text = f"ID: {item['id']} | {item['inventory_number']} | {item['type']} | {item['name']} | {item['room']} | {item['owner']}\n"
-                self.equipment_listbox.insert("end", text)
+            self.tree.delete(*self.tree.get_children())
+            self.last_key = None
+            self.has_more = True
+            self.load_next_page()
             logging.debug("Equipment list updated")
         except Exception as e:
             logging.error(f"Error updating equipment list: {e}")
 
+    def load_next_page(self):
+        if not self.has_more:
+            return
+        # Сторінки довантажуються за ключем останнього рядка, без OFFSET
+        rows = self.db.page_equipment(room=self.current_room or self.room_filter_var.get(),
+                                      owner=self.owner_filter_var.get(),
+                                      sort_by=self.sort_by, descending=self.descending,
+                                      after=self.last_key, limit=PAGE_SIZE)
+        for item in rows:
+            self.tree.insert("", "end", iid=str(item['id']), values=[item[key] or '' for key, _, _ in COLUMNS])
+        self.has_more = len(rows) == PAGE_SIZE
+        if rows:
+            self.last_key = (rows[-1][self.sort_by], rows[-1]['id'])
+
+    def on_tree_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.has_more and float(last) >= 0.9:
+            self.after_idle(self.load_next_page)
+
+    def selected_id(self):
+        selection = self.tree.selection()
+        if not selection:
+            raise ValueError("Nothing selected")
+        return int(selection[0])
+
+    def selected_ids(self):
+        ids = [int(iid) for iid in self.tree.selection()]
+        if not ids:
+            messagebox.showerror("Помилка", "Оберіть обладнання зі списку")
+        return ids
+
+    def ask_choice(self, title, label, values):
+        if not values:
+            messagebox.showerror("Помилка", "Немає значень для вибору")
+            return None
+        dialog = ctk.CTkToplevel(self)
+        dialog.title(title)
+        dialog.geometry("360x150")
+        dialog.transient(self.winfo_toplevel())
+        ctk.CTkLabel(dialog, text=label).pack(pady=(15, 5))
+        choice_var = ctk.StringVar(value=values[0])
+        ctk.CTkOptionMenu(dialog, variable=choice_var, values=values).pack(pady=5)
+        result = {}
+
+        def confirm():
+            result['value'] = choice_var.get()
+            dialog.destroy()
+
+        ctk.CTkButton(dialog, text="OK", command=confirm).pack(pady=10)
+        dialog.grab_set()
+        self.wait_window(dialog)
+        return result.get('value')
+
     def view_selected(self):
         try:
-            selected = self.equipment_listbox.get("sel.first", "sel.last")
-            equip_id = int(selected.split(" | ")[0].split(": ")[1])
-            self.controller.frames["EquipmentCardPage"].load_equipment(equip_id)
+            equip_id = self.selected_id()
+            self.controller.get_page("EquipmentCardPage").load_equipment(equip_id)
             self.controller.switch_page("EquipmentCardPage")
         except Exception as e:
             logging.error(f"Error in view_selected: {e}")
@@ -88,24 +190,62 @@ class EquipmentListPage(ctk.CTkFrame):
 
     def edit_selected(self):
         try:
-            selected = self.equipment_listbox.get("sel.first", "sel.last")
-            equip_id = int(selected.split(" | ")[0].split(": ")[1])
-            self.controller.frames["AddPage"].load_equipment(equip_id)
+            equip_id = self.selected_id()
+            self.controller.get_page("AddPage").load_equipment(equip_id)
             self.controller.switch_page("AddPage")
         except Exception as e:
             logging.error(f"Error in edit_selected: {e}")
             messagebox.showerror("Помилка", "Оберіть обладнання зі списку")
 
     def write_off_selected(self):
+        ids = self.selected_ids()
+        if not ids or not messagebox.askyesno("Списання", f"Списати обране обладнання ({len(ids)} од.)?"):
+            return
         try:
-            selected = self.equipment_listbox.get("sel.first", "sel.last")
-            equip_id = int(selected.split(" | ")[0].split(": ")[1])
-            self.db.write_off_equipment(equip_id)
-            self.update_list()
-            messagebox.showinfo("Успіх", "Обладнання списано")
+            count = self.db.write_off_many(ids)
+            messagebox.showinfo("Успіх", f"Списано одиниць: {count}")
         except Exception as e:
             logging.error(f"Error in write_off_selected: {e}")
-            messagebox.showerror("Помилка", "Оберіть обладнання зі списку")
+            messagebox.showerror("Помилка", str(e))
+
+    def move_selected(self):
+        ids = self.selected_ids()
+        if not ids:
+            return
+        room = self.ask_choice("Переміщення", f"Кабінет для {len(ids)} од.:", self.db.get_all_rooms())
+        if room:
+            self.move_to_room(ids, room)
+
+    def move_selected_to_stock(self):
+        ids = self.selected_ids()
+        if ids:
+            self.move_to_room(ids, STOCK_ROOM)
+
+    def move_to_room(self, ids, room):
+        try:
+            count = self.db.move_many(ids, room)
+            messagebox.showinfo("Успіх", f"Переміщено до {room}: {count} од.")
+        except ValueError as e:
+            logging.error(f"ValueError in move_to_room: {e}")
+            messagebox.showerror("Помилка", str(e))
+
+    def reassign_selected(self):
+        ids = self.selected_ids()
+        if not ids:
+            return
+        owner = self.ask_choice("Зміна власника", f"Власник для {len(ids)} од.:", self.db.get_all_owners())
+        if not owner:
+            return
+        try:
+            count = self.db.set_owner_many(ids, owner)
+            messagebox.showinfo("Успіх", f"Змінено власника: {count} од.")
+        except Exception as e:
+            logging.error(f"Error in reassign_selected: {e}")
+            messagebox.showerror("Помилка", str(e))
+
+    def export_filtered(self):
+        self.controller.export_equipment(room=self.current_room or self.room_filter_var.get(),
+                                         owner=self.owner_filter_var.get())
 
     def refresh(self):
         try:
@@ -115,4 +255,4 @@ class EquipmentListPage(ctk.CTkFrame):
             logging.debug("EquipmentListPage refreshed")
         except Exception as e:
             logging.error(f"Error refreshing EquipmentListPage: {e}")
-            self.update_list()
\ No newline at end of file
+            self.update_list()
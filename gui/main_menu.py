@@ -19,6 +19,7 @@ class MainMenu(ctk.CTkFrame):
             ("Склад", "EquipmentListPage"),
             ("Списані", "WrittenOffPage"),
             ("Додавання", "AddPage"),
+            ("Звіти", "ReportsPage"),
             ("Налаштування теми", "SettingsPage")  # Нова кнопка
         ]
         for text, page_name in buttons:
@@ -28,10 +29,10 @@ class MainMenu(ctk.CTkFrame):
 
     def open_page(self, page_name, btn_text):
         if page_name == "EquipmentListPage" and btn_text == "Склад":
-            self.controller.frames["EquipmentListPage"].set_filter(room="Склад")
+            self.controller.get_page("EquipmentListPage").set_filter(room="Склад")
         else:
             if page_name == "EquipmentListPage":
-                self.controller.frames["EquipmentListPage"].clear_filter()
+                self.controller.get_page("EquipmentListPage").clear_filter()
         self.controller.switch_page(page_name)
         logging.debug(f"Opening page from MainMenu: {page_name}")
 
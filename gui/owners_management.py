@@ -4,6 +4,8 @@ import tkinter as tk
 from tkinter import messagebox
 
 class OwnersManagementPage(ctk.CTkFrame):
+    watches = {'owners'}
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
@@ -86,7 +88,6 @@ class OwnersManagementPage(ctk.CTkFrame):
         if self.db.add_owner(full_name, position, pc_ip, pc_name, phone, email):
             self.status.configure(text="Власника додано")
             self.local_refresh()
-            self.controller.refresh_pages()
         else:
             self.status.configure(text="Власник з таким ПІБ вже існує")
         logging.debug(f"Owner addition attempted: {full_name}")
@@ -103,7 +104,6 @@ class OwnersManagementPage(ctk.CTkFrame):
             self.db.update_owner(old_full_name, new_full_name, position, pc_ip, pc_name, phone, email)
             self.status.configure(text="Власника оновлено")
             self.local_refresh()
-            self.controller.refresh_pages()
         elif old_full_name == new_full_name:
             self.status.configure(text="Немає змін у ПІБ")
         else:
@@ -116,7 +116,6 @@ class OwnersManagementPage(ctk.CTkFrame):
             self.db.delete_owner(selected)
             self.status.configure(text="Власника видалено")
             self.local_refresh()
-            self.controller.refresh_pages()
         else:
             self.status.configure(text="Виберіть власника")
         logging.debug(f"Owner deletion attempted: {selected}")
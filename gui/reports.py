@@ -0,0 +1,99 @@
+import logging
+import customtkinter as ctk
+from tkinter import ttk
+from database.reports import DIMENSION_LABELS, InventoryReports
+
+REPORTS = {
+    "За типом": ('counts', 'type'),
+    "За кабінетом": ('counts', 'room'),
+    "За власником": ('counts', 'owner'),
+    "Кабінет × тип": ('crosstab', ('room', 'type')),
+    "Власник × тип": ('crosstab', ('owner', 'type'))
+}
+STATUSES = {"В експлуатації": False, "Списані": True, "Усі": None}
+
+class ReportsPage(ctk.CTkFrame):
+    watches = {'equipment', 'rooms', 'owners', 'types'}
+
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+        self.db = controller.db
+        self.reports = InventoryReports(self.db)
+        logging.debug("Initializing ReportsPage")
+
+        nav_frame = ctk.CTkFrame(self)
+        nav_frame.pack(fill="x", pady=10)
+
+        btn_back = ctk.CTkButton(nav_frame, text="← Назад", command=lambda: controller.switch_page("MainMenu"))
+        btn_back.pack(side="left", padx=20)
+
+        btn_home = ctk.CTkButton(nav_frame, text="Головна", command=lambda: controller.switch_page("MainMenu"))
+        btn_home.pack(side="left", padx=20)
+
+        lbl = ctk.CTkLabel(self, text="Звіти", font=ctk.CTkFont(size=18, weight="bold"))
+        lbl.pack(pady=10)
+
+        self.summary = ctk.CTkLabel(self, text="", justify="left")
+        self.summary.pack(pady=5, padx=20, anchor="w")
+
+        controls = ctk.CTkFrame(self)
+        controls.pack(pady=5, padx=20, fill="x")
+        ctk.CTkLabel(controls, text="Звіт:").pack(side="left", padx=5)
+        self.report_var = ctk.StringVar(value=next(iter(REPORTS)))
+        ctk.CTkOptionMenu(controls, values=list(REPORTS), variable=self.report_var,
+                          command=lambda _: self.show_report()).pack(side="left", padx=5)
+        ctk.CTkLabel(controls, text="Стан:").pack(side="left", padx=5)
+        self.status_var = ctk.StringVar(value=next(iter(STATUSES)))
+        ctk.CTkOptionMenu(controls, values=list(STATUSES), variable=self.status_var,
+                          command=lambda _: self.show_report()).pack(side="left", padx=5)
+
+        table_frame = ctk.CTkFrame(self)
+        table_frame.pack(pady=10, padx=20, fill="both", expand=True)
+        table_frame.grid_columnconfigure(0, weight=1)
+        table_frame.grid_rowconfigure(0, weight=1)
+        self.tree = ttk.Treeview(table_frame, show="headings")
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        y_scrollbar = ctk.CTkScrollbar(table_frame, command=self.tree.yview)
+        y_scrollbar.grid(row=0, column=1, sticky="ns")
+        x_scrollbar = ctk.CTkScrollbar(table_frame, orientation="horizontal", command=self.tree.xview)
+        x_scrollbar.grid(row=1, column=0, sticky="ew")
+        self.tree.configure(yscrollcommand=y_scrollbar.set, xscrollcommand=x_scrollbar.set)
+        self.refresh()
+
+    def set_columns(self, headings, first_width=220, width=90):
+        columns = [f"c{i}" for i in range(len(headings))]
+        self.tree.delete(*self.tree.get_children())
+        self.tree.configure(columns=columns)
+        for i, (column, heading) in enumerate(zip(columns, headings)):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=first_width if i == 0 else width, anchor="w" if i == 0 else "center",
+                             stretch=i == 0)
+
+    def show_report(self):
+        # Рахує база: у Python потрапляють лише готові групи, а не рядки обладнання
+        kind, dimension = REPORTS[self.report_var.get()]
+        show_written_off = STATUSES[self.status_var.get()]
+        if kind == 'counts':
+            rows = self.reports.counts_by(dimension, show_written_off)
+            self.set_columns([DIMENSION_LABELS[dimension], "Кількість"])
+            for label, count in rows:
+                self.tree.insert("", "end", values=[label or "—", count])
+        else:
+            table = self.reports.crosstab(*dimension, show_written_off=show_written_off)
+            row_dimension, column_dimension = dimension
+            self.set_columns([f"{DIMENSION_LABELS[row_dimension]} \\ {DIMENSION_LABELS[column_dimension]}"]
+                             + [label or "—" for label in table['columns']] + ["Разом"])
+            for label, counts, total in table['rows']:
+                self.tree.insert("", "end", values=[label or "—"] + counts + [total])
+            self.tree.insert("", "end", values=["Разом"] + table['column_totals'] + [table['total']])
+        logging.debug(f"Report shown: {self.report_var.get()}")
+
+    def refresh(self):
+        summary = self.reports.summary()
+        self.summary.configure(text=f"В експлуатації: {summary['active']}   Списано: {summary['written_off']}   "
+                                    f"Всього: {summary['total']}\n"
+                                    f"Типів: {summary['types']}   Кабінетів: {summary['rooms']} "
+                                    f"(заповнених: {summary['full_rooms']})   Власників: {summary['owners']}")
+        self.show_report()
+        logging.debug("ReportsPage refreshed")
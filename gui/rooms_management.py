@@ -1,9 +1,19 @@
 import logging
 import customtkinter as ctk
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, ttk
+
+UTILISATION_COLUMNS = [
+    ("room", "Кабінет", 220),
+    ("active", "Зайнято", 90),
+    ("max_seats", "Місць", 90),
+    ("free", "Вільно", 90),
+    ("load", "Завантаженість", 120)
+]
 
 class RoomsManagementPage(ctk.CTkFrame):
+    watches = {'rooms', 'equipment'}
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
@@ -55,6 +65,20 @@ class RoomsManagementPage(ctk.CTkFrame):
         self.status = ctk.CTkLabel(self, text="")
         self.status.pack(pady=10)
 
+        table_frame = ctk.CTkFrame(self)
+        table_frame.pack(pady=10, padx=20, fill="both", expand=True)
+        self.tree = ttk.Treeview(table_frame, columns=[key for key, _, _ in UTILISATION_COLUMNS], show="headings")
+        for key, heading, width in UTILISATION_COLUMNS:
+            self.tree.heading(key, text=heading)
+            self.tree.column(key, width=width, anchor="w" if key == "room" else "center", stretch=key == "room")
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar = ctk.CTkScrollbar(table_frame, command=self.tree.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.tag_configure("full", foreground="red")
+        self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
+        self.load_utilisation()
+
     def set_selected(self, value):
         self.name_entry.delete(0, tk.END)
         self.seats_entry.delete(0, tk.END)
@@ -74,7 +98,6 @@ class RoomsManagementPage(ctk.CTkFrame):
                 if self.db.add_room(name, max_seats):
                     self.status.configure(text="Кабінет додано")
                     self.local_refresh()
-                    self.controller.refresh_pages()
                 else:
                     self.status.configure(text="Кабінет вже існує")
             else:
@@ -89,24 +112,28 @@ class RoomsManagementPage(ctk.CTkFrame):
         seats = self.seats_entry.get().strip()
         try:
             max_seats = int(seats) if seats else 0
-            if max_seats < 0:
-                self.status.configure(text="Кількість місць не може бути від'ємною")
-                return
+        except ValueError:
+            self.status.configure(text="Кількість місць має бути числом")
+            logging.error("Invalid max_seats value in RoomsManagementPage.update_item")
+            return
+        if max_seats < 0:
+            self.status.configure(text="Кількість місць не може бути від'ємною")
+            return
+        try:
             if old_name and new_name:
                 self.db.update_room(old_name, new_name, max_seats)
                 self.status.configure(text="Кабінет оновлено")
                 self.local_refresh()
-                self.controller.refresh_pages()
             elif old_name == new_name and seats:
                 self.db.update_room(old_name, new_name, max_seats)
                 self.status.configure(text="Кількість місць оновлено")
                 self.local_refresh()
-                self.controller.refresh_pages()
             else:
                 self.status.configure(text="Виберіть кабінет та введіть нове ім'я")
-        except ValueError:
-            self.status.configure(text="Кількість місць має бути числом")
-            logging.error("Invalid max_seats value in RoomsManagementPage.update_item")
+        except ValueError as e:
+            # Злиття з кабінетом, у якому не вистачить місць
+            self.status.configure(text=str(e))
+            logging.error(f"ValueError in RoomsManagementPage.update_item: {e}")
 
     def delete_item(self):
         selected = self.combo.get()
@@ -114,15 +141,34 @@ class RoomsManagementPage(ctk.CTkFrame):
             self.db.delete_room(selected)
             self.status.configure(text="Кабінет видалено")
             self.local_refresh()
-            self.controller.refresh_pages()
         else:
             self.status.configure(text="Виберіть кабінет")
         logging.debug(f"Room deletion attempted: {selected}")
 
+    def load_utilisation(self):
+        # Лічильники зайнятих місць підтримуються тригерами бази, тож таблиця будується одним запитом
+        self.tree.delete(*self.tree.get_children())
+        for row in self.db.get_room_utilisation():
+            max_seats, active = row['max_seats'], row['active_count']
+            if max_seats > 0:
+                values = [row['room_name'], active, max_seats, max_seats - active, f"{active * 100 // max_seats}%"]
+                tags = ("full",) if active >= max_seats else ()
+            else:
+                values = [row['room_name'], active, "—", "—", "—"]
+                tags = ()
+            self.tree.insert("", "end", iid=row['room_name'], values=values, tags=tags)
+
+    def on_tree_select(self, event=None):
+        selection = self.tree.selection()
+        if selection:
+            self.combo.set(selection[0])
+            self.set_selected(selection[0])
+
     def local_refresh(self):
         self.combo.configure(values=self.db.get_all_rooms())
         self.name_entry.delete(0, tk.END)
         self.seats_entry.delete(0, tk.END)
+        self.load_utilisation()
         logging.debug("RoomsManagementPage refreshed")
 
     def refresh(self):
@@ -1,7 +1,12 @@
 import logging
 import customtkinter as ctk
+from database.database import SEARCH_LIMIT
+from gui.search_scheduler import SearchScheduler
+from gui.virtual_list import VirtualList, ListRowSource
 
 class SearchPage(ctk.CTkFrame):
+    watches = {'equipment'}
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
@@ -25,39 +30,39 @@ class SearchPage(ctk.CTkFrame):
         self.search_entry.pack(pady=5, padx=20, fill="x")
         self.search_var.trace_add("write", self.on_text_change)
 
+        btn_export = ctk.CTkButton(self, text="Експорт результатів", command=self.export_results)
+        btn_export.pack(pady=5)
+
         self.results_frame = ctk.CTkFrame(self)
         self.results_frame.pack(pady=10, fill="both", expand=True)
 
-        self.results_list = ctk.CTkScrollableFrame(self.results_frame)
+        self.results_list = VirtualList(
+            self.results_frame,
+            format_row=lambda r: f"{r['inventory_number']} — {r['name']} ({r['type']})\n{r['room']} | {r['owner']}",
+            on_select=lambda r: self.open_equipment_card(r['id']))
         self.results_list.pack(fill="both", expand=True)
 
         self.current_results = []
+        self.scheduler = SearchScheduler(self, self.db, self.update_results, limit=SEARCH_LIMIT)
 
     def on_text_change(self, *args):
         text = self.search_var.get().strip()
-        self.update_results(text)
-
-    def update_results(self, text):
-        for widget in self.results_list.winfo_children():
-            widget.destroy()
-        if text == "":
-            return
-        rows = self.db.search_equipment(text)
+        self.scheduler.schedule(text)
+
+    def update_results(self, text, rows):
         self.current_results = rows
-        for r in rows:
-            btn = ctk.CTkButton(self.results_list,
-                                text=f"{r['inventory_number']} — {r['name']} ({r['type']})\n{r['room']} | {r['owner']}",
-                                anchor="w",
-                                height=60,
-                                command=lambda rid=r['id']: self.open_equipment_card(rid))
-            btn.pack(pady=5, padx=10, fill="x")
+        self.results_list.set_source(ListRowSource(rows))
 
     def open_equipment_card(self, equip_id):
-        eq_page = self.controller.frames["EquipmentCardPage"]
+        eq_page = self.controller.get_page("EquipmentCardPage")
         eq_page.load_equipment(equip_id)
         self.controller.switch_page("EquipmentCardPage")
         logging.debug(f"Opening EquipmentCardPage for equipment ID: {equip_id}")
 
+    def export_results(self):
+        # Експортуються всі збіги, а не лише показані SEARCH_LIMIT
+        self.controller.export_equipment(text=self.search_var.get().strip())
+
     def refresh(self):
         self.on_text_change()
         logging.debug("SearchPage refreshed")
\ No newline at end of file
@@ -0,0 +1,75 @@
+import logging
+import queue
+import threading
+import time
+
+
+class SearchScheduler:
+    def __init__(self, widget, db, on_results, delay_ms=250, limit=None):
+        self.widget = widget
+        self.db = db
+        self.on_results = on_results
+        self.delay_ms = delay_ms
+        self.limit = limit
+        self.last_timings = {'query_ms': 0.0, 'render_ms': 0.0, 'rows': 0}
+        self._generation = 0
+        self._pending = None
+        self._requests = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="SearchWorker", daemon=True)
+        self._worker.start()
+
+    def schedule(self, text):
+        self._generation += 1
+        if self._pending is not None:
+            self.widget.after_cancel(self._pending)
+            self._pending = None
+        if text == "":
+            self._render(self._generation, text, [], 0.0)
+            return
+        generation = self._generation
+        self._pending = self.widget.after(self.delay_ms, self._submit, generation, text)
+
+    def _submit(self, generation, text):
+        self._pending = None
+        self._requests.put((generation, text))
+
+    def _run(self):
+        # Потік пошуку отримує власне з'єднання-читач із пулу Database
+        while True:
+            request = self._requests.get()
+            # Якщо в черзі вже є новіші запити, виконується лише останній
+            while request is not None:
+                try:
+                    request = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+            if request is None:
+                break
+            generation, text = request
+            if generation != self._generation:
+                continue
+            start = time.perf_counter()
+            try:
+                rows = self.db.search_equipment(text, limit=self.limit)
+            except Exception as e:
+                logging.error(f"Error in search worker: {e}")
+                continue
+            query_ms = (time.perf_counter() - start) * 1000
+            if generation == self._generation:
+                self.widget.after(0, self._render, generation, text, rows, query_ms)
+
+    def _render(self, generation, text, rows, query_ms):
+        if generation != self._generation:
+            logging.debug(f"Dropped stale search results for '{text}'")
+            return
+        start = time.perf_counter()
+        self.on_results(text, rows)
+        render_ms = (time.perf_counter() - start) * 1000
+        self.last_timings = {'query_ms': query_ms, 'render_ms': render_ms, 'rows': len(rows)}
+        logging.debug("Search '%s': %d rows, query %.1f ms, render %.1f ms", text, len(rows), query_ms, render_ms)
+
+    def close(self):
+        if self._pending is not None:
+            self.widget.after_cancel(self._pending)
+            self._pending = None
+        self._requests.put(None)
@@ -4,6 +4,8 @@ from tkinter import messagebox
 import os
 
 class SettingsPage(ctk.CTkFrame):
+    watches = {'settings'}
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
@@ -4,6 +4,8 @@ import tkinter as tk
 from tkinter import messagebox, filedialog
 
 class TypesManagementPage(ctk.CTkFrame):
+    watches = {'types'}
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
@@ -96,7 +98,6 @@ class TypesManagementPage(ctk.CTkFrame):
             if self.db.add_type(new_type):
                 self.status.configure(text="Тип додано")
                 self.local_refresh()
-                self.controller.refresh_pages()
             else:
                 self.status.configure(text="Тип вже існує")
         else:
@@ -110,7 +111,6 @@ class TypesManagementPage(ctk.CTkFrame):
             self.db.update_type(old_type, new_type)
             self.status.configure(text="Тип оновлено")
             self.local_refresh()
-            self.controller.refresh_pages()
         elif old_type == new_type:
             self.status.configure(text="Немає змін")
         else:
@@ -123,7 +123,6 @@ class TypesManagementPage(ctk.CTkFrame):
             self.db.delete_type(selected)
             self.status.configure(text="Тип видалено")
             self.local_refresh()
-            self.controller.refresh_pages()
         else:
             self.status.configure(text="Виберіть тип")
         logging.debug(f"Type deletion attempted: {selected}")
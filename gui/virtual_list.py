@@ -0,0 +1,125 @@
+import logging
+from collections import OrderedDict
+import customtkinter as ctk
+
+
+class ListRowSource:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def get_rows(self, start, stop):
+        return self.rows[start:stop]
+
+
+class LazyRowSource:
+    def __init__(self, ids, fetch_rows, page_size=100, max_pages=20):
+        self.ids = ids
+        self.fetch_rows = fetch_rows
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self._pages = OrderedDict()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _page(self, index):
+        page = self._pages.get(index)
+        if page is None:
+            ids = self.ids[index * self.page_size:(index + 1) * self.page_size]
+            by_id = {row['id']: row for row in self.fetch_rows(ids)}
+            page = [by_id[i] for i in ids if i in by_id]
+            self._pages[index] = page
+            if len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(index)
+        return page
+
+    def get_rows(self, start, stop):
+        rows = []
+        for index in range(start // self.page_size, (max(stop, start + 1) - 1) // self.page_size + 1):
+            page_start = index * self.page_size
+            page = self._page(index)
+            rows.extend(page[max(start - page_start, 0):max(stop - page_start, 0)])
+        return rows
+
+
+class VirtualList(ctk.CTkFrame):
+    def __init__(self, parent, format_row, on_select, row_height=70, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.format_row = format_row
+        self.on_select = on_select
+        self.row_height = row_height
+        self.source = ListRowSource([])
+        self.first = 0
+        self.buttons = []
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self.on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+
+        self.body.bind("<Configure>", self.on_resize)
+        self.bind_scroll(self.body)
+
+    def bind_scroll(self, widget):
+        widget.bind("<MouseWheel>", self.on_mousewheel)
+        widget.bind("<Button-4>", lambda event: self.scroll_by(-1))
+        widget.bind("<Button-5>", lambda event: self.scroll_by(1))
+
+    def set_source(self, source):
+        self.source = source
+        self.first = 0
+        self.render()
+
+    def visible_count(self):
+        return max(1, self.body.winfo_height() // self.row_height + 1)
+
+    def on_resize(self, event=None):
+        needed = self.visible_count()
+        # Кнопки створюються один раз під видиму висоту і далі лише перевикористовуються
+        while len(self.buttons) < needed:
+            btn = ctk.CTkButton(self.body, text="", anchor="w", height=self.row_height - 10)
+            self.bind_scroll(btn)
+            self.buttons.append(btn)
+        self.render()
+
+    def render(self):
+        total = len(self.source)
+        visible = len(self.buttons)
+        self.first = max(0, min(self.first, max(total - visible + 1, 0)))
+        rows = self.source.get_rows(self.first, self.first + visible) if total else []
+        for i, btn in enumerate(self.buttons):
+            if i < len(rows):
+                row = rows[i]
+                btn.configure(text=self.format_row(row), command=lambda r=row: self.on_select(r))
+                btn.place(relx=0.01, y=i * self.row_height + 5, relwidth=0.98)
+            else:
+                btn.place_forget()
+        if total:
+            self.scrollbar.set(self.first / total, min((self.first + visible) / total, 1.0))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_by(self, rows):
+        self.first += rows
+        self.render()
+
+    def on_mousewheel(self, event):
+        self.scroll_by(-1 if event.delta > 0 else 1)
+
+    def on_scrollbar(self, *args):
+        try:
+            if args[0] == "moveto":
+                self.first = int(float(args[1]) * len(self.source))
+                self.render()
+            elif args[0] == "scroll":
+                step = int(args[1])
+                self.scroll_by(step * (len(self.buttons) if args[2] == "pages" else 1))
+        except (IndexError, ValueError) as e:
+            logging.error(f"Error in VirtualList scroll: {e}")
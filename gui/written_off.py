@@ -1,7 +1,10 @@
 import logging
 import customtkinter as ctk
+from gui.virtual_list import VirtualList, LazyRowSource
 
 class WrittenOffPage(ctk.CTkFrame):
+    watches = {'equipment'}
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
@@ -23,24 +26,20 @@ class WrittenOffPage(ctk.CTkFrame):
         self.results_frame = ctk.CTkFrame(self)
         self.results_frame.pack(pady=10, fill="both", expand=True)
 
-        self.results_list = ctk.CTkScrollableFrame(self.results_frame)
+        self.results_list = VirtualList(
+            self.results_frame,
+            format_row=lambda r: f"{r['inventory_number']} — {r['name']} ({r['type']})\n{r['room']} | {r['owner']}",
+            on_select=lambda r: self.open_equipment_card(r['id']))
         self.results_list.pack(fill="both", expand=True)
+        self.refresh()
 
     def refresh(self):
-        for widget in self.results_list.winfo_children():
-            widget.destroy()
-        rows = self.db.get_all_equipment(show_written_off=True)
-        for r in rows:
-            btn = ctk.CTkButton(self.results_list,
-                                text=f"{r['inventory_number']} — {r['name']} ({r['type']})\n{r['room']} | {r['owner']}",
-                                anchor="w",
-                                height=60,
-                                command=lambda rid=r['id']: self.open_equipment_card(rid))
-            btn.pack(pady=5, padx=10, fill="x")
+        ids = self.db.get_equipment_ids(show_written_off=True)
+        self.results_list.set_source(LazyRowSource(ids, self.db.get_equipment_by_ids))
         logging.debug("WrittenOffPage refreshed")
 
     def open_equipment_card(self, equip_id):
-        eq_page = self.controller.frames["EquipmentCardPage"]
+        eq_page = self.controller.get_page("EquipmentCardPage")
         eq_page.load_equipment(equip_id)
         self.controller.switch_page("EquipmentCardPage")
         logging.debug(f"Opening EquipmentCardPage for equipment ID: {equip_id}")
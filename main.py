@@ -1,12 +1,51 @@
+import argparse
+import importlib
 import logging
+import sys
+import time
 from utils.logger import setup_logging
-from gui.app import App
+
+STARTUP_MODULES = ["customtkinter", "database.database"]
+
+def print_startup_profile(started, timings, app):
+    print("Startup profile:")
+    for step, ms in timings.items():
+        print(f"  {step:<28} {ms:8.1f} ms")
+    for step, ms in app.db.startup_timings.items():
+        print(f"    Database {step:<19} {ms:8.1f} ms")
+    for page_name, page in app.page_timings.items():
+        print(f"    {page_name:<28} import {page['import_ms']:.1f} ms, build {page['build_ms']:.1f} ms")
+    print(f"  {'window shown':<28} {(time.perf_counter() - started) * 1000:8.1f} ms")
+    print(f"  pandas loaded: {'pandas' in sys.modules}")
 
 def main():
+    parser = argparse.ArgumentParser(description="Inventory Manager")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print import and initialisation timings once the window is shown, then exit")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    timings = {}
     setup_logging()
+    timings['setup_logging'] = (time.perf_counter() - started) * 1000
     logging.debug("Starting application")
-    app = App()
+    for name in STARTUP_MODULES:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        timings[f"import {name}"] = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    import gui.app
+    timings['import gui.app'] = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    app = gui.app.App()
+    timings['App.__init__'] = (time.perf_counter() - start) * 1000
+    if args.profile_startup:
+        def report():
+            print_startup_profile(started, timings, app)
+            app.on_close()
+        # Звіт друкується, коли вікно вже відмальоване і цикл подій вільний
+        app.after_idle(lambda: app.after(0, report))
     app.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,29 @@
+import csv
+import io
+import unittest
+from database.database import Database
+from database.exporter import export_csv_stream
+
+
+class ExportTest(unittest.TestCase):
+    def setUp(self):
+        self.db = Database(':memory:')
+        with self.db.transaction() as conn:
+            conn.executemany("INSERT INTO equipment (inventory_number, name, written_off) VALUES (?, ?, ?)",
+                             [("INV1", "Монітор", 0), ("INV2", "Принтер", 1)])
+
+    def tearDown(self):
+        self.db.close()
+
+    def export(self, show_written_off):
+        stream = io.StringIO()
+        export_csv_stream(self.db, stream, show_written_off=show_written_off)
+        return list(csv.DictReader(io.StringIO(stream.getvalue())))
+
+    def test_status_column_tells_written_off_rows_apart(self):
+        self.assertEqual([(row['Інвентарний номер'], row['Статус']) for row in self.export(True)],
+                         [("INV1", "В експлуатації"), ("INV2", "Списано")])
+        self.assertEqual([row['Інвентарний номер'] for row in self.export(False)], ["INV1"])
+
+if __name__ == "__main__":
+    unittest.main()
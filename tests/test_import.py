@@ -0,0 +1,36 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from database.database import Database
+
+
+class ImportFromExcelTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "import.xlsx")
+        pd.DataFrame({
+            'Інвентарний номер': ['INV1', 'INV2', 'INV3'],
+            'Тип обладнання': ['mon', 'Монітор', 'Проектор'],
+            'Назва': ['Dell', 'HP', 'Epson'],
+        }).to_excel(self.path, index=False)
+        self.db = Database(':memory:')
+        # Основний тип без синонімів має розпізнаватися так само, як у пакетному імпорті
+        self.db.add_type('Проектор')
+
+    def tearDown(self):
+        self.db.close()
+        self.tmp.cleanup()
+
+    def imported_types(self):
+        return {row['inventory_number']: row['type'] for row in self.db.get_equipment_by_ids(self.db.get_equipment_ids())}
+
+    def test_row_by_row_import_matches_bulk_types(self):
+        expected = {'INV1': 'Монітор', 'INV2': 'Монітор', 'INV3': 'Проектор'}
+        self.db.import_from_excel(self.path)
+        self.assertEqual(self.imported_types(), expected)
+        self.db.import_from_excel(self.path, bulk=True)
+        self.assertEqual(self.imported_types(), expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from database.database import Database
+
+
+class PageEquipmentTest(unittest.TestCase):
+    def setUp(self):
+        self.db = Database(':memory:')
+        for room in ('305', '101', '210'):
+            self.db.add_room(room)
+        for owner in ('Петренко', 'Іваненко'):
+            self.db.add_owner(owner)
+        rooms = ['305', '', '101', '210', '101']
+        owners = ['Петренко', 'Іваненко', '']
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO equipment (inventory_number, name, room_id, owner_id) "
+                "VALUES (?, ?, (SELECT id FROM rooms WHERE room_name=?), (SELECT id FROM owners WHERE full_name=?))",
+                [(f"INV{i:03d}", f"Монітор {i}", rooms[i % len(rooms)], owners[i % len(owners)]) for i in range(40)])
+
+    def tearDown(self):
+        self.db.close()
+
+    def walk(self, sort_by, descending, room=None, limit=7):
+        ids = []
+        after = None
+        while True:
+            rows = self.db.page_equipment(room=room, sort_by=sort_by, descending=descending, after=after, limit=limit)
+            ids.extend(row['id'] for row in rows)
+            if len(rows) < limit:
+                return ids
+            after = (rows[-1][sort_by], rows[-1]['id'])
+
+    def expected(self, sort_by, descending, room=None):
+        direction = 'DESC' if descending else 'ASC'
+        query = "SELECT id FROM equipment_v WHERE written_off=0 "
+        params = []
+        if room:
+            query += "AND room=? "
+            params.append(room)
+        rows = self.db.conn.execute(query + f"ORDER BY {sort_by} {direction}, id {direction}", params)
+        return [row['id'] for row in rows]
+
+    def test_reference_sort_matches_name_order(self):
+        # Записи без кабінету чи власника мають порожню назву і йдуть першими
+        for sort_by in ('room', 'owner', 'type'):
+            for descending in (False, True):
+                with self.subTest(sort_by=sort_by, descending=descending):
+                    self.assertEqual(self.walk(sort_by, descending), self.expected(sort_by, descending))
+
+    def test_reference_sort_with_room_filter(self):
+        for descending in (False, True):
+            self.assertEqual(self.walk('owner', descending, room='101', limit=3),
+                             self.expected('owner', descending, room='101'))
+
+if __name__ == "__main__":
+    unittest.main()
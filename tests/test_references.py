@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+from database.database import Database
+
+
+class ReferenceCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmp.name, "inventory.db")
+        self.first = Database(path)
+        self.second = Database(path)
+
+    def tearDown(self):
+        self.first.close()
+        self.second.close()
+        self.tmp.cleanup()
+
+    def equipment(self, number, room):
+        return {'inventory_number': number, 'type': 'mon', 'name': 'Монітор', 'model': 'P2419',
+                'serial_number': number, 'room': room, 'owner': ''}
+
+    def test_room_deleted_by_another_connection_is_recreated(self):
+        self.second.add_room('101')
+        self.second.add_equipment(self.equipment('INV1', '101'))
+        # Інше з'єднання видаляє кабінет, який уже є в кеші довідників цього екземпляра
+        self.first.delete_room('101')
+        self.assertTrue(self.second.add_equipment(self.equipment('INV2', '101')))
+        row = self.second.conn.execute("SELECT room_id FROM equipment WHERE inventory_number='INV2'").fetchone()
+        self.assertIsNotNone(row['room_id'])
+        self.assertIn('101', self.first.get_all_rooms())
+
+    def test_room_merge_respects_capacity(self):
+        self.second.add_room('101', max_seats=2)
+        self.second.add_room('102')
+        for number, room in (('INV1', '101'), ('INV2', '102'), ('INV3', '102')):
+            self.second.add_equipment(self.equipment(number, room))
+        with self.assertRaises(ValueError):
+            self.second.update_room('102', '101')
+        self.assertEqual(self.second.get_room_occupancy('101'), (2, 1))
+        self.assertIn('102', self.second.get_all_rooms())
+        # Разом із новою кількістю місць, якої вистачає, злиття дозволене
+        self.second.update_room('102', '101', max_seats=3)
+        self.assertEqual(self.second.get_room_occupancy('101'), (3, 3))
+
+if __name__ == "__main__":
+    unittest.main()
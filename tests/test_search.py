@@ -0,0 +1,49 @@
+import unittest
+from database.database import Database
+
+ROWS = 3000
+
+
+class SearchEquipmentTest(unittest.TestCase):
+    def setUp(self):
+        self.db = Database(':memory:')
+
+    def tearDown(self):
+        self.db.close()
+
+    def insert(self, start, count, written_off, name="Монітор Dell {i}", model="P2419"):
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO equipment (inventory_number, name, model, written_off) VALUES (?, ?, ?, ?)",
+                [(f"INV{i:06d}", name.format(i=i), model, written_off) for i in range(start, start + count)])
+
+    def test_written_off_matches_do_not_hide_active_ones(self):
+        self.insert(0, ROWS + 1000, 1)
+        self.insert(ROWS + 1000, ROWS, 0)
+        rows = self.db.search_equipment('Dell', limit=200)
+        self.assertEqual(len(rows), 200)
+        self.assertTrue(all(row['written_off'] == 0 for row in rows))
+        self.assertEqual(self.db.count_equipment(text='Dell'), ROWS)
+
+    def test_best_match_ranks_first_regardless_of_age(self):
+        # Найкращий збіг — найстаріший запис: ранжуються всі збіги, а не лише найновіші
+        self.insert(0, 1, 0, name="Dell", model="Dell")
+        self.insert(1, ROWS, 0, name="Системний блок Dell OptiPlex 3080 {i}", model="OptiPlex 3080")
+        rows = self.db.search_equipment('Dell', limit=10)
+        self.assertEqual(rows[0]['inventory_number'], "INV000000")
+        self.assertEqual(len(self.db.search_equipment('Dell')), ROWS + 1)
+
+    def test_word_prefix_matches_before_substrings(self):
+        # Збіг з початком слова кращий за підрядок усередині слова, навіть якщо той запис старший
+        self.insert(0, 5, 0, name="Адаптер Powerline {i}", model="")
+        self.insert(5, 5, 0, name="Кабель Line-Out {i}", model="")
+        rows = self.db.search_equipment('line', limit=10)
+        self.assertEqual([row['name'].split()[1] for row in rows[:5]], ["Line-Out"] * 5)
+        if self.db._fts_tables['trigram']:
+            self.assertEqual(len(rows), 10)
+            self.assertEqual(self.db.count_equipment(text='line'), 10)
+        # Короткі запити шукаються за початками слів
+        self.assertEqual(self.db.count_equipment(text='Li'), 5)
+
+if __name__ == "__main__":
+    unittest.main()
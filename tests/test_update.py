@@ -0,0 +1,62 @@
+import unittest
+from database.database import MERGE_FIELDS, Database
+
+
+class UpdateEquipmentTest(unittest.TestCase):
+    def setUp(self):
+        self.db = Database(':memory:')
+        self.db.add_room('101')
+        self.db.add_room('205')
+        self.db.add_equipment({'inventory_number': 'INV1', 'type': 'mon', 'name': 'Монітор', 'model': 'P2419',
+                               'serial_number': 'SN1', 'room': '101', 'owner': ''})
+        self.id = self.db.get_equipment_ids()[0]
+        self.base = self.db.get_equipment_by_id(self.id)
+
+    def tearDown(self):
+        self.db.close()
+
+    def edit(self, **changes):
+        data = {field: self.base[field] for field in MERGE_FIELDS}
+        data.update(changes)
+        return data
+
+    def test_room_rename_keeps_new_name(self):
+        self.db.update_room('101', '102')
+        result = self.db.update_equipment(self.id, self.edit(name='Монітор Dell'), self.base['version'], self.base)
+        self.assertEqual(result['status'], 'updated')
+        self.assertEqual(self.db.get_equipment_by_id(self.id)['room'], '102')
+        self.assertNotIn('101', self.db.get_all_rooms())
+
+    def test_room_rename_with_concurrent_edit_is_merged(self):
+        self.db.update_room('101', '102')
+        other = self.edit(model='U2419')
+        self.db.update_equipment(self.id, other, self.base['version'], self.base)
+        # base без ідентифікаторів, як у HTTP API
+        base = {field: self.base[field] for field in MERGE_FIELDS}
+        result = self.db.update_equipment(self.id, self.edit(name='Монітор Dell'), self.base['version'], base)
+        self.assertEqual(result['status'], 'merged')
+        row = self.db.get_equipment_by_id(self.id)
+        self.assertEqual((row['room'], row['model'], row['name']), ('102', 'U2419', 'Монітор Dell'))
+
+    def test_move_after_rename_is_not_a_conflict(self):
+        self.db.update_room('101', '102')
+        fresh = self.db.get_equipment_by_id(self.id)
+        self.db.update_equipment(self.id, dict(fresh, model='U2419'), fresh['version'], fresh)
+        result = self.db.update_equipment(self.id, self.edit(room='205'), self.base['version'], self.base)
+        self.assertEqual(result['status'], 'merged')
+        self.assertEqual(self.db.get_equipment_by_id(self.id)['room'], '205')
+
+    def test_row_changed_before_write_is_a_conflict(self):
+        db = self.db
+
+        def ensure_owner(full_name):
+            # Імітує зміну рядка між читанням поточної версії і записом
+            db.conn.execute("UPDATE equipment SET version=version+1 WHERE id=?", (self.id,))
+        db.ensure_owner = ensure_owner
+        result = db.update_equipment(self.id, self.edit(name='Монітор Dell'), self.base['version'], self.base)
+        self.assertEqual(result['status'], 'conflict')
+        self.assertEqual(result['version'], self.base['version'] + 1)
+        self.assertEqual(db.get_equipment_by_id(self.id)['name'], 'Монітор')
+
+if __name__ == "__main__":
+    unittest.main()
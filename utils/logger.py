@@ -1,15 +1,65 @@
+import atexit
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-def setup_logging():
-    log_file = 'inventory.log'
-    if os.path.exists(log_file):
-        os.remove(log_file)
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler()
-        ]
-    )
\ No newline at end of file
+LOG_FILE = 'inventory.log'
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+DEFAULT_LEVEL = 'INFO'
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+
+_listener = None
+
+
+def _env_flag(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+def setup_logging(level=None, log_file=None, console=None, max_bytes=None, backup_count=None):
+    # Явні аргументи мають пріоритет над змінними середовища
+    global _listener
+    level = (level or os.environ.get('INVENTORY_LOG_LEVEL') or DEFAULT_LEVEL).upper()
+    log_file = log_file if log_file is not None else os.environ.get('INVENTORY_LOG_FILE', LOG_FILE)
+    console = console if console is not None else _env_flag('INVENTORY_LOG_CONSOLE', True)
+    max_bytes = max_bytes or int(os.environ.get('INVENTORY_LOG_MAX_BYTES', DEFAULT_MAX_BYTES))
+    backup_count = backup_count if backup_count is not None else int(
+        os.environ.get('INVENTORY_LOG_BACKUPS', DEFAULT_BACKUP_COUNT))
+
+    handlers = []
+    formatter = logging.Formatter(LOG_FORMAT)
+    if log_file:
+        # Замість видалення журналу при старті — ротація за розміром
+        file_handler = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    if console:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+        handlers.append(stream_handler)
+
+    shutdown_logging()
+    # Потік застосунку лише кладе запис у чергу, запис у файл і консоль виконує фоновий потік
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(getattr(logging, level, logging.INFO))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None